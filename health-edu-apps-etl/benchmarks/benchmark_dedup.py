@@ -0,0 +1,39 @@
+import sys
+import time
+import numpy as np
+import polars as pl
+from health_edu_apps_etl.dedup import assign_clusters
+
+# Uso (a partir de health-edu-apps-etl/): python -m benchmarks.benchmark_dedup [número máximo de linhas]
+MAX_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+DUPLICATE_RATE = 0.1  # Fração de registros que são cópias (de outra fonte) de um artigo existente
+
+
+def synthetic_articles(rows, seed=42):
+    """ Gera artigos sintéticos com uma fração de duplicatas por DOI, caixa/pontuação e palavra extra """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"termo{i}" for i in range(50_000)])
+    titles = [" ".join(words) for words in rng.choice(vocabulary, (rows, 12))]
+    dois = [f"10.1000/{i}" if i % 2 else None for i in range(rows)]
+
+    copies = rng.choice(rows, int(rows * DUPLICATE_RATE), replace=False)
+    for n, i in enumerate(copies):
+        j = (i + 1) % rows
+        titles[j] = [titles[i].upper() + ".", titles[i] + " review", titles[i]][n % 3]
+        dois[j] = dois[i] if n % 3 == 2 else None
+
+    return pl.DataFrame({
+        "doi": dois,
+        "title": titles,
+        "authors": [["Silva A"]] * rows,
+    }, schema={"doi": pl.String, "title": pl.String, "authors": pl.List(pl.String)})
+
+
+if __name__ == "__main__":
+    print("⏱️ Agrupamento de duplicatas (DOI + título + MinHash/LSH):")
+    for rows in [size for size in (10_000, 100_000, 1_000_000, 10_000_000) if size <= MAX_ROWS]:
+        df = synthetic_articles(rows)
+        start = time.perf_counter()
+        clusters = assign_clusters(df)["cluster_id"].n_unique()
+        elapsed = time.perf_counter() - start
+        print(f"   - {rows:,} registros → {clusters:,} grupos em {elapsed:.1f}s ({rows / elapsed:,.0f} registros/s)")
@@ -0,0 +1,80 @@
+import io
+import sys
+import time
+import numpy as np
+import polars as pl
+from health_edu_apps_etl.transform_data import clean_articles
+
+# Uso (a partir de health-edu-apps-etl/): python -m benchmarks.benchmark_transform [número de linhas]
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+BASELINE_ROWS = 100_000  # A versão linha a linha é medida numa amostra menor
+
+# 🔹 Datas nos formatos reais de cada fonte
+DATE_SAMPLES = ["2023 Jan 5", "2021 Nov 30", "2024-03-10", "2019-07-22", "2005-08", "2023 Jan-Feb", "2020"]
+
+
+def synthetic_articles(rows, seed=42):
+    """ Gera artigos sintéticos com espaços, quebras de linha e datas misturadas """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    return pl.DataFrame({
+        "id": ids.astype(str),
+        "title": [f"  Mobile health app {i}\nstudy " for i in ids],
+        "journal": rng.choice(["JMIR mHealth", " Rev Saude Publica\r\n", "BMC Med Educ"], rows),
+        "authors": rng.choice(["Silva A, Souza B", " Smith J\n", "Costa C"], rows),
+        "pub_date": rng.choice(DATE_SAMPLES, rows),
+        "source": rng.choice(["PubMed", "Scopus", "SciELO"], rows),
+    })
+
+
+def row_by_row(df):
+    """ Limpeza anterior: uma chamada Python por valor (`map_elements`, antigo `apply`) """
+    def clean_text(text):
+        return text.strip().replace("\n", " ").replace("\r", " ") if isinstance(text, str) else text
+
+    def standardize_date(date_str):
+        try:
+            return pl.Series([date_str]).str.to_date(format="%Y-%m-%d").to_list()[0]
+        except Exception:
+            return None
+
+    return df.with_columns(
+        pl.col("title").map_elements(clean_text, return_dtype=pl.String),
+        pl.col("journal").map_elements(clean_text, return_dtype=pl.String),
+        pl.col("authors").map_elements(clean_text, return_dtype=pl.String),
+        pl.col("pub_date").map_elements(standardize_date, return_dtype=pl.Date),
+    )
+
+
+def parquet_size(df):
+    """ Tamanho do DataFrame gravado em Parquet (zstd), em bytes """
+    buffer = io.BytesIO()
+    df.write_parquet(buffer, compression="zstd")
+    return buffer.tell()
+
+
+def measure(label, func, df):
+    """ Executa a função e imprime tempo e vazão em linhas por segundo """
+    start = time.perf_counter()
+    result = func(df)
+    elapsed = time.perf_counter() - start
+    print(f"   - {label}: {len(df):,} linhas em {elapsed:.2f}s ({len(df) / elapsed:,.0f} linhas/s)")
+    return result
+
+
+if __name__ == "__main__":
+    print(f"🧪 Gerando {ROWS:,} artigos sintéticos...")
+    df = synthetic_articles(ROWS)
+
+    print("⏱️ Limpeza vetorizada (expressões nativas):")
+    result = measure("clean_articles", clean_articles, df)
+    print(f"   - Datas convertidas: {result['pub_date'].is_not_null().sum():,} de {ROWS:,}")
+
+    # 🔹 Schema canônico (Enum/Categorical/List) versus tudo como texto
+    plain = result.with_columns(pl.col("authors").list.join(", "), pl.col("journal", "source").cast(pl.String))
+    print("📦 Tamanho do schema canônico versus colunas de texto:")
+    print(f"   - Memória: {result.estimated_size('mb'):.1f} MB (texto: {plain.estimated_size('mb'):.1f} MB)")
+    print(f"   - Parquet: {parquet_size(result) / 2**20:.1f} MB (texto: {parquet_size(plain) / 2**20:.1f} MB)")
+
+    print("⏱️ Limpeza linha a linha (referência):")
+    measure("map_elements", row_by_row, df.head(BASELINE_ROWS))
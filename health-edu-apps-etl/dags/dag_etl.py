@@ -5,6 +5,7 @@ import logging
 import os
 from health_edu_apps_etl.etl_pipeline import run_etl
 from health_edu_apps_etl.generate_report import generate_report
+from health_edu_apps_etl.transform_data import load_and_clean_data
 
 # Configuração da DAG
 default_args = {
@@ -35,7 +36,18 @@ task_etl = PythonOperator(
     dag=dag,
 )
 
-# Tarefa 2: Gerar Relatório
+# Tarefa 2: Transformar os dados (deduplicação, dataset particionado e agregações)
+def transform_task():
+    logging.info("🔄 Transformando artigos e atualizando agregações...")
+    load_and_clean_data()
+
+task_transform = PythonOperator(
+    task_id="transform_data",
+    python_callable=transform_task,
+    dag=dag,
+)
+
+# Tarefa 3: Gerar Relatório
 def generate_report_task():
     logging.info("📊 Gerando relatório de artigos...")
     generate_report()
@@ -47,4 +59,4 @@ task_generate_report = PythonOperator(
 )
 
 # Dependências das tarefas
-task_etl >> task_generate_report
+task_etl >> task_transform >> task_generate_report
@@ -0,0 +1,140 @@
+import json
+import os
+import polars as pl
+from pathlib import Path
+from health_edu_apps_etl.partitioned_dataset import read_manifest
+from health_edu_apps_etl.schema import SOURCE_ENUM
+from health_edu_apps_etl.stopwords import STOPWORDS
+
+STATE_FILE = "_state.json"
+
+# 🔹 Versão das definições das tabelas: ao mudar, todas as partições são recalculadas
+AGGREGATES_VERSION = 2
+
+# 🔹 Tokens do título: sequências de letras/números com pelo menos `MIN_TOKEN_LENGTH` caracteres,
+# fora as stopwords em português e inglês
+TOKEN_PATTERN = r"[\p{L}\p{N}]+"
+MIN_TOKEN_LENGTH = 3
+
+# 🔹 Chave de partição presente em todas as tabelas agregadas
+PARTITION_KEYS = ["source", "year"]
+
+
+def title_tokens(column="title"):
+    """Expressão com a lista de tokens (minúsculos, sem stopwords) do título"""
+    tokens = pl.col(column).str.to_lowercase().str.extract_all(TOKEN_PATTERN)
+    return tokens.list.eval(pl.element().filter(
+        (pl.element().str.len_chars() >= MIN_TOKEN_LENGTH) & ~pl.element().is_in(STOPWORDS)
+    ))
+
+
+def _counts(lf, *columns):
+    return lf.group_by(PARTITION_KEYS + list(columns)).agg(pl.len().alias("count"))
+
+
+def _explode(lf, values):
+    name = values.meta.output_name()
+    return lf.select(*PARTITION_KEYS, values).explode(name, empty_as_null=False, keep_nulls=False).drop_nulls(name)
+
+
+# 🔹 Tabelas agregadas: nome → função que resume um LazyFrame de artigos com a coluna `year`
+AGGREGATES = {
+    "source_year": lambda lf: _counts(lf),
+    "journal_year": lambda lf: _counts(lf.with_columns(pl.col("journal").cast(pl.String)), "journal"),
+    "authors": lambda lf: _counts(_explode(lf, pl.col("authors").alias("author")), "author"),
+    "title_tokens": lambda lf: _counts(_explode(lf, title_tokens().alias("token")), "token"),
+}
+
+
+def aggregates_dir(root):
+    """Diretório das tabelas agregadas de um dataset particionado (ao lado dele)"""
+    root = Path(root)
+    return root.with_name(f"{root.name}_aggregates")
+
+
+def read_state(directory):
+    """Estado das agregações (manifesto e partições já resumidas), ou None"""
+    path = Path(directory) / STATE_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_atomic(df, path):
+    tmp_path = path.with_suffix(".tmp")
+    df.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _fingerprints(manifest):
+    return {p["path"]: p.get("fingerprint") for p in manifest["partitions"]}
+
+
+def update_aggregates(root):
+    """
+    Atualiza as tabelas agregadas depois de uma gravação do dataset: só as partições novas ou
+    alteradas (pela `fingerprint` do manifesto) são lidas; as demais linhas são mantidas.
+    Retorna o número de partições resumidas.
+    """
+    manifest = read_manifest(root)
+    if manifest is None:
+        raise FileNotFoundError(f"Manifesto do dataset {root} não encontrado!")
+
+    directory = aggregates_dir(root)
+    directory.mkdir(parents=True, exist_ok=True)
+    state = read_state(directory)
+    if state is None or state.get("version") != AGGREGATES_VERSION:
+        # 🔹 Tabelas de outra versão: nenhuma linha antiga é aproveitada
+        state = {"partitions": {}}
+
+    # 🔹 Manifestos antigos não têm `fingerprint`: essas partições são sempre recalculadas
+    changed = [
+        p for p in manifest["partitions"]
+        if p.get("fingerprint") is None or state["partitions"].get(p["path"]) != p["fingerprint"]
+    ]
+    unchanged = pl.DataFrame(
+        [{"source": p["source"], "year": p["year"]} for p in manifest["partitions"] if p not in changed],
+        schema={"source": SOURCE_ENUM, "year": pl.Int32},
+    )
+
+    for name, aggregate in AGGREGATES.items():
+        frames = []
+        path = directory / f"{name}.parquet"
+        if path.exists():
+            # 🔹 Partições sem mudança continuam valendo; removidas ou alteradas saem aqui
+            frames.append(pl.read_parquet(path).join(unchanged, on=PARTITION_KEYS, how="semi"))
+        for partition in changed:
+            articles = pl.scan_parquet(Path(root) / partition["path"]).with_columns(pl.col("pub_date").dt.year().alias("year"))
+            frames.append(aggregate(articles).collect())
+        if frames:
+            _write_atomic(pl.concat(frames, how="vertical_relaxed").sort(PARTITION_KEYS), path)
+
+    state = {"version": AGGREGATES_VERSION, "committed_at": manifest["committed_at"], "partitions": _fingerprints(manifest)}
+    tmp_path = directory / f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, directory / STATE_FILE)
+    return len(changed)
+
+
+def scan_aggregate(root, name, sources=None, years=None):
+    """
+    LazyFrame sobre uma tabela agregada filtrada por fonte e ano, ou None se as agregações
+    não existem ou não correspondem à versão atual do dataset.
+    """
+    manifest = read_manifest(root)
+    directory = aggregates_dir(root)
+    state = read_state(directory)
+    if manifest is None or state is None or state.get("version") != AGGREGATES_VERSION:
+        return None
+    fingerprints = _fingerprints(manifest)
+    if None in fingerprints.values() or state["partitions"] != fingerprints:
+        return None
+
+    lf = pl.scan_parquet(directory / f"{name}.parquet")
+    if sources is not None:
+        lf = lf.filter(pl.col("source").is_in(list(sources)))
+    if years is not None:
+        lf = lf.filter(pl.col("year").is_in(list(years)))
+    return lf
@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from health_edu_apps_etl import queries
+from health_edu_apps_etl.config import APP_CACHE_SIZE
+from health_edu_apps_etl.partitioned_dataset import MANIFEST_FILE
+
+# 🔹 Consultas de `queries.py` que os apps podem chamar pelo cache
+CACHED_QUERIES = (
+    "available_sources", "available_years", "summary_stats", "count_by_source", "count_by_year",
+    "count_by_journal", "top_authors", "top_title_tokens", "list_articles", "titles",
+    "count_articles", "page_articles",
+)
+
+
+def dataset_version(path=None):
+    """
+    Versão do dataset a partir do `stat` (mtime e tamanho) do manifesto ou do arquivo:
+    muda a cada gravação do ETL, sem ler os dados.
+    """
+    path = Path(path or queries.default_dataset())
+    if path.is_dir():
+        files = [path / MANIFEST_FILE]
+    else:
+        # 🔹 No catálogo DuckDB, gravações recentes podem estar só no WAL
+        files = [path, path.with_name(path.name + ".wal")]
+    return tuple((f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in files if f.exists())
+
+
+def freeze(value):
+    """Converte listas, conjuntos e dicts em tuplas, para usar o valor numa chave do cache"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, (list, tuple, range)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def filter_key(sources=None, years=None):
+    """Chave dos filtros: a ordem das fontes e anos selecionados não muda o resultado"""
+    return (
+        tuple(sorted(sources)) if sources is not None else None,
+        tuple(sorted(years)) if years is not None else None,
+    )
+
+
+class QueryCache:
+    """Cache LRU em memória, limitado a `maxsize` resultados e seguro entre threads (sessões do Streamlit)"""
+
+    def __init__(self, maxsize=APP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, compute):
+        """Retorna o resultado guardado para `key` ou calcula, guarda e remove o menos usado"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        # 🔹 A consulta roda fora do lock: outras sessões continuam lendo o cache
+        result = compute()
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class CachedQueries:
+    """
+    Consultas de `queries.py` memorizadas por (consulta, versão do dataset, filtros, argumentos).
+    Uma gravação nova do ETL muda a versão, e os resultados antigos saem pelo LRU.
+    Os DataFrames devolvidos são compartilhados entre sessões e não devem ser alterados.
+    """
+
+    def __init__(self, cache=None, path=None):
+        self.cache = cache if cache is not None else QueryCache()
+        self.path = path
+
+    def __getattr__(self, name):
+        if name not in CACHED_QUERIES:
+            raise AttributeError(name)
+        return partial(self.call, getattr(queries, name))
+
+    def version(self):
+        return dataset_version(self.path)
+
+    def call(self, func, *args, sources=None, years=None, **kwargs):
+        """Executa `func` pelo cache, repassando só os filtros informados"""
+        key = (func.__name__, self.version(), filter_key(sources, years), freeze(args), freeze(kwargs))
+        if sources is not None:
+            kwargs["sources"] = sources
+        if years is not None:
+            kwargs["years"] = years
+        return self.cache.get(key, lambda: func(*args, path=self.path, **kwargs))
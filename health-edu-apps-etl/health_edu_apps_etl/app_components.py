@@ -0,0 +1,92 @@
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+import streamlit as st
+from health_edu_apps_etl.app_cache import CachedQueries, filter_key
+from health_edu_apps_etl.config import EXPORT_MAX_ROWS
+from health_edu_apps_etl.queries import ARTICLE_COLUMNS, EXPORT_FORMATS, export_articles
+
+# 🔹 Opções da tabela paginada
+PAGE_SIZES = [25, 50, 100]
+COLUMN_LABELS = {"title": "Título", "authors": "Autores", "journal": "Periódico", "pub_date": "Data", "source": "Base"}
+
+# 🔹 Arquivos exportados: diretório próprio, esvaziado ao iniciar o app e a cada nova versão do dataset
+EXPORT_DIR = Path(tempfile.gettempdir()) / "health_edu_apps_exports"
+
+
+@st.cache_resource
+def consultas():
+    """Consultas com cache LRU compartilhado entre reexecuções e sessões (invalidado a cada gravação do ETL)"""
+    return CachedQueries()
+
+
+@st.cache_resource
+def export_root():
+    """Diretório das exportações, limpo uma vez por processo (remove sobras de execuções anteriores)"""
+    shutil.rmtree(EXPORT_DIR, ignore_errors=True)
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    return EXPORT_DIR
+
+
+def export_dir(version):
+    """Subdiretório das exportações da versão atual do dataset; os de versões anteriores são apagados"""
+    name = hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:16]
+    root = export_root()
+    for old in root.iterdir():
+        if old.name != name:
+            shutil.rmtree(old, ignore_errors=True)
+    directory = root / name
+    directory.mkdir(exist_ok=True)
+    return directory
+
+
+def paginated_table(db, filters, columns=ARTICLE_COLUMNS):
+    """
+    Tabela de artigos em páginas: o navegador recebe só `limit` linhas por vez e o servidor
+    lê a página pedida (ordenada no engine de streaming). Retorna o total de artigos filtrados.
+    """
+    total = db.count_articles(**filters)
+    col1, col2, col3, col4 = st.columns(4)
+    sort_by = col1.selectbox("Ordenar por", columns, index=columns.index("pub_date"), format_func=lambda c: COLUMN_LABELS.get(c, c))
+    descending = col2.checkbox("Decrescente", value=True)
+    page_size = col3.selectbox("Linhas por página", PAGE_SIZES)
+    pages = max(1, -(-total // page_size))
+    page = col4.number_input("Página", min_value=1, max_value=pages, value=1)
+
+    page_df = db.page_articles((page - 1) * page_size, page_size, sort_by, descending, columns, **filters)
+    st.dataframe(page_df, use_container_width=True)
+    st.caption(f"Página {page} de {pages} · {total} artigos")
+    return total
+
+
+def export_buttons(db, filters):
+    """
+    Exportação dos artigos filtrados: o arquivo só é gerado no clique, gravado em lotes em
+    `EXPORT_DIR` e oferecido para download enquanto filtros e dataset não mudarem. O
+    `st.download_button` envia o arquivo inteiro da memória, por isso a exportação é
+    limitada a `EXPORT_MAX_ROWS` artigos.
+    """
+    file_format = st.radio("Formato", list(EXPORT_FORMATS), format_func=str.upper, horizontal=True)
+    extension, mime = EXPORT_FORMATS[file_format]
+    version = db.version()
+    key = (version, filter_key(**filters), file_format)
+    export = st.session_state.get("export")
+
+    if export is None or export["key"] != key or not Path(export["file"]).exists():
+        total = db.count_articles(**filters)
+        if total > EXPORT_MAX_ROWS:
+            st.warning(f"⚠️ {total} artigos selecionados: a exportação aceita até {EXPORT_MAX_ROWS}. Refine os filtros.")
+            return
+        if not st.button("⚙️ Gerar arquivo"):
+            return
+        if export is not None:
+            Path(export["file"]).unlink(missing_ok=True)
+        with tempfile.NamedTemporaryFile(suffix=f".{extension}", dir=export_dir(version), delete=False) as f:
+            target = f.name
+        with st.spinner("Gerando arquivo..."):
+            export_articles(target, file_format, path=db.path, **filters)
+        st.session_state["export"] = export = {"key": key, "file": target}
+
+    with open(export["file"], "rb") as f:
+        st.download_button(f"📥 Baixar {extension.upper()}", data=f, file_name=f"artigos_filtrados.{extension}", mime=mime)
@@ -0,0 +1,254 @@
+import json
+import duckdb
+import polars as pl
+from datetime import datetime, timezone
+from pathlib import Path
+from health_edu_apps_etl.config import CATALOG_PATH
+from health_edu_apps_etl.dedup import normalize_doi, normalize_title
+from health_edu_apps_etl.schema import enforce_schema
+
+# 🔹 Tabelas do catálogo: um artigo por (fonte, id), autores normalizados e execuções do ETL
+SCHEMA_SQL = """
+CREATE SEQUENCE IF NOT EXISTS author_ids START 1;
+
+CREATE TABLE IF NOT EXISTS articles (
+    source VARCHAR NOT NULL,
+    id VARCHAR NOT NULL,
+    doi VARCHAR,
+    title VARCHAR NOT NULL,
+    title_norm VARCHAR,
+    journal VARCHAR,
+    pub_date DATE,
+    year INTEGER,
+    cluster_id UINTEGER,
+    run_id VARCHAR,
+    updated_at TIMESTAMP,
+    PRIMARY KEY (source, id)
+);
+
+CREATE TABLE IF NOT EXISTS authors (
+    author_id INTEGER PRIMARY KEY DEFAULT nextval('author_ids'),
+    name VARCHAR NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS article_authors (
+    source VARCHAR NOT NULL,
+    id VARCHAR NOT NULL,
+    position INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    PRIMARY KEY (source, id, position)
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id VARCHAR PRIMARY KEY,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    status VARCHAR,
+    sources VARCHAR,
+    rows_upserted INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS articles_doi ON articles (doi);
+CREATE INDEX IF NOT EXISTS articles_title_norm ON articles (title_norm);
+CREATE INDEX IF NOT EXISTS articles_year ON articles (year);
+CREATE INDEX IF NOT EXISTS article_authors_author ON article_authors (author_id);
+
+-- Um registro por artigo: grupos do `dedup` quando gravados, senão DOI ou título normalizado
+CREATE OR REPLACE VIEW unique_articles AS
+SELECT * FROM articles
+QUALIFY row_number() OVER (
+    PARTITION BY coalesce('c' || cluster_id, 'd' || doi, 't' || title_norm, source || ':' || id)
+    ORDER BY doi IS NULL, source, id
+) = 1;
+
+-- Todos os registros no schema do dataset processado (autores em lista, na ordem da fonte)
+CREATE OR REPLACE VIEW article_records AS
+SELECT
+    a.id, a.doi, a.title, a.journal,
+    coalesce(list(au.name ORDER BY aa.position) FILTER (WHERE au.name IS NOT NULL), []) AS authors,
+    a.pub_date, a.source
+FROM articles a
+LEFT JOIN article_authors aa ON aa.source = a.source AND aa.id = a.id
+LEFT JOIN authors au ON au.author_id = aa.author_id
+GROUP BY ALL;
+
+-- Um registro por artigo, no mesmo schema
+CREATE OR REPLACE VIEW catalog_articles AS
+SELECT
+    a.id, a.doi, a.title, a.journal,
+    coalesce(list(au.name ORDER BY aa.position) FILTER (WHERE au.name IS NOT NULL), []) AS authors,
+    a.pub_date, a.source
+FROM unique_articles a
+LEFT JOIN article_authors aa ON aa.source = a.source AND aa.id = a.id
+LEFT JOIN authors au ON au.author_id = aa.author_id
+GROUP BY ALL;
+"""
+
+
+def catalog_exists(path=None):
+    """Indica se o catálogo já foi criado"""
+    return Path(path or CATALOG_PATH).is_file()
+
+
+def connect(path=None, read_only=False):
+    """Abre o catálogo DuckDB (criando as tabelas, se for para escrita)"""
+    path = Path(path or CATALOG_PATH)
+    if read_only:
+        return duckdb.connect(str(path), read_only=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(path))
+    con.execute(SCHEMA_SQL)
+    return con
+
+
+def upsert_articles(con, df, run_id=None):
+    """
+    Insere ou atualiza um lote de artigos no schema canônico (`clean_articles`), pela chave
+    (fonte, id), junto com seus autores. O custo é proporcional ao lote, não ao catálogo.
+    Retorna o número de artigos gravados.
+    """
+    batch = (
+        df.drop_nulls("id")
+        .unique(subset=["source", "id"], keep="last", maintain_order=True)
+        .select(
+            pl.col("source").cast(pl.String),
+            "id",
+            normalize_doi("doi").alias("doi"),
+            "title",
+            normalize_title("title").alias("title_norm"),
+            pl.col("journal").cast(pl.String),
+            "pub_date",
+            pl.col("pub_date").dt.year().cast(pl.Int32).alias("year"),
+            "authors",
+        )
+    )
+    if batch.is_empty():
+        return 0
+
+    con.register("batch", batch)
+    try:
+        con.begin()
+        con.execute("""
+            INSERT INTO articles
+            SELECT source, id, doi, title, title_norm, journal, pub_date, year, NULL, ?, now()
+            FROM batch
+            ON CONFLICT (source, id) DO UPDATE SET
+                doi = excluded.doi, title = excluded.title, title_norm = excluded.title_norm,
+                journal = excluded.journal, pub_date = excluded.pub_date, year = excluded.year,
+                run_id = excluded.run_id, updated_at = excluded.updated_at
+        """, [run_id])
+        con.execute("""
+            INSERT INTO authors (name)
+            SELECT DISTINCT name FROM (SELECT unnest(authors) AS name FROM batch)
+            ON CONFLICT (name) DO NOTHING
+        """)
+        con.execute("DELETE FROM article_authors WHERE (source, id) IN (SELECT source, id FROM batch)")
+        con.execute("""
+            INSERT INTO article_authors
+            SELECT b.source, b.id, b.position, au.author_id
+            FROM (
+                SELECT source, id, unnest(authors) AS name, generate_subscripts(authors, 1) AS position FROM batch
+            ) b
+            JOIN authors au USING (name)
+        """)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.unregister("batch")
+    return len(batch)
+
+
+def read_articles(con):
+    """
+    Todos os registros gravados pelo ETL, de todas as execuções, no schema canônico: é o
+    histórico completo que a transformação deduplica (os arquivos brutos só têm a última execução).
+    """
+    return enforce_schema(con.sql("SELECT * FROM article_records ORDER BY source, id").pl())
+
+
+def record_clusters(con, clusters):
+    """
+    Grava o `cluster_id` do `dedup` (colunas `source`, `id`, `cluster_id`) nos artigos do catálogo.
+    A numeração muda a cada transformação, então os grupos anteriores são descartados antes.
+    """
+    con.register("clusters", clusters.select(pl.col("source").cast(pl.String), "id", "cluster_id").drop_nulls("id"))
+    try:
+        con.begin()
+        con.execute("UPDATE articles SET cluster_id = NULL WHERE cluster_id IS NOT NULL")
+        con.execute("""
+            UPDATE articles SET cluster_id = c.cluster_id
+            FROM clusters c
+            WHERE articles.source = c.source AND articles.id = c.id
+        """)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.unregister("clusters")
+
+
+def start_run(con, run_id, sources):
+    """Registra o início de uma execução do ETL"""
+    con.execute(
+        "INSERT OR REPLACE INTO runs VALUES (?, ?, NULL, 'running', ?, 0)",
+        [run_id, datetime.now(timezone.utc), json.dumps(sources, ensure_ascii=False)],
+    )
+
+
+def finish_run(con, run_id, status, rows_upserted):
+    """Registra o fim de uma execução do ETL, com o status e o total de artigos gravados"""
+    con.execute(
+        "UPDATE runs SET finished_at = ?, status = ?, rows_upserted = ? WHERE run_id = ?",
+        [datetime.now(timezone.utc), status, rows_upserted, run_id],
+    )
+
+
+def query(sql, params=None, path=None):
+    """Executa uma consulta SQL somente leitura no catálogo e devolve um DataFrame"""
+    con = connect(path, read_only=True)
+    try:
+        return con.execute(sql, params or []).pl()
+    finally:
+        con.close()
+
+
+def scan_catalog(path=None, sources=None, years=None):
+    """
+    Artigos da view `catalog_articles` (um registro por artigo, schema do dataset processado),
+    filtrados por fonte e ano no DuckDB. O resultado é materializado e a conexão somente leitura
+    é fechada logo em seguida: enquanto houver uma conexão aberta em outro processo, o ETL não
+    consegue abrir o catálogo para gravar.
+    """
+    conditions, params = [], []
+    if sources is not None:
+        conditions.append("list_contains(?::VARCHAR[], source)")
+        params.append(list(sources))
+    if years is not None:
+        conditions.append("list_contains(?::INTEGER[], year(pub_date))")
+        params.append([int(year) for year in years])
+    where = " AND ".join(conditions) or "TRUE"
+    return query(f"SELECT * FROM catalog_articles WHERE {where}", params, path).lazy()
+
+
+def find_articles(doi=None, title=None, year=None, path=None):
+    """Registros do catálogo (todas as fontes) pelo DOI, título normalizado e/ou ano, usando os índices"""
+    conditions, params = [], []
+    if doi is not None:
+        conditions.append("doi = ?")
+        params.append(pl.select(pl.lit(doi).alias("doi")).select(normalize_doi()).item())
+    if title is not None:
+        conditions.append("title_norm = ?")
+        params.append(pl.select(pl.lit(title).alias("title")).select(normalize_title()).item())
+    if year is not None:
+        conditions.append("year = ?")
+        params.append(year)
+    where = " AND ".join(conditions) or "TRUE"
+    return query(f"SELECT * FROM articles WHERE {where} ORDER BY source, id", params, path)
+
+
+def list_runs(limit=20, path=None):
+    """Últimas execuções registradas no catálogo"""
+    return query("SELECT * FROM runs ORDER BY started_at DESC LIMIT ?", [limit], path)
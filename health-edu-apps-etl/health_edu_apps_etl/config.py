@@ -0,0 +1,106 @@
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+
+# 🔹 Carregar variáveis de ambiente
+load_dotenv()
+
+# 🔹 Diretórios base
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+
+# 🔹 Motor de extração concorrente
+EXTRACTION_MAX_WORKERS = int(os.getenv("EXTRACTION_MAX_WORKERS", 6))  # Threads do pool de extração
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", 3600))  # Orçamento global em segundos
+
+# 🔹 Número máximo de tarefas simultâneas por fonte
+SOURCE_CONCURRENCY = {
+    "PubMed": int(os.getenv("PUBMED_CONCURRENCY", 1)),
+    "Scopus": int(os.getenv("SCOPUS_CONCURRENCY", 1)),
+    "Web of Science": int(os.getenv("WOS_CONCURRENCY", 1)),
+    "IEEE Xplore": int(os.getenv("IEEE_CONCURRENCY", 1)),
+    "SciELO": int(os.getenv("SCIELO_CONCURRENCY", 1)),
+}
+
+# 🔹 Orçamento de requisições por segundo para cada host das APIs
+RATE_LIMITS = {
+    "eutils.ncbi.nlm.nih.gov": 10 if os.getenv("PUBMED_API_KEY") else 3,  # NCBI: 10 req/s com chave, 3 sem
+    "api.elsevier.com": float(os.getenv("SCOPUS_RATE_LIMIT", 9)),
+    "wos-api.clarivate.com": float(os.getenv("WOS_RATE_LIMIT", 5)),
+    "ieeexploreapi.ieee.org": float(os.getenv("IEEE_RATE_LIMIT", 10)),
+    "articlemeta.scielo.org": float(os.getenv("SCIELO_RATE_LIMIT", 5)),
+}
+DEFAULT_RATE_LIMIT = float(os.getenv("DEFAULT_RATE_LIMIT", 2))
+
+# 🔹 Backoff exponencial com jitter entre tentativas
+BACKOFF_BASE = float(os.getenv("BACKOFF_BASE", 1))  # Segundos na primeira tentativa
+BACKOFF_MAX = float(os.getenv("BACKOFF_MAX", 60))  # Teto de espera por tentativa
+QUOTA_MAX_WAIT = float(os.getenv("QUOTA_MAX_WAIT", BACKOFF_MAX))  # Acima desta espera pelo reset da cota, a fonte falha
+
+# 🔹 Cliente HTTP compartilhado (pool de conexões por host)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))  # Conexões keep-alive mantidas por host
+HTTP_USER_AGENT = os.getenv("HTTP_USER_AGENT", "health-edu-apps-etl/0.1 (+https://github.com/IsraelMonteiro/revisao_escopo_edumatec_ufpe)")
+
+# 🔹 Cache persistente de respostas HTTP
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "on")  # "on", "off" ou "offline" (somente cache)
+HTTP_CACHE_PATH = Path(os.getenv("HTTP_CACHE_PATH", DATA_DIR / "cache" / "http_cache.sqlite"))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", 512 * 1024 * 1024))  # Limite antes da remoção LRU
+HTTP_CACHE_TTLS = {  # Validade por fonte, em segundos (buscas expiram antes da execução diária seguinte)
+    "PubMed": int(os.getenv("PUBMED_CACHE_TTL", 20 * 3600)),
+    "Scopus": int(os.getenv("SCOPUS_CACHE_TTL", 20 * 3600)),
+    "Web of Science": int(os.getenv("WOS_CACHE_TTL", 20 * 3600)),
+    "IEEE Xplore": int(os.getenv("IEEE_CACHE_TTL", 20 * 3600)),
+    "SciELO": int(os.getenv("SCIELO_CACHE_TTL", 30 * 24 * 3600)),  # Só documentos; a listagem de PIDs não usa cache
+}
+HTTP_CACHE_DEFAULT_TTL = int(os.getenv("HTTP_CACHE_DEFAULT_TTL", 24 * 3600))
+
+# 🔹 Nome curto de cada fonte (arquivos brutos, partições e estado)
+SOURCE_SLUGS = {
+    "PubMed": "pubmed",
+    "Scopus": "scopus",
+    "Web of Science": "wos",
+    "IEEE Xplore": "ieee",
+    "SciELO": "scielo",
+}
+
+# 🔹 Arquivo histórico das respostas brutas das APIs (JSONL compactado com zstd)
+RAW_ARCHIVE_ENABLED = os.getenv("RAW_ARCHIVE_ENABLED", "1") == "1"
+RAW_ARCHIVE_DIR = Path(os.getenv("RAW_ARCHIVE_DIR", DATA_DIR / "archive"))
+RAW_ARCHIVE_LEVEL = int(os.getenv("RAW_ARCHIVE_LEVEL", 10))  # Nível de compressão zstd
+
+# 🔹 Extração incremental por marca d'água (data da última extração bem-sucedida)
+INCREMENTAL_EXTRACTION = os.getenv("ETL_INCREMENTAL", "1") == "1"
+STATE_DIR = Path(os.getenv("ETL_STATE_DIR", DATA_DIR / "state"))
+WATERMARKS_FILE = STATE_DIR / "watermarks.json"
+
+# 🔹 Diário de execução: checkpoint por página para retomar execuções interrompidas
+CHECKPOINTED_RUNS = os.getenv("ETL_CHECKPOINT", "1") == "1"
+RUNS_DIR = STATE_DIR / "runs"
+
+# 🔹 Gravação incremental das páginas extraídas em partes Parquet
+SINK_ROW_GROUP_SIZE = int(os.getenv("SINK_ROW_GROUP_SIZE", 50_000))  # Linhas por parte (um row group)
+
+# 🔹 Dataset processado particionado por fonte e ano (hive)
+PROCESSED_ROW_GROUP_SIZE = int(os.getenv("PROCESSED_ROW_GROUP_SIZE", 100_000))  # Linhas por row group
+PROCESSED_ZSTD_LEVEL = int(os.getenv("PROCESSED_ZSTD_LEVEL", 3))  # Nível de compressão zstd
+
+# 🔹 Fatiamento da busca por datas para superar o limite de resultados por consulta
+SHARDED_HARVEST = os.getenv("ETL_SHARDED", "0") == "1"  # Usa o fatiamento nas extrações completas
+SHARD_CONCURRENCY = int(os.getenv("SHARD_CONCURRENCY", 4))  # Fatias extraídas em paralelo por fonte
+HARVEST_START_YEAR = int(os.getenv("HARVEST_START_YEAR", 1990))  # Início da janela de publicação
+
+# 🔹 Deduplicação entre fontes (DOI, título normalizado e MinHash/LSH sobre título e autores)
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", 64))  # Funções de hash da assinatura MinHash
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", 16))  # Bandas do LSH (DEDUP_NUM_PERM deve ser múltiplo)
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.7))  # Similaridade de Jaccard estimada mínima
+DEDUP_MIN_TITLE_LENGTH = int(os.getenv("DEDUP_MIN_TITLE_LENGTH", 25))  # Títulos curtos ("Editorial") não agrupam sozinhos
+
+# 🔹 Catálogo DuckDB dos artigos (upserts por lote a cada execução do ETL)
+CATALOG_PATH = Path(os.getenv("CATALOG_PATH", DATA_DIR / "catalog.duckdb"))
+ARTICLES_BACKEND = os.getenv("ARTICLES_BACKEND", "dataset")  # Fonte das consultas: "dataset" (Parquet processado) ou "catalog"
+
+# 🔹 Cache das consultas nos apps Streamlit
+APP_CACHE_SIZE = int(os.getenv("APP_CACHE_SIZE", 128))  # Resultados guardados (combinações de consulta e filtros)
+EXPORT_MAX_ROWS = int(os.getenv("EXPORT_MAX_ROWS", 200_000))  # Limite da exportação: o download fica inteiro na memória do servidor
@@ -1,46 +1,45 @@
 import streamlit as st
-import polars as pl
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
+from health_edu_apps_etl.app_components import consultas, export_buttons, paginated_table
+from health_edu_apps_etl.queries import default_dataset, dataset_exists
 
 # 📌 Configuração da página no Streamlit
 st.set_page_config(page_title="Dashboard de Artigos", layout="wide")
 
-# 📌 Caminho do arquivo processado
-processed_data_path = "data/processed/articles.parquet"
+
+db = consultas()
+
 
 # 📌 Verificar se o arquivo existe
-if not os.path.exists(processed_data_path):
-    st.error(f"Arquivo {processed_data_path} não encontrado!")
+if not dataset_exists():
+    st.error(f"Dataset {default_dataset()} não encontrado!")
     st.stop()
 
-# 📌 Carregar os dados processados
-df = pl.read_parquet(processed_data_path).to_pandas()
-
-# 📊 Criar filtros interativos
+# 📊 Criar filtros interativos (as opções vêm de consultas que leem só a coluna necessária)
 st.sidebar.header("🔍 Filtros")
-bases_disponiveis = df["source"].unique()
+bases_disponiveis = db.available_sources()
 selected_base = st.sidebar.multiselect("Filtrar por Base de Dados", bases_disponiveis, default=bases_disponiveis)
 
-anos_disponiveis = sorted(df["pub_date"].dropna().astype(str).unique())
+anos_disponiveis = db.available_years()
 selected_anos = st.sidebar.multiselect("Filtrar por Ano de Publicação", anos_disponiveis, default=anos_disponiveis)
 
-# 📌 Aplicar filtros
-df_filtered = df[(df["source"].isin(selected_base)) & (df["pub_date"].astype(str).isin(selected_anos))]
+# 📌 Filtros aplicados em todas as consultas
+filtros = {"sources": selected_base, "years": selected_anos}
 
 # 📊 Estatísticas gerais
 st.header("📊 Estatísticas Gerais")
+stats = db.summary_stats(**filtros)
 col1, col2, col3 = st.columns(3)
-col1.metric("Total de Artigos", len(df_filtered))
-col2.metric("Bases de Dados", df_filtered["source"].nunique())
-col3.metric("Periódicos Únicos", df_filtered["journal"].nunique())
+col1.metric("Total de Artigos", stats["Total de artigos"])
+col2.metric("Bases de Dados", stats["Bases de dados únicas"])
+col3.metric("Periódicos Únicos", stats["Periódicos únicos"])
 
 # 📊 Gráfico: Distribuição por Base de Dados
 st.subheader("📌 Distribuição de Artigos por Base de Dados")
+base_counts = db.count_by_source(**filtros)
 fig, ax = plt.subplots(figsize=(10, 5))
-sns.countplot(y=df_filtered["source"], order=df_filtered["source"].value_counts().index, palette="viridis", ax=ax)
+sns.barplot(x=base_counts["count"].to_list(), y=base_counts["source"].to_list(), palette="viridis", ax=ax)
 ax.set_xlabel("Quantidade de Artigos")
 ax.set_ylabel("Base de Dados")
 ax.set_title("Distribuição de Artigos por Base de Dados")
@@ -48,9 +47,9 @@ st.pyplot(fig)
 
 # 📊 Gráfico: Distribuição ao longo do tempo
 st.subheader("📌 Distribuição dos Artigos ao Longo do Tempo")
-df_filtered["Ano"] = pd.to_datetime(df_filtered["pub_date"], errors="coerce").dt.year
+yearly_counts = db.count_by_year(**filtros)
 fig, ax = plt.subplots(figsize=(10, 5))
-sns.histplot(df_filtered["Ano"].dropna(), bins=15, kde=True, color="blue", ax=ax)
+sns.barplot(x=yearly_counts["year"].to_list(), y=yearly_counts["count"].to_list(), color="blue", ax=ax)
 ax.set_xlabel("Ano de Publicação")
 ax.set_ylabel("Quantidade de Artigos")
 ax.set_title("Distribuição dos Artigos ao Longo do Tempo")
@@ -58,21 +57,20 @@ st.pyplot(fig)
 
 # 📊 Top 10 Periódicos
 st.subheader("📌 Top 10 Periódicos")
-top_journals = df_filtered["journal"].value_counts().head(10)
+top_journals = db.count_by_journal(10, **filtros)
 fig, ax = plt.subplots(figsize=(10, 5))
-sns.barplot(x=top_journals.values, y=top_journals.index, palette="magma", ax=ax)
+sns.barplot(x=top_journals["count"].to_list(), y=top_journals["journal"].to_list(), palette="magma", ax=ax)
 ax.set_xlabel("Quantidade de Artigos")
 ax.set_ylabel("Periódico")
 ax.set_title("Top 10 Periódicos com Mais Artigos Publicados")
 st.pyplot(fig)
 
-# 📋 Exibir tabela interativa
+# 📋 Exibir tabela interativa (paginada no servidor)
 st.subheader("📋 Tabela de Artigos")
-st.dataframe(df_filtered, use_container_width=True)
+paginated_table(db, filtros)
 
-# 📥 Download dos dados filtrados
+# 📥 Download dos dados filtrados (gerado só no clique)
 st.subheader("📥 Exportar Dados")
-excel_file = df_filtered.to_csv(index=False).encode("utf-8")
-st.download_button(label="📥 Baixar CSV", data=excel_file, file_name="artigos_filtrados.csv", mime="text/csv")
+export_buttons(db, filtros)
 
 st.success("✅ Análise concluída!")
@@ -0,0 +1,179 @@
+import numpy as np
+import polars as pl
+from health_edu_apps_etl.config import DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_THRESHOLD, DEDUP_MIN_TITLE_LENGTH
+
+SEED = 42  # Semente dos hashes MinHash (assinaturas reprodutíveis entre execuções)
+
+# 🔹 Prefixos com que as fontes escrevem o DOI ("doi:10.1000/x", "https://doi.org/10.1000/x")
+DOI_PREFIX = r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)"
+
+
+def normalize_doi(column="doi"):
+    """Expressão que padroniza o DOI (minúsculas, sem prefixo); valores que não são DOI viram nulo"""
+    doi = pl.col(column).str.strip_chars().str.to_lowercase().str.replace(DOI_PREFIX, "")
+    return pl.when(doi.str.starts_with("10.")).then(doi)
+
+
+def normalize_title(column="title"):
+    """Expressão que padroniza o título: minúsculas, sem acentos, pontuação nem espaços repetidos"""
+    return (
+        pl.col(column)
+        .str.to_lowercase()
+        .str.normalize("NFKD")
+        .str.replace_all(r"\p{M}", "")
+        .str.replace_all(r"[^\p{L}\p{N}]+", " ")
+        .str.strip_chars()
+    )
+
+
+def shingles(df):
+    """
+    Tokens de cada registro, como hashes de 64 bits: palavras e pares de palavras do título
+    normalizado e palavras do primeiro autor. Retorna uma lista de DataFrames (`row`, `hash`),
+    cada um já ordenado por registro.
+    """
+    row = pl.int_range(pl.len(), dtype=pl.UInt32).alias("row")
+    words = (
+        df.select(row, normalize_title("title").str.split(" ").alias("word"))
+        .explode("word", empty_as_null=False, keep_nulls=False)
+        .filter(pl.col("word").str.len_chars() > 0)
+    )
+    same_title = pl.col("row") == pl.col("row").shift(-1)
+    bigrams = words.select(
+        "row",
+        pl.when(same_title).then(pl.col("word") + " " + pl.col("word").shift(-1)).alias("word"),
+    ).drop_nulls()
+    author = (
+        df.select(row, pl.col("authors").list.first().alias("author"))
+        .select("row", normalize_title("author").str.split(" ").alias("word"))
+        .explode("word", empty_as_null=False, keep_nulls=False)
+        .filter(pl.col("word").str.len_chars() > 2)
+        .with_columns(("@" + pl.col("word")).alias("word"))  # Não se confunde com palavras do título
+    )
+    return [tokens.select("row", pl.col("word").hash(SEED).alias("hash")) for tokens in (words, bigrams, author)]
+
+
+def minhash_signatures(df, num_perm=DEDUP_NUM_PERM, seed=SEED):
+    """
+    Assinaturas MinHash dos registros: para cada função de hash, o menor valor entre os tokens.
+    Retorna (índices dos registros com tokens, matriz `num_perm` × uint32); custo linear no
+    número de tokens, sem ordenar nem comparar registros.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    # 🔹 Uma linha por função de hash durante o cálculo (acesso contíguo); transposta no final
+    signatures = np.full((num_perm, len(df)), np.iinfo(np.uint32).max, dtype=np.uint32)
+    has_tokens = np.zeros(len(df), dtype=bool)
+    for tokens in shingles(df):
+        if tokens.is_empty():
+            continue
+        rows = tokens["row"].to_numpy()
+        hashes = tokens["hash"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        present = rows[starts]
+        has_tokens[present] = True
+        permuted = np.empty_like(hashes)
+        for i in range(num_perm):
+            # 🔹 Hash multiply-shift: (a·h + b) mod 2^64, usando os 32 bits altos (operações no lugar)
+            np.multiply(hashes, a[i], out=permuted)
+            np.add(permuted, b[i], out=permuted)
+            np.right_shift(permuted, np.uint64(32), out=permuted)
+            lowest = np.minimum.reduceat(permuted, starts).astype(np.uint32)
+            signatures[i, present] = np.minimum(signatures[i, present], lowest)
+
+    rows = np.flatnonzero(has_tokens)
+    return rows, np.ascontiguousarray(signatures[:, rows].T)
+
+
+def lsh_pairs(rows, signatures, bands=DEDUP_BANDS, threshold=DEDUP_THRESHOLD):
+    """
+    Pares candidatos do LSH: registros que coincidem em alguma banda da assinatura caem no
+    mesmo balde. Cada registro é comparado só com o primeiro do balde (sem comparar todos
+    os pares) e o par é mantido se a similaridade estimada atingir `threshold`.
+    """
+    if len(rows) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    band_width = signatures.shape[1] // bands
+    positions = np.arange(len(rows))
+    left, right = [], []
+    for band in range(bands):
+        chunk = signatures[:, band * band_width:(band + 1) * band_width]
+        buckets = pl.DataFrame(chunk).hash_rows(seed=band)
+        first = pl.DataFrame({"bucket": buckets, "pos": positions}).select(
+            pl.col("pos").first().over("bucket")
+        )["pos"].to_numpy()
+        candidates = first != positions
+        left.append(first[candidates])
+        right.append(positions[candidates])
+
+    left, right = np.concatenate(left), np.concatenate(right)
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    keep = similarity >= threshold
+    return rows[left[keep]], rows[right[keep]]
+
+
+def key_pairs(keys):
+    """Liga cada registro ao primeiro registro com a mesma chave (chaves nulas não ligam)"""
+    frame = pl.DataFrame({"key": keys}).with_row_index("row").drop_nulls("key")
+    frame = frame.with_columns(pl.col("row").first().over("key").alias("first")).filter(pl.col("row") != pl.col("first"))
+    return frame["first"].to_numpy().astype(np.int64), frame["row"].to_numpy().astype(np.int64)
+
+
+def connected_components(size, left, right):
+    """Componentes conexos por propagação do menor rótulo com salto de ponteiros (vetorizado)"""
+    labels = np.arange(size)
+    if len(left) == 0:
+        return labels
+    while True:
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def assign_clusters(df, threshold=DEDUP_THRESHOLD, bands=DEDUP_BANDS, num_perm=DEDUP_NUM_PERM):
+    """
+    Agrupa registros do mesmo artigo vindos de fontes diferentes e adiciona `cluster_id`:
+    1. mesmo DOI;
+    2. mesmo título normalizado (a partir de `DEDUP_MIN_TITLE_LENGTH` caracteres);
+    3. MinHash/LSH sobre título e primeiro autor, para títulos quase iguais.
+    Espera o schema canônico (autores em lista). Os grupos são numerados na ordem de entrada.
+    """
+    if df.is_empty():
+        return df.with_columns(pl.lit(None, pl.UInt32).alias("cluster_id"))
+
+    keys = df.select(
+        normalize_doi("doi").alias("doi"),
+        pl.when(normalize_title("title").str.len_chars() >= DEDUP_MIN_TITLE_LENGTH).then(normalize_title("title")).alias("title"),
+    )
+    doi_left, doi_right = key_pairs(keys["doi"])
+    title_left, title_right = key_pairs(keys["title"])
+    lsh_left, lsh_right = lsh_pairs(*minhash_signatures(df, num_perm), bands=bands, threshold=threshold)
+
+    labels = connected_components(
+        len(df),
+        np.concatenate([doi_left, title_left, lsh_left]),
+        np.concatenate([doi_right, title_right, lsh_right]),
+    )
+    return df.with_columns(pl.Series("cluster_id", labels).rank("dense").cast(pl.UInt32) - 1)
+
+
+def deduplicate(df, **kwargs):
+    """
+    Mantém um registro por grupo (de preferência um com DOI), com a coluna `cluster_id`.
+    Retorna (artigos únicos, todos os registros com seu `cluster_id`).
+    """
+    clustered = assign_clusters(df, **kwargs)
+    unique = (
+        clustered.sort(pl.col("doi").is_null(), maintain_order=True)
+        .unique(subset=["cluster_id"], keep="first", maintain_order=True)
+        .sort("cluster_id")
+    )
+    return unique, clustered
@@ -1,14 +1,24 @@
 import os
-import polars as pl
 import logging
+import polars as pl
+from datetime import date, datetime
+from functools import partial
 from pathlib import Path
 from dotenv import load_dotenv
-from health_edu_apps_etl.extract_pubmed import fetch_pubmed_articles
-from health_edu_apps_etl.extract_scopus import fetch_scopus_articles
-from health_edu_apps_etl.extract_wos import fetch_wos_articles
-from health_edu_apps_etl.extract_ieee import fetch_ieee_articles
-from health_edu_apps_etl.extract_scholar import fetch_scholar_articles
-from health_edu_apps_etl.extract_scielo import fetch_scielo_articles
+from health_edu_apps_etl import extract_pubmed, extract_scopus, extract_wos
+from health_edu_apps_etl.extract_pubmed import extract_pubmed_articles
+from health_edu_apps_etl.extract_scopus import extract_scopus_articles
+from health_edu_apps_etl.extract_wos import extract_wos_articles
+from health_edu_apps_etl.extract_ieee import extract_ieee_articles
+from health_edu_apps_etl.extract_scielo import fetch_scielo_articles, iter_scielo_pages
+from health_edu_apps_etl.extraction_engine import run_extractors, format_timings, count_rows
+from health_edu_apps_etl.catalog import connect as connect_catalog, upsert_articles, start_run, finish_run
+from health_edu_apps_etl.http_client import format_stats
+from health_edu_apps_etl.config import INCREMENTAL_EXTRACTION, SHARDED_HARVEST, CHECKPOINTED_RUNS, SINK_ROW_GROUP_SIZE
+from health_edu_apps_etl.query_planner import SHARDABLE, harvest
+from health_edu_apps_etl.run_journal import RunJournal, run_checkpointed
+from health_edu_apps_etl.transform_data import clean_articles
+from health_edu_apps_etl.watermarks import get_watermark, advance_watermarks
 
 # 📌 Configuração de logs
 logging.basicConfig(
@@ -27,86 +37,155 @@ PROCESSED_DATA_DIR = BASE_DIR / "data" / "processed"
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-# 🔹 Caminho dos arquivos combinados
-CSV_FILE = PROCESSED_DATA_DIR / "all_articles.csv"
-PARQUET_FILE = PROCESSED_DATA_DIR / "all_articles.parquet"
-
 # 🔹 Configurações globais
 MAX_RESULTS = int(os.getenv("MAX_RESULTS", 50))
 
-def run_etl():
+# 🔹 Fontes extraídas: nome → (função de extração, prefixo dos arquivos brutos)
+# O Google Scholar fica de fora enquanto `extract_scholar` não tiver extrator.
+SOURCES = {
+    "PubMed": (extract_pubmed_articles, "pubmed"),
+    "Scopus": (extract_scopus_articles, "scopus"),
+    "Web of Science": (extract_wos_articles, "wos"),
+    "IEEE Xplore": (extract_ieee_articles, "ieee"),
+    "SciELO": (fetch_scielo_articles, "scielo"),
+}
+
+# 🔹 Fontes cujas APIs aceitam janela de datas (marca d'água)
+INCREMENTAL_SOURCES = {"PubMed", "Scopus", "Web of Science", "SciELO"}
+
+
+# 🔹 Extração paginada para o diário de execução: cada função gera (página, DataFrame, cursor)
+# e recebe em `done` as páginas já concluídas numa tentativa anterior
+def _pubmed_pages(max_results, since=None, until=None, done=None):
+    start_page = max(done, default=-1) + 1  # As páginas da PubMed são sequenciais
+    pages = extract_pubmed.iter_pubmed_pages(extract_pubmed.QUERY, max_results=max_results, since=since, until=until, start_page=start_page)
+    for page, df in pages:
+        yield page, df, None
+
+def _scopus_pages(max_results, since=None, until=None, done=None):
+    query = extract_scopus.incremental_query(extract_scopus.QUERY, since)
+    if not done:
+        yield from extract_scopus.scan_scopus_pages(query, max_records=max_results)
+        return
+    last = max(done)
+    fetched = sum(checkpoint["rows"] for checkpoint in done.values())
+    yield from extract_scopus.scan_scopus_pages(query, max_records=max_results, cursor=done[last]["cursor"], fetched=fetched, page=last + 1)
+
+def _wos_pages(max_results, since=None, until=None, done=None):
+    for page, df in extract_wos.iter_wos_pages(extract_wos.QUERY, since, until, max_records=max_results, done=done or {}):
+        yield page, df, None
+
+def _ieee_pages(max_results, since=None, until=None, done=None):
+    if not done:
+        yield 0, extract_ieee_articles(max_results), None
+
+def _scielo_pages(max_results, since=None, until=None, done=None):
+    for page, df in iter_scielo_pages(max_results, since=since, until=until, done=done or {}):
+        yield page, df, None
+
+
+PAGED_SOURCES = {
+    "PubMed": _pubmed_pages,
+    "Scopus": _scopus_pages,
+    "Web of Science": _wos_pages,
+    "IEEE Xplore": _ieee_pages,
+    "SciELO": _scielo_pages,
+}
+
+def build_jobs(incremental, until, sharded=SHARDED_HARVEST, journal=None):
+    """
+    Monta as tarefas de extração: incremental desde a marca d'água quando houver,
+    senão completa (fatiada por data de publicação se `sharded`) ou limitada a MAX_RESULTS.
+    Com `journal`, as fontes não fatiadas gravam checkpoints por página e retomam de onde pararam.
+    """
+    jobs = []
+    for name, (func, prefix) in SOURCES.items():
+        since = get_watermark(name) if incremental and name in INCREMENTAL_SOURCES else None
+        if since:
+            logging.info(f"🔖 {name}: extração incremental de {since} até {until}")
+        elif sharded and name in SHARDABLE:
+            logging.info(f"🧩 {name}: extração completa fatiada por data de publicação")
+            jobs.append((name, partial(harvest, name, end=until)))
+            continue
+
+        window = {"since": since, "until": until} if since else {}
+        if journal is not None:
+            directory = RAW_DATA_DIR / f"source={prefix}" / f"run={journal.run_id}"
+            jobs.append((name, partial(run_checkpointed, name, PAGED_SOURCES[name], journal, directory, max_results=MAX_RESULTS, **window)))
+        else:
+            jobs.append((name, partial(func, MAX_RESULTS, **window)))
+    return jobs
+
+def upsert_in_batches(con, data, source, run_id, batch_size=SINK_ROW_GROUP_SIZE):
+    """
+    Grava no catálogo um LazyFrame de artigos brutos em fatias de `batch_size` linhas:
+    o pico de memória é um lote, não a fonte inteira. Retorna o número de artigos gravados.
+    """
+    upserted = 0
+    for offset in range(0, count_rows(data), batch_size):
+        batch = clean_articles(data.slice(offset, batch_size), source).collect(engine="streaming")
+        upserted += upsert_articles(con, batch, run_id)
+    return upserted
+
+def run_etl(incremental=INCREMENTAL_EXTRACTION, checkpointed=CHECKPOINTED_RUNS):
     """Executa o pipeline ETL para todas as bases de dados"""
     logging.info("🚀 Iniciando pipeline ETL...")
+    run_date = date.today()
+    run_id = datetime.now().isoformat(timespec="seconds")
+    journal = RunJournal(run_date) if checkpointed else None
+
+    # 🔍 Etapa 1: Extração concorrente dos artigos
+    print("🔍 Extraindo artigos de todas as bases em paralelo...")
+    results = run_extractors(build_jobs(incremental, run_date, journal=journal))
 
-    # 🔍 Etapa 1: Extração dos artigos
-    print("🔍 Extraindo artigos...")
     datasets = []
+    for result in results:
+        source, data = result["source"], result["data"]
+        logging.info(f"⏱️ {source}: {result['status']} em {result['elapsed']:.1f}s")
+        if result["status"] != "ok":
+            logging.warning(f"⚠️ {source} sem dados ({result['status']}): {result['error']}")
+            continue
+
+        # 🔹 Fontes com diário chegam como LazyFrame sobre as partes Parquet: nada é carregado aqui
+        prefix = SOURCES[source][1]
+        data = data.lazy()
+        data.sink_csv(RAW_DATA_DIR / f"{prefix}_articles.csv")
+        data.sink_parquet(RAW_DATA_DIR / f"{prefix}_articles.parquet")
+        data = pl.scan_parquet(RAW_DATA_DIR / f"{prefix}_articles.parquet")
+        datasets.append((source, data))
+        logging.info(f"✅ {count_rows(data)} artigos extraídos de {source}.")
+
+    print("⏱️ Tempo por fonte:")
+    print(format_timings(results))
+    print("🌐 Tráfego HTTP por fonte:")
+    print(format_stats())
+    logging.info(f"🌐 Tráfego HTTP por fonte:\n{format_stats()}")
 
-    # 📌 PubMed
-    print("📡 Extraindo da PubMed...")
-    pubmed_data = fetch_pubmed_articles(MAX_RESULTS)
-    if not pubmed_data.is_empty():
-        pubmed_data.write_csv(RAW_DATA_DIR / "pubmed_articles.csv")
-        pubmed_data.write_parquet(RAW_DATA_DIR / "pubmed_articles.parquet")
-        datasets.append(pubmed_data)
-        logging.info(f"✅ {len(pubmed_data)} artigos extraídos da PubMed.")
-
-    # 📌 Scopus
-    print("📡 Extraindo da Scopus...")
-    scopus_data = fetch_scopus_articles(MAX_RESULTS)
-    if not scopus_data.is_empty():
-        scopus_data.write_csv(RAW_DATA_DIR / "scopus_articles.csv")
-        scopus_data.write_parquet(RAW_DATA_DIR / "scopus_articles.parquet")
-        datasets.append(scopus_data)
-        logging.info(f"✅ {len(scopus_data)} artigos extraídos da Scopus.")
-
-    # 📌 Web of Science
-    print("📡 Extraindo da Web of Science...")
-    wos_data = fetch_wos_articles(MAX_RESULTS)
-    if not wos_data.is_empty():
-        wos_data.write_csv(RAW_DATA_DIR / "wos_articles.csv")
-        wos_data.write_parquet(RAW_DATA_DIR / "wos_articles.parquet")
-        datasets.append(wos_data)
-        logging.info(f"✅ {len(wos_data)} artigos extraídos da Web of Science.")
-
-    # 📌 IEEE Xplore
-    print("📡 Extraindo do IEEE Xplore...")
-    ieee_data = fetch_ieee_articles(MAX_RESULTS)
-    if not ieee_data.is_empty():
-        ieee_data.write_csv(RAW_DATA_DIR / "ieee_articles.csv")
-        ieee_data.write_parquet(RAW_DATA_DIR / "ieee_articles.parquet")
-        datasets.append(ieee_data)
-        logging.info(f"✅ {len(ieee_data)} artigos extraídos do IEEE Xplore.")
-
-    # 📌 Google Scholar
-    print("📡 Extraindo do Google Scholar...")
-    scholar_data = fetch_scholar_articles(MAX_RESULTS)
-    if not scholar_data.is_empty():
-        scholar_data.write_csv(RAW_DATA_DIR / "scholar_articles.csv")
-        scholar_data.write_parquet(RAW_DATA_DIR / "scholar_articles.parquet")
-        datasets.append(scholar_data)
-        logging.info(f"✅ {len(scholar_data)} artigos extraídos do Google Scholar.")
-
-    # 📌 SciELO
-    print("📡 Extraindo do SciELO...")
-    scielo_data = fetch_scielo_articles(MAX_RESULTS)
-    if not scielo_data.is_empty():
-        scielo_data.write_csv(RAW_DATA_DIR / "scielo_articles.csv")
-        scielo_data.write_parquet(RAW_DATA_DIR / "scielo_articles.parquet")
-        datasets.append(scielo_data)
-        logging.info(f"✅ {len(scielo_data)} artigos extraídos do SciELO.")
-
-    # 🔍 Etapa 2: Consolidação dos artigos
-    print("📊 Consolidando dados...")
+    # 🔍 Etapa 2: Upsert dos lotes no catálogo DuckDB (custo proporcional ao lote, não ao catálogo)
+    print("📊 Gravando artigos no catálogo...")
     if datasets:
-        combined_data = pl.concat(datasets, how="vertical").unique(subset=["id"])
-        combined_data.write_csv(CSV_FILE)
-        combined_data.write_parquet(PARQUET_FILE)
-        logging.info(f"📦 {len(combined_data)} artigos combinados salvos em `{CSV_FILE}` e `{PARQUET_FILE}`.")
-        print(f"✅ {len(combined_data)} artigos salvos com sucesso!")
+        con = connect_catalog()
+        try:
+            start_run(con, run_id, [source for source, _ in datasets])
+            upserted = sum(upsert_in_batches(con, data, source, run_id) for source, data in datasets)
+            status = "ok" if all(r["status"] in ("ok", "empty") for r in results) else "partial"
+            finish_run(con, run_id, status, upserted)
+        finally:
+            con.close()
+        logging.info(f"📦 {upserted} artigos gravados no catálogo (execução {run_id}).")
+        print(f"✅ {upserted} artigos gravados no catálogo com sucesso!")
     else:
         print("❌ Nenhum dado extraído. Verifique as APIs.")
         logging.warning("⚠️ Nenhum dado foi extraído.")
 
+    # 🔖 Só avança a marca d'água de quem trouxe dados já gravados no dataset
+    # (resultado vazio pode ser falha silenciosa da API, então a janela é mantida)
+    succeeded = [r["source"] for r in results if r["status"] == "ok" and r["source"] in INCREMENTAL_SOURCES]
+    advance_watermarks(succeeded, run_date)
+
+    # 🔁 O diário só é descartado quando nenhuma fonte falhou; senão a próxima tentativa retoma dele
+    if journal is not None and all(r["status"] in ("ok", "empty") for r in results):
+        journal.discard()
+
 if __name__ == "__main__":
     run_etl()
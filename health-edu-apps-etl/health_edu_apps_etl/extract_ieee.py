@@ -1,43 +1,73 @@
 import os
 import requests
 import polars as pl
+import time
 from dotenv import load_dotenv
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.raw_archive import archive_response
+from health_edu_apps_etl.records import AUTHOR_SEPARATOR, ArticleBatch
+from health_edu_apps_etl.rate_limiter import backoff_delay
 
 # Carregar credenciais do .env
 load_dotenv()
 IEEE_API_KEY = os.getenv("IEEE_API_KEY")
+RETRIES = 3  # Tentativas de requisição em caso de falha
 
 QUERY = "mobile applications AND health education AND data analysis"
 
-def fetch_ieee_articles(query, max_results=10):
+def request_ieee(params, retries=RETRIES):
+    """ Executa uma chamada à API IEEE Xplore com novas tentativas e retorna o JSON (ou propaga a falha) """
+    url = "https://ieeexploreapi.ieee.org/api/v1/search/articles"
+
+    for attempt in range(retries):
+        try:
+            response = http_client.get("IEEE Xplore", url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            archive_response("IEEE Xplore", "search", data, params, response)
+            return data
+
+        except (requests.RequestException, ValueError) as e:
+            if attempt + 1 == retries:
+                print(f"❌ Falha na API IEEE Xplore após {retries} tentativas.")
+                raise
+            print(f"⚠️ Erro na tentativa {attempt+1} na API IEEE Xplore: {e}")
+            time.sleep(backoff_delay(attempt))
+
+def fetch_ieee_articles(query, max_results=10, retries=RETRIES):
     """ Extrai artigos da API IEEE Xplore e retorna um DataFrame """
-    url = "http://ieeexploreapi.ieee.org/api/v1/search/articles"
     params = {
         "apikey": IEEE_API_KEY,
         "format": "json",
         "max_records": max_results,
         "querytext": query,
     }
-    
-    response = requests.get(url, params=params)
-    data = response.json()
+    data = request_ieee(params, retries)
 
     if "articles" not in data:
         print("❌ Erro na resposta da API IEEE Xplore:", data)
         return pl.DataFrame()
 
-    articles = []
+    return process_ieee_articles(data)
+
+def process_ieee_articles(data):
+    """ Processa os artigos retornados pela API IEEE Xplore """
+    articles = ArticleBatch("IEEE Xplore")
     for article in data["articles"]:
-        articles.append({
-            "id": article.get("article_number", "N/A"),
-            "title": article.get("title", "N/A"),
-            "journal": article.get("publication_title", "N/A"),
-            "authors": ", ".join(article.get("authors", [])) if "authors" in article else "N/A",
-            "pub_date": article.get("publication_year", "N/A"),
-            "source": "IEEE Xplore",
-        })
-
-    return pl.DataFrame(articles)
+        articles.append(
+            id=str(article.get("article_number", "N/A")),
+            doi=article.get("doi", "N/A"),
+            title=article.get("title", "N/A"),
+            journal=article.get("publication_title", "N/A"),
+            authors=AUTHOR_SEPARATOR.join(article.get("authors", [])) if "authors" in article else "N/A",
+            pub_date=str(article.get("publication_year", "N/A")),  # A API devolve o ano como número
+        )
+
+    return articles.to_frame()
+
+def extract_ieee_articles(max_results=10, query=QUERY):
+    """ Extrai artigos do IEEE Xplore usando a estratégia de busca padrão """
+    return fetch_ieee_articles(query, max_results)
 
 if __name__ == "__main__":
     print("🔍 Extraindo artigos do IEEE Xplore...")
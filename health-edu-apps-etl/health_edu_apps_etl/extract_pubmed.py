@@ -2,16 +2,21 @@ import os
 import requests
 import polars as pl
 import time
+from datetime import date
 from dotenv import load_dotenv
 from pathlib import Path
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.raw_archive import archive_response
+from health_edu_apps_etl.records import AUTHOR_SEPARATOR, ArticleBatch
+from health_edu_apps_etl.rate_limiter import backoff_delay
 
 # 🔹 Carregar variáveis de ambiente
 load_dotenv()
 PUBMED_API_KEY = os.getenv("PUBMED_API_KEY")
 MAX_RESULTS = int(os.getenv("PUBMED_MAX_RESULTS", 50))  # Padrão: 50 artigos
 RETRIES = 3  # Tentativas de requisição em caso de falha
-DELAY = 5  # Tempo de espera entre tentativas
-DETAILS_DELAY = 2  # Tempo de espera entre requisições de detalhes dos artigos
+BATCH_SIZE = int(os.getenv("PUBMED_BATCH_SIZE", 200))  # IDs por chamada ao esummary
+POST_THRESHOLD = 200  # Acima deste número de IDs a requisição é enviada via POST
 
 # 🔹 Estratégia de busca (ajustada para precisão e replicabilidade)
 QUERY = (
@@ -27,7 +32,41 @@ RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 CSV_FILE = RAW_DATA_DIR / "pubmed_articles.csv"
 PARQUET_FILE = RAW_DATA_DIR / "pubmed_articles.parquet"
 
-def fetch_pubmed_articles(query, max_results=MAX_RESULTS, retries=RETRIES, delay=DELAY):
+def date_window(since=None, until=None, datetype="edat"):
+    """Parâmetros do esearch para restringir a busca a um intervalo de datas (EDAT ou PDAT)"""
+    if not (since or until):
+        return {}
+    return {
+        "datetype": datetype,
+        "mindate": (since or date(1900, 1, 1)).strftime("%Y/%m/%d"),
+        "maxdate": (until or date.today()).strftime("%Y/%m/%d"),
+    }
+
+def count_pubmed_articles(query, since=None, until=None, datetype="pdat", retries=RETRIES):
+    """Retorna o total de resultados da busca no intervalo de datas, sem baixar IDs"""
+    url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    params = {
+        "db": "pubmed",
+        "term": query,
+        "rettype": "count",
+        "retmode": "json",
+        "api_key": PUBMED_API_KEY,
+        **date_window(since, until, datetype),
+    }
+
+    for attempt in range(retries):
+        try:
+            response = http_client.get("PubMed", url, params=params)
+            response.raise_for_status()
+            return int(response.json()["esearchresult"]["count"])
+
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"⚠️ Erro na tentativa {attempt+1} ao contar resultados: {e}")
+            time.sleep(backoff_delay(attempt))
+
+    raise RuntimeError(f"Não foi possível contar os resultados da PubMed entre {since} e {until}")
+
+def fetch_pubmed_articles(query, max_results=MAX_RESULTS, retries=RETRIES):
     """Extrai IDs dos artigos da API PubMed"""
     
     url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
@@ -41,55 +80,175 @@ def fetch_pubmed_articles(query, max_results=MAX_RESULTS, retries=RETRIES, delay
 
     for attempt in range(retries):
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get("PubMed", url, params=params)
             response.raise_for_status()
             data = response.json()
+            archive_response("PubMed", "esearch", data, params, response)
 
             if "esearchresult" not in data:
                 print(f"⚠️ Tentativa {attempt+1}: Resposta inesperada da API PubMed:", data)
-                time.sleep(delay)
+                time.sleep(backoff_delay(attempt))
                 continue
             
             return data["esearchresult"]["idlist"]
 
         except requests.RequestException as e:
             print(f"⚠️ Erro na tentativa {attempt+1}: {e}")
-            time.sleep(delay)
+            time.sleep(backoff_delay(attempt))
 
     print("❌ Todas as tentativas falharam. Verifique a API.")
     return []
 
 
-def fetch_article_details(article_ids):
-    """Coleta detalhes dos artigos da PubMed"""
-    articles = []
+def parse_summary_result(data):
+    """Converte o payload `result` do esummary (um ou vários registros) em um `ArticleBatch`"""
+    result = data.get("result", {})
+    articles = ArticleBatch("PubMed")
 
-    for idx, article_id in enumerate(article_ids):
-        time.sleep(DETAILS_DELAY)  # Espera para evitar bloqueios
-        article_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-        article_params = {"db": "pubmed", "id": article_id, "retmode": "json"}
-        
-        try:
-            article_response = requests.get(article_url, params=article_params, timeout=10)
-            article_response.raise_for_status()
-            article_data = article_response.json()
-
-            if article_id in article_data.get("result", {}):
-                article_info = article_data["result"][article_id]
-                articles.append({
-                    "id": article_id,
-                    "title": article_info.get("title", "N/A"),
-                    "journal": article_info.get("source", "N/A"),
-                    "authors": ", ".join([a["name"] for a in article_info.get("authors", [])]) if "authors" in article_info else "N/A",
-                    "pub_date": article_info.get("pubdate", "N/A"),
-                    "source": "PubMed",
-                })
-        
-        except requests.RequestException as e:
-            print(f"⚠️ Erro ao buscar artigo {article_id}: {e}")
+    for article_id in result.get("uids", []):
+        article_info = result.get(article_id)
+        if not article_info or "error" in article_info:
             continue
+        articles.append(
+            id=article_id,
+            doi=next((i["value"] for i in article_info.get("articleids", []) if i.get("idtype") == "doi"), "N/A"),
+            title=article_info.get("title", "N/A"),
+            journal=article_info.get("source", "N/A"),
+            authors=AUTHOR_SEPARATOR.join([a["name"] for a in article_info.get("authors", [])]) if "authors" in article_info else "N/A",
+            pub_date=article_info.get("pubdate", "N/A"),
+        )
+
+    return articles
+
+
+def request_summary(params, label, post=False, retries=RETRIES, cache=True):
+    """Executa uma chamada ao esummary com novas tentativas e devolve as linhas parseadas (ou propaga a falha)"""
+    url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+
+    for attempt in range(retries):
+        try:
+            if post:
+                response = http_client.post("PubMed", url, data=params, cache=cache)
+            else:
+                response = http_client.get("PubMed", url, params=params, cache=cache)
+            response.raise_for_status()
+            data = response.json()
+            archive_response("PubMed", "esummary", data, params, response)
+            return parse_summary_result(data)
+
+        except (requests.RequestException, ValueError) as e:
+            # 🔹 Uma página perdida não pode virar página vazia: o diário retoma a partir dela
+            if attempt + 1 == retries:
+                print(f"❌ Falha ao buscar {label} após {retries} tentativas.")
+                raise
+            print(f"⚠️ Erro na tentativa {attempt+1} para {label}: {e}")
+            time.sleep(backoff_delay(attempt))
+
+
+def fetch_summary_batch(article_ids, retries=RETRIES):
+    """Busca o esummary de um lote de IDs em uma única requisição"""
+    params = {
+        "db": "pubmed",
+        "id": ",".join(article_ids),
+        "retmode": "json",
+        "api_key": PUBMED_API_KEY,
+    }
+    # 🔹 Listas longas vão no corpo (POST) para não estourar o limite da URL
+    post = len(article_ids) > POST_THRESHOLD
+    return request_summary(params, f"o lote de {len(article_ids)} artigos", post, retries)
+
+
+def fetch_article_details(article_ids, batch_size=BATCH_SIZE):
+    """Coleta detalhes dos artigos da PubMed em lotes de `batch_size` IDs"""
+    articles = ArticleBatch("PubMed")
+    article_ids = [str(article_id) for article_id in article_ids]
+
+    for start in range(0, len(article_ids), batch_size):
+        articles.extend(fetch_summary_batch(article_ids[start:start + batch_size]))
+
+    return articles.to_frame()
+
+
+def search_pubmed_history(query, retries=RETRIES, since=None, until=None, datetype="edat"):
+    """
+    Executa o esearch com `usehistory=y` e retorna WebEnv, query_key e total de resultados.
+
+    `since`/`until` (datas) restringem a busca pela data de entrada no PubMed
+    (EDAT, padrão) ou pela data de publicação (`datetype="pdat"`).
+    """
+    url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    params = {
+        "db": "pubmed",
+        "term": query,
+        "usehistory": "y",
+        "retmax": 0,  # Os IDs ficam no servidor de histórico
+        "retmode": "json",
+        "api_key": PUBMED_API_KEY,
+        **date_window(since, until, datetype),
+    }
+
+    for attempt in range(retries):
+        try:
+            response = http_client.get("PubMed", url, params=params, cache=False)
+            response.raise_for_status()
+            data = response.json()
+            archive_response("PubMed", "esearch", data, params, response)
+            result = data.get("esearchresult", {})
+
+            if "webenv" not in result:
+                print(f"⚠️ Tentativa {attempt+1}: Resposta sem WebEnv da API PubMed:", result)
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            return {
+                "webenv": result["webenv"],
+                "query_key": result["querykey"],
+                "count": int(result.get("count", 0)),
+            }
+
+        except (requests.RequestException, ValueError) as e:
+            print(f"⚠️ Erro na tentativa {attempt+1}: {e}")
+            time.sleep(backoff_delay(attempt))
+
+    print("❌ Todas as tentativas falharam. Verifique a API.")
+    return None
+
+
+def iter_pubmed_pages(query, page_size=BATCH_SIZE, max_results=None, since=None, until=None, datetype="edat", start_page=0):
+    """Percorre o resultado da busca via servidor de histórico a partir de `start_page`, gerando (número da página, DataFrame)"""
+    history = search_pubmed_history(query, since=since, until=until, datetype=datetype)
+    if not history:
+        raise RuntimeError(f"Não foi possível abrir a busca da PubMed entre {since} e {until}")
+
+    total = history["count"] if max_results is None else min(history["count"], max_results)
+    print(f"✅ {history['count']} artigos encontrados na PubMed. Buscando {total} em páginas de {page_size}...")
+
+    for retstart in range(start_page * page_size, total, page_size):
+        params = {
+            "db": "pubmed",
+            "query_key": history["query_key"],
+            "WebEnv": history["webenv"],
+            "retstart": retstart,
+            "retmax": min(page_size, total - retstart),
+            "retmode": "json",
+            "api_key": PUBMED_API_KEY,
+        }
+        # 🔹 O WebEnv é efêmero: páginas do histórico não vão para o cache
+        articles = request_summary(params, f"a página iniciada em {retstart}", cache=False)
+        yield retstart // page_size, articles.to_frame()
+
+
+def iter_pubmed_batches(query, page_size=BATCH_SIZE, max_results=None, since=None, until=None, datetype="edat"):
+    """Percorre o resultado completo da busca via servidor de histórico, gerando um DataFrame por página"""
+    for _, batch in iter_pubmed_pages(query, page_size, max_results, since, until, datetype):
+        if not batch.is_empty():
+            yield batch
+
 
-    return pl.DataFrame(articles)
+def extract_pubmed_articles(max_results=MAX_RESULTS, query=QUERY, since=None, until=None, datetype="edat"):
+    """Extrai artigos da PubMed (opcionalmente só os do intervalo `since`–`until`) em um DataFrame"""
+    batches = list(iter_pubmed_batches(query, max_results=max_results, since=since, until=until, datetype=datetype))
+    return pl.concat(batches, how="vertical") if batches else pl.DataFrame()
 
 
 if __name__ == "__main__":
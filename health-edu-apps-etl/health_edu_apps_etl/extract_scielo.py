@@ -1,23 +1,27 @@
 import os
+import sys
 import requests
-import polars as pl
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from dotenv import load_dotenv
 from pathlib import Path
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.raw_archive import archive_response
+from health_edu_apps_etl.records import AUTHOR_SEPARATOR, Article, ArticleBatch
+from health_edu_apps_etl.rate_limiter import backoff_delay
 
 # 🔹 Carregar variáveis de ambiente
 load_dotenv()
 
 # 🔹 Configuração da API SciELO
 BASE_URL = "http://articlemeta.scielo.org/api/v1/article/"
-COLLECTION = "scl"
-
-# 🔹 Lista de códigos de artigos para extração
-ARTICLE_CODES = [
-    "S0103-40142005000200002",
-    "S0103-40142005000200003",
-    "S0103-40142005000200004"
-]
+IDENTIFIERS_URL = BASE_URL + "identifiers/"
+COLLECTION = os.getenv("SCIELO_COLLECTION", "scl")
+IDENTIFIERS_PAGE_SIZE = 1000  # Máximo de PIDs por página aceito pela API (`limit`)
+BATCH_SIZE = int(os.getenv("SCIELO_BATCH_SIZE", 100))  # Artigos por lote nas execuções com checkpoint
+MAX_WORKERS = int(os.getenv("SCIELO_WORKERS", 8))  # Artigos buscados em paralelo
+RETRIES = 3
 
 # 🔹 Diretório de saída
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -32,22 +36,60 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
-def fetch_scielo_article(article_code, retries=3, delay=5):
-    """Busca metadados de um artigo específico pelo código PID."""
-    url = f"{BASE_URL}?code={article_code}&collection={COLLECTION}"
+def list_article_codes(collection=COLLECTION, since=None, until=None, max_results=None,
+                       page_size=IDENTIFIERS_PAGE_SIZE, retries=RETRIES):
+    """Lista os PIDs de uma coleção (opcionalmente por data de processamento) via `identifiers`, paginando por offset."""
+    params = {"collection": collection, "limit": page_size, "offset": 0}
+    if since:
+        params["from"] = since.isoformat()
+    if until:
+        params["until"] = until.isoformat()
+
+    codes = []
+    while max_results is None or len(codes) < max_results:
+        data = None
+        for attempt in range(retries):
+            try:
+                # 🔹 A listagem muda a cada dia: sem cache, para não esconder PIDs novos por 30 dias
+                response = http_client.get("SciELO", IDENTIFIERS_URL, headers=HEADERS, params=params, cache=False)
+                response.raise_for_status()
+                data = response.json()
+                archive_response("SciELO", "identifiers", data, params, response)
+                break
+
+            except (requests.RequestException, ValueError) as e:
+                if attempt + 1 == retries:
+                    raise
+                print(f"⚠️ Erro na tentativa {attempt+1} ao listar PIDs (offset {params['offset']}): {e}")
+                time.sleep(backoff_delay(attempt))
+
+        objects = data.get("objects", [])
+        codes.extend(obj["code"] for obj in objects if obj.get("code"))
+        params = {**params, "offset": params["offset"] + len(objects)}
+        if not objects or params["offset"] >= data.get("meta", {}).get("total", 0):
+            break
+
+    return codes[:max_results]
+
+def fetch_scielo_article(article_code, retries=RETRIES, collection=COLLECTION):
+    """Busca metadados de um artigo específico pelo código PID (propaga a falha após `retries` tentativas)."""
+    url = f"{BASE_URL}?code={article_code}&collection={collection}"
 
     for attempt in range(retries):
         try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            response = http_client.get("SciELO", url, headers=HEADERS)
             response.raise_for_status()
-            return response.json()  # Retorna JSON estruturado do artigo
-
-        except requests.RequestException as e:
+            data = response.json()  # JSON estruturado do artigo
+            archive_response("SciELO", "article", data, {"code": article_code, "collection": collection}, response)
+            return data
+
+        except (requests.RequestException, ValueError) as e:
+            # 🔹 Um PID perdido não pode sumir de um lote que vai para o checkpoint
+            if attempt + 1 == retries:
+                print(f"❌ Falha ao buscar artigo {article_code} após {retries} tentativas.")
+                raise
             print(f"⚠️ Erro na tentativa {attempt+1} para {article_code}: {e}")
-            time.sleep(delay)
-
-    print(f"❌ Falha ao buscar artigo {article_code} após {retries} tentativas.")
-    return None
+            time.sleep(backoff_delay(attempt))
 
 def extract_field(data, field_list, default="N/A"):
     """Extrai um campo do JSON tentando múltiplas chaves possíveis."""
@@ -65,8 +107,8 @@ def format_date(date_str):
         return f"{date_str[:4]}-{date_str[4:6]}"
     return date_str
 
-def process_article_data(article_data):
-    """Extrai informações essenciais do artigo retornado pela API."""
+def process_article_data(article_data, code=None):
+    """Extrai informações essenciais do artigo retornado pela API em um `Article` (ou None)."""
     if not article_data:
         return None
 
@@ -80,46 +122,76 @@ def process_article_data(article_data):
     authors = "N/A"
     if "v10" in article_info:
         authors_list = [a.get("n", "N/A") for a in article_info["v10"] if a.get("n")]
-        authors = ", ".join(authors_list) if authors_list else "N/A"
+        authors = AUTHOR_SEPARATOR.join(authors_list) if authors_list else "N/A"
 
     # 🔹 Extração e formatação da data de publicação
     pub_date = format_date(extract_field(article_info, ["v65"], ""))
     if pub_date == "":
         pub_date = article_data.get("processing_date", "Data não encontrada")
 
-    return {
-        "title": title,
-        "journal": journal,
-        "authors": authors,
-        "publication_date": pub_date
-    }
-
-def extract_scielo_articles():
-    """Extrai artigos da SciELO e salva em CSV e Parquet."""
-    print("\n🔍 **Iniciando extração de artigos do SciELO...**\n")
-
-    articles = []
-    for code in ARTICLE_CODES:
-        article_data = fetch_scielo_article(code)
-        processed_data = process_article_data(article_data)
-        if processed_data:
-            articles.append(processed_data)
-
-    if not articles:
+    return Article(
+        "SciELO",
+        id=code or article_data.get("code", "N/A"),
+        doi=article_data.get("doi") or extract_field(article_info, ["v237"]),
+        title=title,
+        journal=journal,
+        authors=authors,
+        pub_date=pub_date,
+    )
+
+def fetch_scielo_row(code, collection=COLLECTION):
+    """Busca e processa um artigo, devolvendo o `Article` (ou None)."""
+    return process_article_data(fetch_scielo_article(code, collection=collection), code)
+
+def fetch_scielo_articles(max_results=None, article_codes=None, collection=COLLECTION, since=None, until=None,
+                          max_workers=MAX_WORKERS):
+    """
+    Busca e processa artigos da SciELO, retornando um DataFrame no schema do pipeline.
+
+    Sem `article_codes`, os PIDs são listados pela API `identifiers` da coleção
+    (filtrados pela data de processamento entre `since` e `until`).
+    """
+    if article_codes is None:
+        article_codes = list_article_codes(collection, since, until, max_results)
+    article_codes = article_codes[:max_results]
+
+    # 🔹 Os documentos são baixados em paralelo; o rate limiter do host controla a cota
+    articles = ArticleBatch("SciELO")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for article in executor.map(lambda code: fetch_scielo_row(code, collection), article_codes):
+            if article:
+                articles.add(article)
+
+    return articles.to_frame()
+
+def iter_scielo_pages(max_results=None, collection=COLLECTION, since=None, until=None, batch_size=BATCH_SIZE, done=()):
+    """Lista os PIDs e gera (número do lote, DataFrame) para cada lote ainda não concluído em `done`"""
+    codes = list_article_codes(collection, since, until, max_results)
+    for page, start in enumerate(range(0, len(codes), batch_size)):
+        if page not in done:
+            yield page, fetch_scielo_articles(article_codes=codes[start:start + batch_size], collection=collection)
+
+def extract_scielo_articles(since=None, until=None, max_results=None, collection=COLLECTION):
+    """Extrai os artigos de uma coleção da SciELO (opcionalmente em um período) e salva em CSV e Parquet."""
+    print(f"\n🔍 **Iniciando extração de artigos do SciELO (coleção {collection})...**\n")
+
+    df = fetch_scielo_articles(max_results, collection=collection, since=since, until=until)
+
+    if df.is_empty():
         print("❌ Nenhum artigo extraído.")
         return
 
-    # 🔹 Criando DataFrame Polars
-    df = pl.DataFrame(articles)
-
     # 🔹 Salvando os dados
     df.write_csv(CSV_FILE)
     df.write_parquet(PARQUET_FILE)
 
     print("\n✅ Extração concluída!")
-    print(f"📁 {len(articles)} artigos salvos em:")
+    print(f"📁 {len(df)} artigos salvos em:")
     print(f"   - CSV: {CSV_FILE}")
     print(f"   - Parquet: {PARQUET_FILE}")
 
 if __name__ == "__main__":
-    extract_scielo_articles()
+    # Uso: python -m health_edu_apps_etl.extract_scielo [AAAA-MM-DD inicial] [AAAA-MM-DD final]
+    start = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    end = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else None
+    extract_scielo_articles(start, end)
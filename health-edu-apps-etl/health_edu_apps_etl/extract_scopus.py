@@ -2,13 +2,22 @@ import os
 import requests
 import polars as pl
 import time
+from datetime import timedelta
 from dotenv import load_dotenv
 from pathlib import Path
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.raw_archive import archive_response
+from health_edu_apps_etl.records import ArticleBatch
+from health_edu_apps_etl.config import SINK_ROW_GROUP_SIZE
+from health_edu_apps_etl.rate_limiter import backoff_delay
+from health_edu_apps_etl.parquet_sink import ParquetSink
 
 # 🔹 Carregar credenciais do .env
 load_dotenv()
 SCOPUS_API_KEY = os.getenv("SCOPUS_API_KEY")
 MAX_RESULTS = int(os.getenv("SCOPUS_MAX_RESULTS", 10))  # Reduzir para 10 artigos para testar
+VIEW = os.getenv("SCOPUS_VIEW", "STANDARD")  # STANDARD (até 200 por página) ou COMPLETE (até 25)
+PAGE_SIZE = int(os.getenv("SCOPUS_PAGE_SIZE", 25 if VIEW == "COMPLETE" else 200))
 
 # 🔹 Ajuste na estratégia de busca
 QUERY = 'TITLE-ABS-KEY("mobile applications" OR "health apps" AND "data analysis")'
@@ -19,76 +28,144 @@ RAW_DATA_DIR = BASE_DIR / "data" / "raw"
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 CSV_FILE = RAW_DATA_DIR / "scopus_articles.csv"
 PARQUET_FILE = RAW_DATA_DIR / "scopus_articles.parquet"
+PARTS_DIR = RAW_DATA_DIR / "scopus_parts"
 
-def fetch_scopus_articles(query, max_results=MAX_RESULTS, retries=3, delay=5):
-    """Extrai artigos da API Scopus"""
-    
+def incremental_query(query, since=None):
+    """Restringe a busca aos registros carregados na Scopus a partir de `since`, inclusive (ORIG-LOAD-DATE)"""
+    if since is None:
+        return query
+    # 🔹 AFT é estritamente posterior: recua um dia para não perder os registros carregados em `since`
+    return f"({query}) AND ORIG-LOAD-DATE AFT {(since - timedelta(days=1)).strftime('%Y%m%d')}"
+
+def publication_year_query(query, start_year, end_year):
+    """Restringe a busca ao intervalo de anos de publicação (PUBYEAR), inclusive"""
+    return f"({query}) AND PUBYEAR > {start_year - 1} AND PUBYEAR < {end_year + 1}"
+
+def request_scopus(params, retries=3, cache=True):
+    """Executa uma chamada à Scopus Search API e retorna o bloco `search-results` (ou None)"""
     url = "https://api.elsevier.com/content/search/scopus"
     headers = {
         "X-ELS-APIKey": SCOPUS_API_KEY,
         "Accept": "application/json"  # 🔹 Adiciona cabeçalho Accept
     }
-    params = {
-        "query": query,
-        "count": max_results,
-        "start": 0,
-        "httpAccept": "application/json",
-    }
+    params = {**params, "httpAccept": "application/json"}
 
     for attempt in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = http_client.get("Scopus", url, headers=headers, params=params, cache=cache)
             if response.status_code == 401:
                 print("❌ Erro: API Key inválida ou não autorizada.")
-                return []
+                return None
             response.raise_for_status()
             data = response.json()
+            archive_response("Scopus", "search", data, params, response)
 
             if "search-results" not in data:
                 print(f"⚠️ Tentativa {attempt+1}: Resposta inesperada da API Scopus:", data)
-                time.sleep(delay)
+                time.sleep(backoff_delay(attempt))
                 continue
             
-            return data["search-results"].get("entry", [])
+            return data["search-results"]
 
         except requests.RequestException as e:
             print(f"⚠️ Erro na tentativa {attempt+1}: {e}")
-            time.sleep(delay)
+            time.sleep(backoff_delay(attempt))
 
     print("❌ Todas as tentativas falharam. Verifique a API.")
-    return []
+    return None
+
+def fetch_scopus_articles(query, max_results=MAX_RESULTS, retries=3):
+    """Extrai artigos da API Scopus"""
+    results = request_scopus({"query": query, "count": max_results, "start": 0}, retries)
+    return results.get("entry", []) if results else []
+
+def count_scopus_articles(query, retries=3):
+    """Retorna o total de resultados da busca (opensearch:totalResults)"""
+    results = request_scopus({"query": query, "count": 1, "start": 0, "field": "dc:identifier"}, retries)
+    if results is None:
+        raise RuntimeError(f"Não foi possível contar os resultados da Scopus para: {query}")
+    return int(results.get("opensearch:totalResults", 0))
 
 def process_articles(entries):
     """Processa os artigos retornados pela API Scopus"""
-    articles = [
-        {
-            "id": entry.get("dc:identifier", "N/A"),
-            "title": entry.get("dc:title", "N/A"),
-            "journal": entry.get("prism:publicationName", "N/A"),
-            "authors": entry.get("dc:creator", "N/A"),
-            "pub_date": entry.get("prism:coverDate", "N/A"),
-            "source": "Scopus",
-        }
-        for entry in entries
-    ]
-    return pl.DataFrame(articles)
+    articles = ArticleBatch("Scopus")
+    for entry in entries:
+        if "error" in entry:  # A API devolve {"error": "Result set was empty"} quando não há resultados
+            continue
+        articles.append(
+            id=entry.get("dc:identifier", "N/A"),
+            doi=entry.get("prism:doi", "N/A"),
+            title=entry.get("dc:title", "N/A"),
+            journal=entry.get("prism:publicationName", "N/A"),
+            authors=entry.get("dc:creator", "N/A"),
+            pub_date=entry.get("prism:coverDate", "N/A"),
+        )
+    return articles.to_frame()
+
+def scan_scopus_pages(query, view=VIEW, max_records=None, page_size=PAGE_SIZE, cursor="*", fetched=0, page=0):
+    """
+    Percorre os resultados com a paginação profunda por cursor, gerando
+    (número da página, DataFrame, cursor da próxima página) até esgotar a busca
+    ou atingir `max_records`. `cursor`/`fetched`/`page` permitem retomar uma varredura.
+    """
+    while cursor and (max_records is None or fetched < max_records):
+        count = page_size if max_records is None else min(page_size, max_records - fetched)
+        params = {"query": query, "count": count, "cursor": cursor, "view": view}
+        # 🔹 Cursores são tokens de sessão: páginas não vão para o cache HTTP
+        results = request_scopus(params, cache=False)
+        if results is None:
+            raise RuntimeError(f"Falha ao buscar página da Scopus (cursor {cursor})")
+
+        batch = process_articles(results.get("entry", []))
+        if batch.is_empty():
+            break
+
+        fetched += len(batch)
+        next_cursor = results.get("cursor", {}).get("@next")
+        total = int(results.get("opensearch:totalResults", 0))
+        if next_cursor == cursor or fetched >= total:
+            next_cursor = None
+        yield page, batch, next_cursor
+
+        cursor = next_cursor
+        page += 1
+
+def iter_scopus_pages(query, view=VIEW, max_records=None, page_size=PAGE_SIZE):
+    """
+    Percorre todos os resultados com a paginação profunda por cursor (`cursor=*`),
+    gerando um DataFrame por página até esgotar a busca ou atingir `max_records`.
+    """
+    for _, batch, _ in scan_scopus_pages(query, view, max_records, page_size):
+        yield batch
+
+def stream_scopus_to_parquet(query, output_dir=PARTS_DIR, view=VIEW, max_records=None, row_group_size=SINK_ROW_GROUP_SIZE):
+    """Envia cada página da busca ao `ParquetSink` assim que é processada e confirma o manifesto"""
+    sink = ParquetSink(output_dir, row_group_size)
+    for index, page in enumerate(iter_scopus_pages(query, view, max_records)):
+        part = sink.write(page)
+        print(f"   📄 Página {index + 1}: {len(page)} artigos" + (f" → {part.name}" if part else ""))
+    sink.commit(source="Scopus", query=query)
+    return sink.parts
+
+def extract_scopus_articles(max_results=MAX_RESULTS, query=QUERY, since=None, until=None):
+    """Extrai e processa artigos da Scopus (opcionalmente só os carregados após `since`)"""
+    pages = list(iter_scopus_pages(incremental_query(query, since), max_records=max_results))
+    return pl.concat(pages, how="vertical") if pages else pl.DataFrame()
+
 
 if __name__ == "__main__":
     print("🔍 Iniciando extração de artigos da Scopus...")
-    
-    articles = fetch_scopus_articles(QUERY)
 
-    if not articles:
+    parts = stream_scopus_to_parquet(QUERY, max_records=MAX_RESULTS)
+
+    if not parts:
         print("❌ Nenhum artigo encontrado na Scopus.")
     else:
-        scopus_data = process_articles(articles)
-
-        if scopus_data.is_empty():
-            print("❌ Nenhum detalhe de artigo extraído.")
-        else:
-            scopus_data.write_csv(CSV_FILE)
-            scopus_data.write_parquet(PARQUET_FILE)
+        scopus_data = pl.read_parquet(parts)
+        scopus_data.write_csv(CSV_FILE)
+        scopus_data.write_parquet(PARQUET_FILE)
 
-            print(f"✅ {len(scopus_data)} artigos salvos em:")
-            print(f"   - {CSV_FILE}")
-            print(f"   - {PARQUET_FILE}")
+        print(f"✅ {len(scopus_data)} artigos salvos em:")
+        print(f"   - {PARTS_DIR} ({len(parts)} páginas)")
+        print(f"   - {CSV_FILE}")
+        print(f"   - {PARQUET_FILE}")
@@ -2,12 +2,23 @@ import os
 import requests
 import polars as pl
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 from dotenv import load_dotenv
 from pathlib import Path
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.raw_archive import archive_response
+from health_edu_apps_etl.records import ArticleBatch
+from health_edu_apps_etl.rate_limiter import backoff_delay
 
 # 🔹 Carregar credenciais do .env
 load_dotenv()
 WOS_API_KEY = os.getenv("WOS_API_KEY")
+MAX_RESULTS = int(os.getenv("WOS_MAX_RESULTS", 50)) or None  # 0 = todos os registros encontrados
+PAGE_SIZE = 100  # Máximo de registros por página aceito pela API (`count`)
+PAGE_CONCURRENCY = int(os.getenv("WOS_PAGE_CONCURRENCY", 4))  # Páginas buscadas em paralelo
+RETRIES = 3  # Tentativas por página
+RESUME_ATTEMPTS = 3  # Retomadas da paginação após falha de uma página
 
 QUERY = 'TS=("mobile applications" OR "health apps") AND TS=("data analysis")'
 
@@ -17,58 +28,160 @@ RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 CSV_FILE = RAW_DATA_DIR / "wos_articles.csv"
 PARQUET_FILE = RAW_DATA_DIR / "wos_articles.parquet"
 
-def fetch_wos_articles(query, max_results=50):
-    """Extrai artigos da API Web of Science"""
-    
+def time_span(since=None, until=None):
+    """Formata um intervalo de datas no padrão `yyyy-mm-dd+yyyy-mm-dd` da API"""
+    return f"{(since or date(1900, 1, 1)).isoformat()}+{(until or date.today()).isoformat()}"
+
+def request_wos(params, retries=1):
+    """Executa uma chamada à API Web of Science (com novas tentativas) e retorna o JSON da resposta"""
     url = "https://wos-api.clarivate.com/api/wos/query"
     headers = {"X-APIKey": WOS_API_KEY}
-    params = {
-        "query": query,
-        "count": max_results,
-    }
 
+    for attempt in range(retries):
+        try:
+            response = http_client.get("Web of Science", url, headers=headers, params=params)
+            response.raise_for_status()
+            data = response.json()
+            archive_response("Web of Science", "query", data, params, response)
+            return data
+
+        except (requests.RequestException, ValueError) as e:
+            if attempt + 1 == retries:
+                raise
+            print(f"⚠️ Erro na tentativa {attempt+1} (registro {params.get('firstRecord', 1)}): {e}")
+            time.sleep(backoff_delay(attempt))
+
+def query_params(query, since=None, until=None, published=None):
+    """
+    Parâmetros comuns da busca.
+
+    `since`/`until` restringem pela data de carga/modificação do registro na base;
+    `published` (tupla de datas) restringe pela data de publicação.
+    """
+    params = {"query": query}
+    if since or until:
+        params["modifiedTimeSpan"] = time_span(since, until)
+    if published:
+        params["publishTimeSpan"] = time_span(*published)
+    return params
+
+def fetch_wos_page(params, page, count, page_size=PAGE_SIZE, retries=RETRIES):
+    """Busca uma página (`firstRecord`/`count`) e retorna o JSON da resposta"""
+    return request_wos({**params, "firstRecord": page * page_size + 1, "count": count}, retries)
+
+def iter_wos_pages(query, since=None, until=None, published=None, max_records=None,
+                   page_size=PAGE_SIZE, max_workers=PAGE_CONCURRENCY, done=()):
+    """
+    Percorre todos os registros da busca com `firstRecord`/`count`, gerando pares
+    (número da página, DataFrame) à medida que as páginas chegam.
+
+    A primeira página informa o total (`RecordsFound`); as demais são buscadas em
+    paralelo, dentro da cota do host. Páginas em `done` já foram concluídas e são puladas.
+    """
+    params = query_params(query, since, until, published)
+    first_count = min(page_size, max_records or page_size)
+    data = fetch_wos_page(params, 0, first_count, page_size)
+
+    total = int(data.get("QueryResult", {}).get("RecordsFound", 0))
+    if max_records is not None:
+        total = min(total, max_records)
+    if 0 not in done:
+        yield 0, process_wos_articles(data.get("Data", {}).get("Records", []))
+
+    pages = [page for page in range(1, -(-total // page_size)) if page not in done]
+    if not pages:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        futures = {
+            executor.submit(fetch_wos_page, params, page, min(page_size, total - page * page_size), page_size): page
+            for page in pages
+        }
+        error = None
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            try:
+                records = future.result().get("Data", {}).get("Records", [])
+            except (requests.RequestException, ValueError) as e:
+                # 🔹 Cancela a fila, mas entrega as páginas já em andamento antes de propagar a falha
+                error = error or e
+                for pending in futures:
+                    pending.cancel()
+                continue
+            yield futures[future], process_wos_articles(records)
+        if error:
+            raise error
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
+def harvest_wos_pages(query, since=None, until=None, published=None, max_records=None, resume_attempts=RESUME_ATTEMPTS):
+    """Extrai todas as páginas, retomando a partir das páginas concluídas quando alguma falha"""
+    completed = {}
+
+    for attempt in range(resume_attempts + 1):
+        try:
+            for page, df in iter_wos_pages(query, since, until, published, max_records, done=completed):
+                completed[page] = df
+            break
+
+        except (requests.RequestException, ValueError) as e:
+            if attempt == resume_attempts:
+                raise
+            print(f"⚠️ Falha na paginação da Web of Science ({len(completed)} páginas concluídas): {e}. Retomando...")
+            time.sleep(backoff_delay(attempt))
+
+    frames = [completed[page] for page in sorted(completed) if not completed[page].is_empty()]
+    return pl.concat(frames, how="diagonal_relaxed") if frames else pl.DataFrame()
+
+def fetch_wos_articles(query, max_results=50, since=None, until=None, published=None):
+    """Extrai uma única página de artigos da API Web of Science"""
+    params = {**query_params(query, since, until, published), "count": min(max_results, PAGE_SIZE), "firstRecord": 1}
+
+    try:
+        data = request_wos(params)
         return data.get("Data", {}).get("Records", [])
 
     except requests.RequestException as e:
         print(f"❌ Erro na API Web of Science: {e}")
         return []
 
+def count_wos_articles(query, since=None, until=None):
+    """Retorna o total de registros publicados no intervalo (QueryResult.RecordsFound)"""
+    data = request_wos({"query": query, "count": 1, "firstRecord": 1, "publishTimeSpan": time_span(since, until)}, RETRIES)
+    return int(data.get("QueryResult", {}).get("RecordsFound", 0))
+
 def process_wos_articles(records):
     """Processa os artigos retornados pela API Web of Science"""
-    articles = [
-        {
-            "id": record.get("UID", "N/A"),
-            "title": record.get("Title", "N/A"),
-            "journal": record.get("Source", "N/A"),
-            "authors": record.get("Authors", "N/A"),
-            "pub_date": record.get("PublicationDate", "N/A"),
-            "source": "Web of Science",
-        }
-        for record in records
-    ]
-    return pl.DataFrame(articles)
+    articles = ArticleBatch("Web of Science")
+    for record in records:
+        articles.append(
+            id=record.get("UID", "N/A"),
+            doi=record.get("DOI", "N/A"),
+            title=record.get("Title", "N/A"),
+            journal=record.get("Source", "N/A"),
+            authors=record.get("Authors", "N/A"),
+            pub_date=record.get("PublicationDate", "N/A"),
+        )
+    return articles.to_frame()
+
+def extract_wos_articles(max_results=MAX_RESULTS, query=QUERY, since=None, until=None, published=None):
+    """Extrai e processa artigos da Web of Science (todas as páginas até `max_results`), retornando um DataFrame"""
+    return harvest_wos_pages(query, since, until, published, max_records=max_results)
+
 
 if __name__ == "__main__":
     print("🔍 Iniciando extração de artigos da Web of Science...")
     
-    articles = fetch_wos_articles(QUERY)
+    wos_data = extract_wos_articles()
 
-    if not articles:
+    if wos_data.is_empty():
         print("❌ Nenhum artigo encontrado na Web of Science.")
     else:
-        wos_data = process_wos_articles(articles)
-
-        if wos_data.is_empty():
-            print("❌ Nenhum detalhe de artigo extraído.")
-        else:
-            wos_data.write_csv(CSV_FILE)
-            wos_data.write_parquet(PARQUET_FILE)
+        wos_data.write_csv(CSV_FILE)
+        wos_data.write_parquet(PARQUET_FILE)
 
-            print(f"✅ {len(wos_data)} artigos salvos em:")
-            print(f"   - {CSV_FILE}")
-            print(f"   - {PARQUET_FILE}")
+        print(f"✅ {len(wos_data)} artigos salvos em:")
+        print(f"   - {CSV_FILE}")
+        print(f"   - {PARQUET_FILE}")
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+import polars as pl
+from concurrent.futures import ThreadPoolExecutor, wait
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.config import EXTRACTION_MAX_WORKERS, EXTRACTION_TIMEOUT, SOURCE_CONCURRENCY
+
+
+# 🔹 Prazo da tarefa em execução em cada thread do pool (para extrações aninhadas)
+_job = threading.local()
+
+
+def remaining_budget(default=EXTRACTION_TIMEOUT):
+    """Segundos que restam do orçamento da tarefa atual; fora de uma tarefa, `default`"""
+    deadline = getattr(_job, "deadline", None)
+    if deadline is None:
+        return default
+    return max(0.0, deadline - time.monotonic())
+
+
+def _source_semaphores(jobs, limits):
+    """Cria um semáforo por fonte respeitando o limite de concorrência configurado"""
+    return {
+        source: threading.BoundedSemaphore(max(1, limits.get(source, 1)))
+        for source, _ in jobs
+    }
+
+
+def count_rows(data):
+    """Conta as linhas de um DataFrame ou LazyFrame (em partes Parquet, só lê os metadados)"""
+    if data is None:
+        return 0
+    if isinstance(data, pl.LazyFrame):
+        return data.select(pl.len()).collect().item()
+    return len(data)
+
+
+def _run_job(source, func, semaphore, deadline):
+    """Executa uma tarefa de extração isolando falhas e medindo o tempo gasto"""
+    with semaphore:
+        start = time.perf_counter()
+        _job.deadline = deadline
+        try:
+            data = func()
+            status = "ok" if count_rows(data) else "empty"
+            return {"source": source, "status": status, "data": data, "error": None,
+                    "elapsed": time.perf_counter() - start}
+        except Exception as e:
+            logging.exception(f"❌ Falha na extração de {source}")
+            return {"source": source, "status": "error", "data": None, "error": str(e),
+                    "elapsed": time.perf_counter() - start}
+        finally:
+            _job.deadline = None
+
+
+def run_extractors(jobs, max_workers=EXTRACTION_MAX_WORKERS, timeout=EXTRACTION_TIMEOUT, limits=SOURCE_CONCURRENCY):
+    """
+    Executa as tarefas de extração em paralelo em um pool de threads.
+
+    `jobs` é uma lista de tuplas `(fonte, função sem argumentos)`. Cada tarefa
+    roda isolada: exceções viram status "error" e tarefas que estouram o
+    orçamento global `timeout` viram status "timeout", sem bloquear as demais.
+    A fonte de uma tarefa em atraso é cancelada no cliente HTTP: a próxima
+    requisição dela levanta `ExtractionCancelled` e a thread termina. Chamado
+    de dentro de uma tarefa, o `timeout` é limitado ao que resta do orçamento dela.
+    Retorna um resultado por tarefa, na mesma ordem de `jobs`.
+    """
+    timeout = min(timeout, remaining_budget(timeout))
+    semaphores = _source_semaphores(jobs, limits)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract")
+    started = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    futures = [executor.submit(_run_job, source, func, semaphores[source], deadline) for source, func in jobs]
+
+    wait(futures, timeout=timeout)
+
+    results = []
+    for (source, _), future in zip(jobs, futures):
+        if future.done():
+            results.append(future.result())
+        else:
+            future.cancel()
+            http_client.cancel(source)
+            future.add_done_callback(lambda _, source=source: http_client.release(source))
+            logging.warning(f"⏱️ Extração de {source} excedeu o orçamento de {timeout:.0f}s.")
+            results.append({"source": source, "status": "timeout", "data": None,
+                             "error": f"Tempo limite de {timeout:.0f}s excedido",
+                             "elapsed": time.perf_counter() - started})
+
+    # 🔹 Não espera tarefas presas: as threads restantes param na próxima requisição
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def format_timings(results):
+    """Formata o relatório de tempos por fonte"""
+    lines = []
+    for result in results:
+        rows = count_rows(result["data"])
+        line = f"   - {result['source']}: {result['status']} em {result['elapsed']:.1f}s ({rows} artigos)"
+        if result["error"]:
+            line += f" → {result['error']}"
+        lines.append(line)
+    return "\n".join(lines)
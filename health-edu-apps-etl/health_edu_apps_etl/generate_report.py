@@ -1,13 +1,11 @@
 import os
-import polars as pl
-import pandas as pd
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from jinja2 import Environment, FileSystemLoader
+from health_edu_apps_etl.queries import summary_stats, list_articles, flatten_for_export
 
-# 📌 Caminhos de entrada e saída
-DATA_PATH = "data/processed/articles.parquet"
+# 📌 Caminhos de saída
 OUTPUT_DIR = "reports"
 PDF_FILE = os.path.join(OUTPUT_DIR, "articles_report.pdf")
 HTML_FILE = os.path.join(OUTPUT_DIR, "articles_report.html")
@@ -15,23 +13,19 @@ HTML_FILE = os.path.join(OUTPUT_DIR, "articles_report.html")
 # 📌 Criar diretório de saída, se necessário
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# 📌 Carregar dados processados
-if not os.path.exists(DATA_PATH):
-    raise FileNotFoundError(f"❌ Arquivo de dados não encontrado: {DATA_PATH}")
+# 📌 Quantidade de artigos listados nos relatórios
+REPORT_ARTICLES = 10
 
-df = pl.read_parquet(DATA_PATH).to_pandas()
-
-# 📊 **1. Estatísticas Gerais**
-stats = {
-    "Total de artigos": len(df),
-    "Bases de dados únicas": df["source"].nunique(),
-    "Periódicos únicos": df["journal"].nunique(),
-    "Autores únicos": df["authors"].nunique(),
-}
+# 📊 **1. Estatísticas Gerais e artigos listados (consultas preguiçosas: só as colunas usadas são lidas)**
+def load_report_data():
+    stats = summary_stats()
+    articles = flatten_for_export(list_articles(["title", "authors", "source"], limit=REPORT_ARTICLES)).iter_rows(named=True)
+    return stats, list(articles)
 
 # 📊 **2. Geração de Relatório em PDF**
 def generate_pdf(file_path):
-    c = canvas.Canvas(file_path, pagesize=landscape(letter))
+    stats, articles = load_report_data()
+    c = canvas.Canvas(str(file_path), pagesize=landscape(letter))
     c.setFont("Helvetica-Bold", 16)
     c.drawString(30, 550, "📄 Relatório de Artigos Científicos")
 
@@ -47,7 +41,7 @@ def generate_pdf(file_path):
     c.setFont("Helvetica", 10)
     y_position -= 40
 
-    for index, row in df.head(10).iterrows():
+    for index, row in enumerate(articles):
         c.drawString(30, y_position, f"{index + 1}. {row['title']} - {row['authors']} ({row['source']})")
         y_position -= 20
         if y_position < 50:
@@ -59,6 +53,7 @@ def generate_pdf(file_path):
 
 # 📊 **3. Geração de Relatório em HTML**
 def generate_html(file_path):
+    stats, articles = load_report_data()
     env = Environment(loader=FileSystemLoader("."))
     template = env.from_string("""
     <html>
@@ -89,9 +84,9 @@ def generate_html(file_path):
                 <th>Autores</th>
                 <th>Fonte</th>
             </tr>
-            {% for index, row in articles.iterrows() %}
+            {% for row in articles %}
             <tr>
-                <td>{{ index + 1 }}</td>
+                <td>{{ loop.index }}</td>
                 <td>{{ row['title'] }}</td>
                 <td>{{ row['authors'] }}</td>
                 <td>{{ row['source'] }}</td>
@@ -102,12 +97,16 @@ def generate_html(file_path):
     </html>
     """)
 
-    html_content = template.render(stats=stats, articles=df.head(10))
+    html_content = template.render(stats=stats, articles=articles)
     with open(file_path, "w", encoding="utf-8") as f:
         f.write(html_content)
     print(f"✅ Relatório HTML gerado: {file_path}")
 
-# 🚀 **Executar geração dos relatórios**
-if __name__ == "__main__":
+def generate_report():
+    """Gera os relatórios em PDF e HTML (tarefa da DAG do Airflow)"""
     generate_pdf(PDF_FILE)
     generate_html(HTML_FILE)
+
+# 🚀 **Executar geração dos relatórios**
+if __name__ == "__main__":
+    generate_report()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+from health_edu_apps_etl.config import (
+    HTTP_CACHE_MODE, HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTLS, HTTP_CACHE_DEFAULT_TTL,
+)
+
+# 🔹 Parâmetros que não influenciam o conteúdo (credenciais) ficam fora da chave
+IGNORED_PARAMS = {"api_key", "apikey"}
+
+# 🔹 Cabeçalhos preservados junto com o corpo da resposta
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CacheMiss(requests.RequestException):
+    """Resposta ausente do cache no modo offline (somente cache)"""
+
+
+def _normalize_pairs(values):
+    """Ordena pares chave/valor descartando credenciais"""
+    if not values:
+        return []
+    items = values.items() if isinstance(values, dict) else values
+    return sorted((str(k), str(v)) for k, v in items if k not in IGNORED_PARAMS)
+
+
+def cache_key(source, method, url, params=None, data=None):
+    """Gera a chave do cache a partir da fonte, método, URL normalizada, parâmetros e corpo"""
+    parts = urlsplit(url)
+    query = _normalize_pairs(parse_qsl(parts.query)) + _normalize_pairs(params)
+    normalized_url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(sorted(query)), ""))
+    raw = json.dumps([source, method.upper(), normalized_url, _normalize_pairs(data)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def build_response(entry):
+    """Reconstrói um `requests.Response` a partir de uma entrada do cache"""
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = entry["body"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.url = entry["url"]
+    response.encoding = "utf-8"
+    response.from_cache = True
+    return response
+
+
+class ResponseCache:
+    """Cache de respostas HTTP em SQLite com corpo compactado, TTL por fonte e remoção LRU"""
+
+    def __init__(self, path=HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES, ttls=HTTP_CACHE_TTLS, mode=HTTP_CACHE_MODE):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    @property
+    def offline(self):
+        return self.mode == "offline"
+
+    def ttl(self, source):
+        return self.ttls.get(source, HTTP_CACHE_DEFAULT_TTL)
+
+    def lookup(self, key):
+        """Retorna a entrada do cache (com `fresh` indicando se ainda está no TTL) ou None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT source, url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        source, url, status, headers, body, stored_at = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "body": zlib.decompress(body),
+            "fresh": now - stored_at < self.ttl(source),
+        }
+
+    def store(self, key, source, response):
+        """Grava uma resposta bem-sucedida e aplica a remoção LRU se o limite for excedido"""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content, 6)
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, response.url, response.status_code, json.dumps(headers), body, len(body), now, now),
+            )
+            self._evict(conn)
+
+    def touch(self, key):
+        """Renova a validade de uma entrada revalidada com 304 Not Modified"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 🔹 Remove as entradas menos acessadas até voltar ao limite
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def size(self):
+        """Retorna o número de entradas e o total de bytes compactados"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Retorna o cache padrão do pipeline, criado sob demanda"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def set_cache(cache):
+    """Substitui o cache padrão (útil para testes e execuções isoladas)"""
+    global _cache
+    with _cache_lock:
+        _cache = cache
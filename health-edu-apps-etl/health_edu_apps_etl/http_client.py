@@ -0,0 +1,171 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from health_edu_apps_etl.config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_SIZE, HTTP_USER_AGENT,
+)
+from health_edu_apps_etl.http_cache import get_cache, cache_key, build_response, CacheMiss
+from health_edu_apps_etl.rate_limiter import throttle, observe_response
+
+# 🔹 Brotli só é anunciado quando o decodificador está instalado
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_sessions = {}
+_stats = {}
+_cancelled = {}  # Fonte → tarefas canceladas ainda em execução
+_lock = threading.Lock()
+
+
+class ExtractionCancelled(RuntimeError):
+    """Requisição de uma fonte cuja tarefa de extração estourou o tempo limite"""
+
+
+def _new_session():
+    """Cria uma sessão com pool de conexões keep-alive e compressão"""
+    # 🔹 Sem novas tentativas no adaptador: os laços dos extratores refazem a chamada pelo `throttle`
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": HTTP_USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+def get_session(source):
+    """Retorna a sessão compartilhada da fonte, criando-a na primeira chamada"""
+    with _lock:
+        if source not in _sessions:
+            _sessions[source] = _new_session()
+        return _sessions[source]
+
+
+def _new_stats(source):
+    return _stats.setdefault(source, {"requests": 0, "errors": 0, "bytes": 0, "wire_bytes": 0, "latency": 0.0,
+                                      "cache_hits": 0, "revalidated": 0})
+
+
+def _count(source, counter):
+    with _lock:
+        _new_stats(source)[counter] += 1
+
+
+def _record(source, response, elapsed):
+    """Acumula contadores de requisições, bytes e latência por fonte"""
+    wire_bytes = response.headers.get("Content-Length")
+    with _lock:
+        stats = _new_stats(source)
+        stats["requests"] += 1
+        stats["errors"] += response.status_code >= 400
+        stats["bytes"] += len(response.content)
+        stats["wire_bytes"] += int(wire_bytes) if wire_bytes and wire_bytes.isdigit() else len(response.content)
+        stats["latency"] += elapsed
+
+
+def request(source, method, url, timeout=DEFAULT_TIMEOUT, cache=True, **kwargs):
+    """
+    Executa uma requisição pela sessão da fonte respeitando o limite de taxa do host.
+
+    Com `cache=True`, respostas válidas vêm do cache em disco sem tocar a rede;
+    entradas vencidas com ETag/Last-Modified são revalidadas condicionalmente.
+    Use `cache=False` para chamadas com estado no servidor (ex.: WebEnv da PubMed).
+    Fontes canceladas (`cancel`) levantam `ExtractionCancelled` em vez de requisitar.
+    """
+    if source in _cancelled:
+        raise ExtractionCancelled(f"Extração de {source} cancelada por tempo limite")
+    store = get_cache()
+    key = entry = None
+    if not cache and store.offline:
+        raise CacheMiss(f"Requisição sem cache indisponível no modo offline: {url}")
+    if cache and store.enabled:
+        key = cache_key(source, method, url, kwargs.get("params"), kwargs.get("data"))
+        entry = store.lookup(key)
+        if entry and (entry["fresh"] or store.offline):
+            _count(source, "cache_hits")
+            return build_response(entry)
+        if store.offline:
+            raise CacheMiss(f"Resposta não encontrada no cache (modo offline): {url}")
+        if entry:
+            validators = {}
+            if "ETag" in entry["headers"]:
+                validators["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                validators["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+            if validators:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **validators}
+
+    throttle(url)
+    start = time.perf_counter()
+    response = get_session(source).request(method, url, timeout=timeout, **kwargs)
+    _record(source, response, time.perf_counter() - start)
+    observe_response(url, response)
+
+    if key is not None:
+        if response.status_code == 304 and entry:
+            store.touch(key)
+            _count(source, "revalidated")
+            return build_response(entry)
+        if response.status_code == 200:
+            store.store(key, source, response)
+    return response
+
+
+def cancel(source):
+    """Interrompe a tarefa da fonte: suas próximas requisições (inclusive em threads filhas) falham"""
+    with _lock:
+        _cancelled[source] = _cancelled.get(source, 0) + 1
+
+
+def release(source):
+    """Desfaz um `cancel` quando a tarefa cancelada termina"""
+    with _lock:
+        _cancelled[source] -= 1
+        if not _cancelled[source]:
+            del _cancelled[source]
+
+
+def get(source, url, **kwargs):
+    """Atalho para `request(source, "GET", url, ...)`"""
+    return request(source, "GET", url, **kwargs)
+
+
+def post(source, url, **kwargs):
+    """Atalho para `request(source, "POST", url, ...)`"""
+    return request(source, "POST", url, **kwargs)
+
+
+def get_stats():
+    """Retorna uma cópia dos contadores por fonte"""
+    with _lock:
+        return {source: dict(stats) for source, stats in _stats.items()}
+
+
+def reset_stats():
+    """Zera os contadores de todas as fontes"""
+    with _lock:
+        _stats.clear()
+
+
+def format_stats(stats=None):
+    """Formata os contadores por fonte para log"""
+    stats = get_stats() if stats is None else stats
+    lines = []
+    for source, s in sorted(stats.items()):
+        avg = s["latency"] / s["requests"] if s["requests"] else 0
+        lines.append(
+            f"   - {source}: {s['requests']} requisições ({s['errors']} com erro), "
+            f"{s['wire_bytes'] / 1024:.1f} KiB transferidos ({s['bytes'] / 1024:.1f} KiB descompactados), "
+            f"latência média {avg * 1000:.0f} ms, {s['cache_hits']} do cache, {s['revalidated']} revalidadas (304)"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,92 @@
+import json
+import os
+import polars as pl
+from datetime import datetime, timezone
+from pathlib import Path
+from health_edu_apps_etl.config import SINK_ROW_GROUP_SIZE
+from health_edu_apps_etl.utils import write_part
+
+MANIFEST_FILE = "_manifest.json"
+
+
+def commit_manifest(directory, parts, **metadata):
+    """
+    Grava o manifesto da partição de forma atômica (arquivo temporário + rename).
+    Só as partes listadas no manifesto fazem parte do resultado.
+    """
+    directory = Path(directory)
+    entries = [
+        {"path": Path(part).name, "rows": pl.scan_parquet(part).select(pl.len()).collect().item()}
+        for part in parts
+    ]
+    schema = pl.scan_parquet(parts[0]).collect_schema() if parts else {}
+    manifest = {
+        **metadata,
+        "committed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": sum(entry["rows"] for entry in entries),
+        "schema": {name: str(dtype) for name, dtype in schema.items()},
+        "parts": entries,
+    }
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / MANIFEST_FILE
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def read_manifest(directory):
+    """Retorna o manifesto da partição, ou None se ela ainda não foi confirmada"""
+    path = Path(directory) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def scan_partition(directory):
+    """LazyFrame com as partes confirmadas no manifesto da partição"""
+    manifest = read_manifest(directory)
+    if not manifest or not manifest["parts"]:
+        return pl.LazyFrame()
+    return pl.scan_parquet([Path(directory) / part["path"] for part in manifest["parts"]])
+
+
+class ParquetSink:
+    """Acumula lotes de registros e grava uma parte Parquet a cada `row_group_size` linhas"""
+
+    def __init__(self, directory, row_group_size=SINK_ROW_GROUP_SIZE, start_index=0):
+        self.directory = Path(directory)
+        self.row_group_size = row_group_size
+        self.index = start_index
+        self.buffer = []
+        self.buffered = 0
+        self.parts = []
+
+    def write(self, batch):
+        """Recebe um lote (DataFrame ou lista de dicts); retorna o caminho da parte se houve gravação"""
+        if not isinstance(batch, pl.DataFrame):
+            batch = pl.DataFrame(batch)
+        if batch.is_empty():
+            return None
+        self.buffer.append(batch)
+        self.buffered += len(batch)
+        return self.flush() if self.buffered >= self.row_group_size else None
+
+    def flush(self):
+        """Grava o que estiver acumulado como uma nova parte"""
+        if not self.buffer:
+            return None
+        df = pl.concat(self.buffer, how="diagonal_relaxed")
+        self.buffer, self.buffered = [], 0
+        path = write_part(df, self.directory, self.index, self.row_group_size)
+        self.parts.append(path)
+        self.index += 1
+        return path
+
+    def commit(self, **metadata):
+        """Grava o restante do buffer e confirma as partes no manifesto"""
+        self.flush()
+        return commit_manifest(self.directory, self.parts, **metadata)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import shutil
+import polars as pl
+from datetime import datetime, timezone
+from pathlib import Path
+from health_edu_apps_etl.config import SOURCE_SLUGS, PROCESSED_ROW_GROUP_SIZE, PROCESSED_ZSTD_LEVEL
+
+MANIFEST_FILE = "_manifest.json"
+
+
+def partition_dir(source, year):
+    """Caminho relativo da partição no layout hive (`source=<fonte>/year=<ano>`)"""
+    return Path(f"source={SOURCE_SLUGS.get(source, source)}") / f"year={year}"
+
+
+def fingerprint(df):
+    """
+    SHA-256 do conteúdo de uma partição. As linhas são ordenadas e serializadas em NDJSON
+    (listas viram texto e categorias viram `String`): o resumo não depende da ordem das linhas,
+    do cache de categorias nem da versão do polars (o `hash_rows` muda entre versões).
+    """
+    hashable = df.select(
+        pl.col(name).list.join("\x1f") if isinstance(dtype, pl.List)
+        else pl.col(name).cast(pl.String) if isinstance(dtype, (pl.Categorical, pl.Enum))
+        else pl.col(name)
+        for name, dtype in df.schema.items()
+    )
+    ordered = hashable.sort(hashable.columns, nulls_last=True)
+    return hashlib.sha256(ordered.write_ndjson().encode("utf-8")).hexdigest()
+
+
+def write_partitioned(df, root):
+    """
+    Grava o dataset particionado por fonte e ano de publicação, com zstd, row groups
+    de `PROCESSED_ROW_GROUP_SIZE` linhas e estatísticas min/max; o manifesto lista as
+    partições (com uma `fingerprint` do conteúdo, usada pelas agregações incrementais).
+    O diretório é montado ao lado e trocado de uma vez no final.
+    """
+    root = Path(root)
+    tmp_root = root.with_name(root.name + ".tmp")
+    shutil.rmtree(tmp_root, ignore_errors=True)
+
+    df = df.with_columns(pl.col("pub_date").dt.year().alias("_year"))
+    partitions = []
+    for (source, year), part in df.sort("pub_date").group_by(["source", "_year"], maintain_order=True):
+        part = part.drop("_year")
+        relative = partition_dir(source, year) / "part-00000.parquet"
+        (tmp_root / relative).parent.mkdir(parents=True, exist_ok=True)
+        part.write_parquet(
+            tmp_root / relative,
+            compression="zstd",
+            compression_level=PROCESSED_ZSTD_LEVEL,
+            row_group_size=PROCESSED_ROW_GROUP_SIZE,
+            statistics=True,
+        )
+        partitions.append({
+            "source": source,
+            "year": year,
+            "path": relative.as_posix(),
+            "rows": len(part),
+            "min_date": part["pub_date"].min().isoformat(),
+            "max_date": part["pub_date"].max().isoformat(),
+            "fingerprint": fingerprint(part),
+        })
+
+    manifest = {
+        "committed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": sum(p["rows"] for p in partitions),
+        "schema": {name: str(dtype) for name, dtype in df.drop("_year").schema.items()},
+        "partitions": sorted(partitions, key=lambda p: (p["source"], p["year"])),
+    }
+    with open(tmp_root / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    # 🔹 Troca o dataset antigo pelo novo (leitores nunca veem um diretório pela metade)
+    old_root = root.with_name(root.name + ".old")
+    shutil.rmtree(old_root, ignore_errors=True)
+    if root.exists():
+        os.replace(root, old_root)
+    os.replace(tmp_root, root)
+    shutil.rmtree(old_root, ignore_errors=True)
+    return manifest
+
+
+def read_manifest(root):
+    """Retorna o manifesto do dataset, ou None se ele não existir"""
+    path = Path(root) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def select_partitions(manifest, sources=None, years=None):
+    """Partições do manifesto que podem conter linhas das fontes e anos pedidos"""
+    sources = set(sources) if sources is not None else None
+    years = set(years) if years is not None else None
+    return [
+        p for p in manifest["partitions"]
+        if (sources is None or p["source"] in sources) and (years is None or p["year"] in years)
+    ]
+
+
+def scan_partitions(root, sources=None, years=None):
+    """LazyFrame só sobre os arquivos das partições selecionadas pelo manifesto"""
+    manifest = read_manifest(root)
+    if manifest is None:
+        raise FileNotFoundError(f"Manifesto {Path(root) / MANIFEST_FILE} não encontrado!")
+
+    files = [Path(root) / p["path"] for p in select_partitions(manifest, sources, years)]
+    if not files:
+        if not manifest["partitions"]:
+            return pl.LazyFrame()
+        # 🔹 Nenhuma partição casa com o filtro: devolve o schema sem ler dados
+        return pl.scan_parquet(Path(root) / manifest["partitions"][0]["path"], hive_partitioning=False).head(0)
+    return pl.scan_parquet(files, hive_partitioning=False)
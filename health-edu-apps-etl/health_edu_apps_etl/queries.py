@@ -0,0 +1,243 @@
+import polars as pl
+from pathlib import Path
+from health_edu_apps_etl.aggregates import scan_aggregate, title_tokens
+from health_edu_apps_etl.catalog import scan_catalog
+from health_edu_apps_etl.config import ARTICLES_BACKEND, CATALOG_PATH
+from health_edu_apps_etl.partitioned_dataset import read_manifest, scan_partitions
+from health_edu_apps_etl.records import AUTHOR_SEPARATOR
+from health_edu_apps_etl.schema import SOURCE_NAMES
+
+# 🔹 Dataset processado (saída do `transform_data`, particionado por fonte e ano)
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROCESSED_DATA_DIR = BASE_DIR / "data" / "processed"
+DATASET_DIR = PROCESSED_DATA_DIR / "articles"
+
+ARTICLE_COLUMNS = ["title", "authors", "journal", "pub_date", "source"]
+
+
+def default_dataset():
+    """Dataset consultado quando `path` não é informado: Parquet processado ou catálogo DuckDB (`ARTICLES_BACKEND`)"""
+    return CATALOG_PATH if ARTICLES_BACKEND == "catalog" else DATASET_DIR
+
+
+def dataset_exists(path=None):
+    """Indica se o dataset processado já foi gerado"""
+    path = Path(path or default_dataset())
+    return path.is_file() or read_manifest(path) is not None
+
+
+def scan_articles(path=None, sources=None, years=None):
+    """
+    LazyFrame sobre o dataset processado: nada é lido do disco até o `collect`.
+    No dataset particionado, só os arquivos das fontes/anos pedidos entram no scan;
+    no catálogo DuckDB (`.duckdb`), os filtros viram SQL e a conexão é fechada após a leitura.
+    """
+    path = Path(path or default_dataset())
+    if not dataset_exists(path):
+        raise FileNotFoundError(f"Dataset {path} não encontrado! Verifique a extração e transformação dos dados.")
+    if path.suffix == ".duckdb":
+        return scan_catalog(path, sources, years)
+    if path.is_file():
+        return pl.scan_parquet(path)
+    return scan_partitions(path, sources, years)
+
+
+def filter_articles(lf, sources=None, years=None):
+    """Aplica os filtros por fonte e ano de publicação (empurrados para a leitura do Parquet)"""
+    if sources is not None:
+        # 🔹 `source` é um Enum: fontes desconhecidas não podem entrar na comparação
+        lf = lf.filter(pl.col("source").is_in([s for s in sources if s in SOURCE_NAMES]))
+    if years is not None:
+        lf = lf.filter(pl.col("pub_date").dt.year().is_in(list(years)))
+    return lf
+
+
+def collect(lf):
+    """Executa a consulta no engine de streaming"""
+    return lf.collect(engine="streaming")
+
+
+def _articles(sources=None, years=None, path=None):
+    return filter_articles(scan_articles(path, sources, years), sources, years)
+
+
+def _aggregate(name, sources=None, years=None, path=None):
+    """
+    Tabela agregada do dataset particionado (kilobytes em vez das linhas), ou None quando
+    ela não existe ou está atrasada em relação ao dataset: aí a consulta lê os artigos.
+    """
+    path = Path(path or default_dataset())
+    if path.suffix == ".duckdb" or path.is_file():
+        return None
+    if sources is not None:
+        sources = [s for s in sources if s in SOURCE_NAMES]
+    return scan_aggregate(path, name, sources, years)
+
+
+def available_sources(path=None):
+    """Fontes presentes no dataset, em ordem alfabética (lidas do manifesto quando houver)"""
+    manifest = read_manifest(path or default_dataset())
+    if manifest is not None:
+        return sorted({p["source"] for p in manifest["partitions"]})
+    return collect(scan_articles(path).select(pl.col("source").unique().sort()))["source"].to_list()
+
+
+def available_years(path=None):
+    """Anos de publicação presentes no dataset, em ordem crescente (lidos do manifesto quando houver)"""
+    manifest = read_manifest(path or default_dataset())
+    if manifest is not None:
+        return sorted({p["year"] for p in manifest["partitions"]})
+    lf = scan_articles(path).select(pl.col("pub_date").dt.year().alias("year").drop_nulls().unique().sort())
+    return collect(lf)["year"].to_list()
+
+
+def summary_stats(sources=None, years=None, path=None):
+    """Totais de artigos, fontes, periódicos e autores"""
+    counts = _aggregate("source_year", sources, years, path)
+    if counts is not None:
+        journals = _aggregate("journal_year", sources, years, path)
+        authors = _aggregate("authors", sources, years, path)
+        return {
+            **collect(counts.select(
+                pl.col("count").sum().alias("Total de artigos"),
+                pl.col("source").n_unique().alias("Bases de dados únicas"),
+            )).row(0, named=True),
+            "Periódicos únicos": collect(journals.select(pl.col("journal").n_unique())).item(),
+            "Autores únicos": collect(authors.select(pl.col("author").n_unique())).item(),
+        }
+
+    row = collect(_articles(sources, years, path).select(
+        pl.len().alias("Total de artigos"),
+        pl.col("source").n_unique().alias("Bases de dados únicas"),
+        pl.col("journal").n_unique().alias("Periódicos únicos"),
+        pl.col("authors").explode(empty_as_null=False, keep_nulls=False).drop_nulls().n_unique().alias("Autores únicos"),
+    ))
+    return row.row(0, named=True)
+
+
+def count_by_source(sources=None, years=None, path=None):
+    """Quantidade de artigos por fonte (colunas `source`, `count`)"""
+    lf = _aggregate("source_year", sources, years, path)
+    if lf is not None:
+        lf = lf.group_by("source").agg(pl.col("count").sum())
+    else:
+        lf = _articles(sources, years, path).group_by("source").agg(pl.len().alias("count"))
+    return collect(lf.sort(["count", "source"], descending=[True, False]))
+
+
+def count_by_year(sources=None, years=None, path=None):
+    """Quantidade de artigos por ano de publicação (colunas `year`, `count`)"""
+    lf = _aggregate("source_year", sources, years, path)
+    if lf is not None:
+        lf = lf.group_by("year").agg(pl.col("count").sum())
+    else:
+        lf = (
+            _articles(sources, years, path)
+            .select(pl.col("pub_date").dt.year().alias("year"))
+            .drop_nulls()
+            .group_by("year")
+            .agg(pl.len().alias("count"))
+        )
+    return collect(lf.sort("year"))
+
+
+def count_by_journal(limit=10, sources=None, years=None, path=None):
+    """Periódicos com mais artigos (colunas `journal`, `count`)"""
+    lf = _aggregate("journal_year", sources, years, path)
+    if lf is not None:
+        lf = lf.group_by("journal").agg(pl.col("count").sum())
+    else:
+        # 🔹 Em texto, o desempate ordena pelo nome (e não pela ordem interna do Categorical)
+        lf = _articles(sources, years, path).group_by(pl.col("journal").cast(pl.String)).agg(pl.len().alias("count"))
+    return collect(lf.sort(["count", "journal"], descending=[True, False]).head(limit))
+
+
+def top_authors(limit=10, sources=None, years=None, path=None):
+    """Autores com mais artigos (colunas `author`, `count`)"""
+    lf = _aggregate("authors", sources, years, path)
+    if lf is not None:
+        lf = lf.group_by("author").agg(pl.col("count").sum())
+    else:
+        lf = (
+            _articles(sources, years, path)
+            .select(pl.col("authors").explode(empty_as_null=False, keep_nulls=False).drop_nulls().alias("author"))
+            .group_by("author")
+            .agg(pl.len().alias("count"))
+        )
+    return collect(lf.sort(["count", "author"], descending=[True, False]).head(limit))
+
+
+def top_title_tokens(limit=100, sources=None, years=None, path=None):
+    """Palavras mais frequentes nos títulos (colunas `token`, `count`)"""
+    lf = _aggregate("title_tokens", sources, years, path)
+    if lf is not None:
+        lf = lf.group_by("token").agg(pl.col("count").sum())
+    else:
+        lf = (
+            _articles(sources, years, path)
+            .select(title_tokens().explode(empty_as_null=False, keep_nulls=False).drop_nulls().alias("token"))
+            .group_by("token")
+            .agg(pl.len().alias("count"))
+        )
+    return collect(lf.sort(["count", "token"], descending=[True, False]).head(limit))
+
+
+def list_articles(columns=ARTICLE_COLUMNS, limit=None, sources=None, years=None, path=None):
+    """Artigos filtrados, lendo só as colunas pedidas"""
+    lf = _articles(sources, years, path).select(columns)
+    if limit is not None:
+        lf = lf.head(limit)
+    return collect(lf)
+
+
+def count_articles(sources=None, years=None, path=None):
+    """Quantidade de artigos filtrados (total da paginação)"""
+    lf = _aggregate("source_year", sources, years, path)
+    if lf is not None:
+        return collect(lf.select(pl.col("count").sum())).item()
+    return collect(_articles(sources, years, path).select(pl.len())).item()
+
+
+def page_articles(offset=0, limit=50, sort_by="pub_date", descending=True, columns=ARTICLE_COLUMNS, sources=None, years=None, path=None):
+    """
+    Uma página dos artigos filtrados, ordenados por `sort_by`: o engine de streaming guarda só as
+    `offset + limit` primeiras linhas da ordenação (top-k), sem materializar o resultado inteiro.
+    """
+    if sort_by not in columns:
+        raise ValueError(f"Coluna de ordenação fora da tabela: {sort_by}")
+    lf = _articles(sources, years, path).select(columns)
+    if dict(lf.collect_schema())[sort_by] == pl.Categorical:
+        # 🔹 Categorical ordenaria pela ordem de inserção; a tabela ordena pelo texto
+        lf = lf.sort(pl.col(sort_by).cast(pl.String), descending=descending, nulls_last=True)
+    else:
+        lf = lf.sort(sort_by, descending=descending, nulls_last=True)
+    return collect(lf.slice(offset, limit))
+
+
+def flatten_for_export(df):
+    """Converte colunas de lista (autores) em texto separado por `AUTHOR_SEPARATOR`, para CSV (DataFrame ou LazyFrame)"""
+    return df.with_columns(pl.col(name).list.join(AUTHOR_SEPARATOR) for name, dtype in df.collect_schema().items() if dtype == pl.List(pl.String))
+
+
+# 🔹 Formatos de exportação: extensão e tipo MIME
+EXPORT_FORMATS = {"csv": ("csv", "text/csv"), "parquet": ("parquet", "application/vnd.apache.parquet")}
+
+
+def export_articles(target, file_format="csv", columns=ARTICLE_COLUMNS, sources=None, years=None, path=None):
+    """
+    Grava os artigos filtrados em `target` (CSV ou Parquet) pelo engine de streaming, em lotes:
+    a memória usada não depende do tamanho do resultado.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportação desconhecido: {file_format}")
+    lf = _articles(sources, years, path).select(columns)
+    if file_format == "csv":
+        flatten_for_export(lf).sink_csv(target)
+    else:
+        lf.sink_parquet(target, compression="zstd")
+    return target
+
+
+def titles(sources=None, years=None, path=None):
+    """Títulos dos artigos filtrados"""
+    return list_articles(["title"], sources=sources, years=years, path=path)["title"].drop_nulls().to_list()
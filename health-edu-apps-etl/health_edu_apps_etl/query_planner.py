@@ -0,0 +1,118 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+import polars as pl
+from health_edu_apps_etl.config import SHARD_CONCURRENCY, HARVEST_START_YEAR
+from health_edu_apps_etl.extraction_engine import run_extractors, format_timings, remaining_budget
+from health_edu_apps_etl import extract_pubmed, extract_scopus, extract_wos
+
+# As fatias são intervalos inclusivos de "unidades": dias (ordinal da data) para
+# PubMed e Web of Science, que aceitam datas exatas, e anos para a Scopus, que
+# só filtra por PUBYEAR.
+
+
+def _pubmed_count(query, lo, hi):
+    return extract_pubmed.count_pubmed_articles(query, date.fromordinal(lo), date.fromordinal(hi))
+
+
+def _pubmed_fetch(query, lo, hi, total):
+    return extract_pubmed.extract_pubmed_articles(
+        max_results=None, query=query, since=date.fromordinal(lo), until=date.fromordinal(hi), datetype="pdat"
+    )
+
+
+def _scopus_count(query, lo, hi):
+    return extract_scopus.count_scopus_articles(extract_scopus.publication_year_query(query, lo, hi))
+
+
+def _scopus_fetch(query, lo, hi, total):
+    return extract_scopus.extract_scopus_articles(total, extract_scopus.publication_year_query(query, lo, hi))
+
+
+def _wos_count(query, lo, hi):
+    return extract_wos.count_wos_articles(query, date.fromordinal(lo), date.fromordinal(hi))
+
+
+def _wos_fetch(query, lo, hi, total):
+    return extract_wos.extract_wos_articles(total, query, published=(date.fromordinal(lo), date.fromordinal(hi)))
+
+
+# 🔹 Fontes fatiáveis: busca padrão, contagem, extração, limite por consulta e unidade
+SHARDABLE = {
+    "PubMed": {"query": extract_pubmed.QUERY, "count": _pubmed_count, "fetch": _pubmed_fetch, "cap": 9999, "unit": "day"},
+    "Scopus": {"query": extract_scopus.QUERY, "count": _scopus_count, "fetch": _scopus_fetch, "cap": 5000, "unit": "year"},
+    "Web of Science": {"query": extract_wos.QUERY, "count": _wos_count, "fetch": _wos_fetch, "cap": 100000, "unit": "day"},
+}
+
+
+def _to_units(unit, start, end):
+    if unit == "year":
+        return start.year, end.year
+    return start.toordinal(), end.toordinal()
+
+
+def format_shard(unit, lo, hi):
+    """Descreve uma fatia em datas legíveis"""
+    if unit == "year":
+        return f"{lo}–{hi}"
+    return f"{date.fromordinal(lo)}–{date.fromordinal(hi)}"
+
+
+def plan_shards(source, query=None, start=None, end=None, max_workers=SHARD_CONCURRENCY):
+    """
+    Divide a busca em fatias de datas de publicação com no máximo `cap` resultados.
+
+    Cada nível conta as fatias pendentes em paralelo; fatias acima do limite são
+    divididas ao meio até caberem (ou até não poderem mais ser divididas) e
+    fatias vazias são descartadas. Retorna tuplas `(início, fim, total)`.
+    """
+    spec = SHARDABLE[source]
+    query = query or spec["query"]
+    start = start or date(HARVEST_START_YEAR, 1, 1)
+    end = end or date.today()
+
+    pending = [_to_units(spec["unit"], start, end)]
+    shards = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="count") as pool:
+        while pending:
+            counts = list(pool.map(lambda bounds: spec["count"](query, *bounds), pending))
+            next_pending = []
+            for (lo, hi), total in zip(pending, counts):
+                if total == 0:
+                    continue
+                if total <= spec["cap"]:
+                    shards.append((lo, hi, total))
+                elif lo == hi:
+                    logging.warning(f"⚠️ {source}: {format_shard(spec['unit'], lo, hi)} tem {total} resultados "
+                                    f"e não pode ser dividida; apenas {spec['cap']} serão recuperados.")
+                    shards.append((lo, hi, total))
+                else:
+                    mid = (lo + hi) // 2
+                    next_pending += [(lo, mid), (mid + 1, hi)]
+            pending = next_pending
+
+    return sorted(shards)
+
+
+def harvest(source, query=None, start=None, end=None, max_workers=SHARD_CONCURRENCY):
+    """Extrai a busca completa da fonte fatiando por data, em paralelo, e remove duplicatas"""
+    spec = SHARDABLE[source]
+    query = query or spec["query"]
+    shards = plan_shards(source, query, start, end, max_workers)
+    total = sum(n for _, _, n in shards)
+    print(f"🧩 {source}: {total} resultados em {len(shards)} fatias. Extraindo em paralelo...")
+
+    # 🔹 As fatias dividem o orçamento da tarefa externa, sem um novo tempo limite completo
+    jobs = [(source, partial(spec["fetch"], query, lo, hi, n)) for lo, hi, n in shards]
+    results = run_extractors(jobs, max_workers=max_workers, timeout=remaining_budget(), limits={source: max_workers})
+    logging.info(f"🧩 Fatias de {source}:\n{format_timings(results)}")
+
+    failed = [format_shard(spec["unit"], lo, hi) for (lo, hi, _), r in zip(shards, results) if r["status"] in ("error", "timeout")]
+    if failed:
+        raise RuntimeError(f"{len(failed)} fatias de {source} falharam: {', '.join(failed)}")
+
+    frames = [r["data"] for r in results if r["status"] == "ok"]
+    if not frames:
+        return pl.DataFrame()
+    return pl.concat(frames, how="diagonal_relaxed").unique(subset=["id"], keep="first", maintain_order=True)
@@ -0,0 +1,122 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from health_edu_apps_etl.config import RATE_LIMITS, DEFAULT_RATE_LIMIT, BACKOFF_BASE, BACKOFF_MAX, QUOTA_MAX_WAIT
+
+
+class QuotaExhausted(RuntimeError):
+    """Cota do host esgotada com reset além de `QUOTA_MAX_WAIT`: a fonte falha em vez de esperar"""
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: libera até `rate` requisições por segundo com rajada de `capacity`.
+    Pausas maiores que `max_wait` (cota esgotada até um reset distante) levantam `QuotaExhausted`.
+    """
+
+    def __init__(self, rate, capacity=None, max_wait=QUOTA_MAX_WAIT):
+        self.rate = float(rate)
+        self.max_wait = max_wait
+        self.capacity = float(capacity or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Bloqueia até haver um token disponível e o consome"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                    if wait > self.max_wait:
+                        raise QuotaExhausted(f"Cota esgotada: próxima requisição liberada em {wait:.0f}s")
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Suspende todas as requisições do host pelos próximos `seconds` segundos"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(url):
+    """Retorna o token bucket compartilhado do host da URL"""
+    host = urlparse(url).hostname or url
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = TokenBucket(RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT))
+        return _limiters[host]
+
+
+def throttle(url):
+    """Aguarda a vez da próxima requisição para o host da URL"""
+    get_limiter(url).acquire()
+
+
+def retry_after_seconds(response):
+    """Calcula quanto esperar a partir de `Retry-After` ou dos cabeçalhos `X-RateLimit-*` da Elsevier"""
+    headers = getattr(response, "headers", None) or {}
+
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is not None and reset and remaining.strip() == "0":
+        try:
+            reset = float(reset)
+        except ValueError:
+            return None
+        # 🔹 A Elsevier envia o reset em epoch (segundos ou milissegundos)
+        if reset > 1e12:
+            reset /= 1000
+        return max(0.0, reset - time.time())
+
+    return None
+
+
+def observe_response(url, response):
+    """
+    Pausa o host quando a resposta indica cota esgotada (429/503, Retry-After ou X-RateLimit-*).
+    Se o reset está além do teto do limitador, levanta `QuotaExhausted` para a fonte falhar logo.
+    """
+    wait = retry_after_seconds(response)
+    if wait is None and getattr(response, "status_code", 200) in (429, 503):
+        wait = backoff_delay(0)
+    if wait:
+        limiter = get_limiter(url)
+        limiter.pause(wait)
+        if wait > limiter.max_wait:
+            raise QuotaExhausted(f"Cota de {urlparse(url).hostname} esgotada até daqui a {wait:.0f}s (teto {limiter.max_wait:.0f}s)")
+        print(f"⏳ Limite de requisições atingido em {urlparse(url).hostname}. Aguardando {wait:.1f}s...")
+    return wait
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Backoff exponencial com jitter completo para a tentativa `attempt` (começando em 0)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
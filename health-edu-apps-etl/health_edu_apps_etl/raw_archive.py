@@ -0,0 +1,81 @@
+import io
+import json
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+import zstandard
+from health_edu_apps_etl.http_cache import IGNORED_PARAMS
+from health_edu_apps_etl.config import RAW_ARCHIVE_ENABLED, RAW_ARCHIVE_DIR, RAW_ARCHIVE_LEVEL, SOURCE_SLUGS
+
+ARCHIVE_FILE_NAME = "responses.jsonl.zst"
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path):
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def partition_path(source, run_date=None, archive_dir=None):
+    """Retorna o arquivo do arquivo histórico para a fonte e a data de execução"""
+    run_date = run_date or date.today()
+    archive_dir = archive_dir or RAW_ARCHIVE_DIR
+    slug = SOURCE_SLUGS.get(source, source)
+    return Path(archive_dir) / f"source={slug}" / f"date={run_date.isoformat()}" / ARCHIVE_FILE_NAME
+
+
+def archive_response(source, kind, payload, request=None, response=None, run_date=None, archive_dir=None):
+    """
+    Acrescenta uma resposta bruta ao arquivo histórico da fonte.
+
+    Cada registro vira um frame zstd independente com uma linha JSON, então o
+    arquivo só cresce por append e os frames completos continuam legíveis após
+    uma falha no meio da execução. Credenciais são removidas dos parâmetros e
+    respostas servidas pelo cache HTTP não são duplicadas.
+    """
+    if not RAW_ARCHIVE_ENABLED or getattr(response, "from_cache", False):
+        return None
+
+    record = {
+        "source": source,
+        "kind": kind,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "request": {k: v for k, v in (request or {}).items() if k not in IGNORED_PARAMS},
+        "payload": payload,
+    }
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    frame = zstandard.ZstdCompressor(level=RAW_ARCHIVE_LEVEL).compress(line)
+
+    path = partition_path(source, run_date, archive_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock_for(path), open(path, "ab") as f:
+        f.write(frame)
+    return path
+
+
+def archive_files(source, start_date=None, end_date=None, archive_dir=None):
+    """Lista os arquivos da fonte cujas partições de data estão no intervalo informado"""
+    slug = SOURCE_SLUGS.get(source, source)
+    archive_dir = archive_dir or RAW_ARCHIVE_DIR
+    files = []
+    for path in sorted((Path(archive_dir) / f"source={slug}").glob(f"date=*/{ARCHIVE_FILE_NAME}")):
+        partition_date = date.fromisoformat(path.parent.name.split("=", 1)[1])
+        if (start_date is None or partition_date >= start_date) and (end_date is None or partition_date <= end_date):
+            files.append(path)
+    return files
+
+
+def iter_archive(source, start_date=None, end_date=None, archive_dir=None):
+    """Percorre os registros arquivados da fonte em ordem de data e de gravação"""
+    decompressor = zstandard.ZstdDecompressor()
+    for path in archive_files(source, start_date, end_date, archive_dir):
+        with open(path, "rb") as f, decompressor.stream_reader(f, read_across_frames=True) as reader:
+            try:
+                for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                    if line.strip():
+                        yield json.loads(line)
+            except (zstandard.ZstdError, json.JSONDecodeError) as e:
+                # 🔹 Frame final truncado por uma execução interrompida
+                print(f"⚠️ Registro incompleto ignorado em {path}: {e}")
@@ -0,0 +1,90 @@
+import polars as pl
+from health_edu_apps_etl.config import SOURCE_SLUGS
+
+# 🔹 Schema bruto comum a todos os extratores (tudo texto; a limpeza e os tipos vêm no `transform_data`)
+RAW_COLUMNS = ("id", "doi", "title", "journal", "authors", "pub_date", "source")
+RAW_SCHEMA = pl.Schema({name: pl.String for name in RAW_COLUMNS})
+
+# 🔹 Valor usado pelas fontes quando o campo não é informado
+MISSING = "N/A"
+
+# 🔹 Separador da lista de autores no texto bruto: a vírgula aparece dentro dos nomes ("Sobrenome, Nome")
+AUTHOR_SEPARATOR = "; "
+
+
+class Article:
+    """Registro bruto de um artigo, com os mesmos campos para todas as fontes (sem `__dict__`)"""
+
+    __slots__ = RAW_COLUMNS
+
+    def __init__(self, source, id=MISSING, doi=MISSING, title=MISSING, journal=MISSING, authors=MISSING, pub_date=MISSING):
+        self.id = id
+        self.doi = doi
+        self.title = title
+        self.journal = journal
+        self.authors = authors
+        self.pub_date = pub_date
+        self.source = source
+
+    def __iter__(self):
+        return (getattr(self, name) for name in RAW_COLUMNS)
+
+    def __repr__(self):
+        return f"Article(source={self.source!r}, id={self.id!r}, title={self.title!r})"
+
+
+class ArticleBatch:
+    """
+    Lote colunar de artigos de uma fonte: cada campo vai direto para a sua lista, sem um
+    dict por registro. `to_frame` monta o DataFrame no `RAW_SCHEMA` e falha se algum
+    valor não for texto; `to_arrow` entrega os mesmos buffers ao Arrow, sem cópia.
+    """
+
+    __slots__ = ("source", "ids", "dois", "titles", "journals", "authors", "pub_dates")
+
+    def __init__(self, source):
+        if source not in SOURCE_SLUGS:
+            raise ValueError(f"Fonte desconhecida: {source}")
+        self.source = source
+        self.ids, self.dois, self.titles, self.journals, self.authors, self.pub_dates = [], [], [], [], [], []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, id=MISSING, doi=MISSING, title=MISSING, journal=MISSING, authors=MISSING, pub_date=MISSING):
+        """Adiciona um artigo ao lote"""
+        self.ids.append(id)
+        self.dois.append(doi)
+        self.titles.append(title)
+        self.journals.append(journal)
+        self.authors.append(authors)
+        self.pub_dates.append(pub_date)
+
+    def add(self, article):
+        """Adiciona um `Article` já montado (da mesma fonte do lote)"""
+        if article.source != self.source:
+            raise ValueError(f"Artigo da fonte {article.source} em um lote da fonte {self.source}")
+        self.append(article.id, article.doi, article.title, article.journal, article.authors, article.pub_date)
+
+    def extend(self, other):
+        """Acrescenta todos os artigos de outro lote da mesma fonte"""
+        if other.source != self.source:
+            raise ValueError(f"Lote da fonte {other.source} em um lote da fonte {self.source}")
+        for name in self.__slots__[1:]:
+            getattr(self, name).extend(getattr(other, name))
+
+    def to_frame(self):
+        """DataFrame no `RAW_SCHEMA`; valores fora do tipo esperado levantam TypeError aqui"""
+        columns = dict(zip(RAW_COLUMNS, (self.ids, self.dois, self.titles, self.journals, self.authors, self.pub_dates)))
+        series = []
+        for name, values in columns.items():
+            try:
+                series.append(pl.Series(name, values, dtype=RAW_SCHEMA[name], strict=True))
+            except TypeError as e:
+                raise TypeError(f"Coluna `{name}` da fonte {self.source} fora do schema ({RAW_SCHEMA[name]}): {e}") from e
+        series.append(pl.Series("source", [self.source], dtype=pl.String).new_from_index(0, len(self)))
+        return pl.DataFrame(series)
+
+    def to_arrow(self):
+        """Tabela Arrow do lote (`string_view`: os buffers do DataFrame são compartilhados, sem cópia)"""
+        return self.to_frame().to_arrow(compat_level=pl.CompatLevel.newest())
@@ -0,0 +1,93 @@
+import sys
+from datetime import date
+import polars as pl
+from health_edu_apps_etl.config import DATA_DIR, SOURCE_SLUGS
+from health_edu_apps_etl.raw_archive import iter_archive
+from health_edu_apps_etl.extract_pubmed import parse_summary_result
+from health_edu_apps_etl.extract_scopus import process_articles
+from health_edu_apps_etl.extract_wos import process_wos_articles
+from health_edu_apps_etl.extract_ieee import process_ieee_articles
+from health_edu_apps_etl.extract_scielo import process_article_data
+from health_edu_apps_etl.records import ArticleBatch
+
+# 🔹 Diretório de saída (mesmo dos extratores)
+RAW_DATA_DIR = DATA_DIR / "raw"
+
+
+def _pubmed(record):
+    return parse_summary_result(record["payload"]).to_frame()
+
+
+def _scopus(record):
+    return process_articles(record["payload"].get("search-results", {}).get("entry", []))
+
+
+def _wos(record):
+    return process_wos_articles(record["payload"].get("Data", {}).get("Records", []))
+
+
+def _ieee(record):
+    return process_ieee_articles(record["payload"]) if "articles" in record["payload"] else pl.DataFrame()
+
+
+def _scielo(record):
+    articles = ArticleBatch("SciELO")
+    article = process_article_data(record["payload"], record["request"].get("code"))
+    if article:
+        articles.add(article)
+    return articles.to_frame()
+
+
+# 🔹 Tipo de resposta arquivada → função que reconstrói as linhas do schema
+PARSERS = {
+    ("PubMed", "esummary"): _pubmed,
+    ("Scopus", "search"): _scopus,
+    ("Web of Science", "query"): _wos,
+    ("IEEE Xplore", "search"): _ieee,
+    ("SciELO", "article"): _scielo,
+}
+
+
+def rebuild_source(source, start_date=None, end_date=None, archive_dir=None):
+    """Reconstrói o DataFrame bruto de uma fonte a partir do arquivo histórico, sem acessar a rede"""
+    frames = []
+    for record in iter_archive(source, start_date, end_date, archive_dir):
+        parser = PARSERS.get((source, record["kind"]))
+        if parser:
+            df = parser(record)
+            if not df.is_empty():
+                frames.append(df)
+
+    if not frames:
+        return pl.DataFrame()
+
+    # 🔹 A versão mais recente de cada artigo prevalece
+    return pl.concat(frames, how="diagonal_relaxed").unique(subset=["id"], keep="last", maintain_order=True)
+
+
+def replay(sources=None, start_date=None, end_date=None, archive_dir=None, output_dir=RAW_DATA_DIR):
+    """Regrava os arquivos Parquet/CSV brutos de cada fonte a partir do arquivo histórico"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rebuilt = {}
+
+    for source in sources or SOURCE_SLUGS:
+        df = rebuild_source(source, start_date, end_date, archive_dir)
+        if df.is_empty():
+            print(f"⚠️ Nenhuma resposta arquivada para {source}.")
+            continue
+
+        slug = SOURCE_SLUGS[source]
+        df.write_csv(output_dir / f"{slug}_articles.csv")
+        df.write_parquet(output_dir / f"{slug}_articles.parquet")
+        rebuilt[source] = len(df)
+        print(f"✅ {source}: {len(df)} artigos reconstruídos do arquivo histórico.")
+
+    return rebuilt
+
+
+if __name__ == "__main__":
+    # Uso: python -m health_edu_apps_etl.replay_archive [AAAA-MM-DD inicial] [AAAA-MM-DD final]
+    start = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    end = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else None
+    print("🔁 Reconstruindo dados brutos a partir do arquivo histórico...")
+    replay(start_date=start, end_date=end)
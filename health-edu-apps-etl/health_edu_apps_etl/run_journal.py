@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import polars as pl
+from pathlib import Path
+from health_edu_apps_etl.config import RUNS_DIR, SINK_ROW_GROUP_SIZE
+from health_edu_apps_etl.parquet_sink import ParquetSink, commit_manifest
+
+
+class RunJournal:
+    """Diário de uma execução: páginas concluídas por fonte, com cursor e arquivo gravado"""
+
+    def __init__(self, run_id, path=None):
+        self.run_id = str(run_id)
+        self.path = Path(path or RUNS_DIR / f"{self.run_id}.json")
+        self.lock = threading.Lock()
+        self.sources = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.sources = json.load(f).get("sources", {})
+
+    def _save(self):
+        """Grava o diário de forma atômica (arquivo temporário + rename)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"run": self.run_id, "sources": self.sources}, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
+
+    def start(self, source, params):
+        """
+        Abre (ou retoma) a fonte e retorna as páginas já concluídas (número → checkpoint).
+        Se os parâmetros mudaram desde a execução interrompida, a fonte recomeça do zero.
+        """
+        params = json.loads(json.dumps(params, default=str))
+        with self.lock:
+            entry = self.sources.get(source)
+            if entry is None or entry["params"] != params:
+                entry = self.sources[source] = {"params": params, "finished": False, "pages": {}}
+                self._save()
+            return {int(page): checkpoint for page, checkpoint in entry["pages"].items()}
+
+    def checkpoint(self, source, page, part, rows, cursor=None):
+        """Registra uma página concluída (arquivo gravado, linhas e cursor da próxima página)"""
+        with self.lock:
+            self.sources[source]["pages"][str(page)] = {
+                "part": str(part) if part else None,
+                "rows": rows,
+                "cursor": cursor,
+            }
+            self._save()
+
+    def finish(self, source):
+        with self.lock:
+            self.sources[source]["finished"] = True
+            self._save()
+
+    def finished(self, source):
+        return self.sources.get(source, {}).get("finished", False)
+
+    def parts(self, source):
+        """Arquivos gravados da fonte (várias páginas podem compartilhar uma parte), na ordem das páginas"""
+        pages = self.sources.get(source, {}).get("pages", {})
+        return list(dict.fromkeys(pages[page]["part"] for page in sorted(pages, key=int) if pages[page]["part"]))
+
+    def discard(self):
+        """Remove o diário depois de uma execução concluída sem falhas"""
+        with self.lock:
+            self.sources = {}
+            self.path.unlink(missing_ok=True)
+
+
+def run_checkpointed(source, iter_pages, journal, directory, row_group_size=SINK_ROW_GROUP_SIZE, **params):
+    """
+    Executa a extração paginada de uma fonte enviando as páginas a um `ParquetSink` em
+    `directory`; as páginas entram no diário quando a parte que as contém é gravada, então
+    numa nova tentativa só as páginas pendentes são buscadas.
+
+    `iter_pages(done=..., **params)` deve gerar tuplas (página, DataFrame, cursor).
+    Retorna um LazyFrame sobre as partes confirmadas no manifesto.
+    """
+    done = journal.start(source, params)
+    if not done:
+        # 🔹 Começo do zero: descarta partes de uma tentativa anterior com outros parâmetros
+        for stale in Path(directory).glob("part-*.parquet"):
+            stale.unlink()
+
+    if not journal.finished(source):
+        if done:
+            print(f"🔁 {source}: retomando após {len(done)} páginas concluídas.")
+        sink = ParquetSink(directory, row_group_size, start_index=len(journal.parts(source)))
+        pending = []
+        for page, df, cursor in iter_pages(done=done, **params):
+            pending.append((page, len(df), cursor))
+            part = sink.write(df)
+            if part:
+                for page, rows, cursor in pending:
+                    journal.checkpoint(source, page, part, rows, cursor)
+                pending = []
+
+        part = sink.flush()
+        for page, rows, cursor in pending:
+            journal.checkpoint(source, page, part, rows, cursor)
+        journal.finish(source)
+
+    parts = journal.parts(source)
+    commit_manifest(directory, parts, source=source, run=journal.run_id)
+    return pl.scan_parquet(parts) if parts else pl.DataFrame()
@@ -0,0 +1,54 @@
+import polars as pl
+from health_edu_apps_etl.config import SOURCE_SLUGS
+from health_edu_apps_etl.records import AUTHOR_SEPARATOR
+
+# 🔹 Fontes conhecidas (categorias fixas do Enum, na ordem do pipeline)
+SOURCE_NAMES = list(SOURCE_SLUGS)
+SOURCE_ENUM = pl.Enum(SOURCE_NAMES)
+
+# 🔹 Schema canônico do dataset processado
+ARTICLE_SCHEMA = {
+    "id": pl.String,
+    "doi": pl.String,
+    "title": pl.String,
+    "journal": pl.Categorical,
+    "authors": pl.List(pl.String),
+    "pub_date": pl.Date,
+    "source": SOURCE_ENUM,
+}
+
+# 🔹 Colunas que nem todas as fontes trazem (preenchidas com nulo)
+OPTIONAL_COLUMNS = ["id", "doi"]
+
+# 🔹 Valores usados pelas fontes quando o autor não é informado
+MISSING_AUTHORS = ["N/A", ""]
+
+
+def split_authors(column="authors"):
+    """Expressão que transforma a lista de autores separada por `AUTHOR_SEPARATOR` em `List[str]`"""
+    return (
+        pl.col(column)
+        .str.split(AUTHOR_SEPARATOR.strip())
+        .list.eval(pl.element().str.strip_chars().filter(~pl.element().is_in(MISSING_AUTHORS)))
+    )
+
+
+def enforce_schema(df):
+    """
+    Seleciona as colunas do schema canônico, na ordem, com os tipos definidos.
+    Falha se faltar coluna obrigatória ou se houver fonte fora do Enum (DataFrame ou LazyFrame).
+    """
+    schema = df.collect_schema()
+    missing = [name for name in ARTICLE_SCHEMA if name not in schema and name not in OPTIONAL_COLUMNS]
+    if missing:
+        raise ValueError(f"Colunas ausentes no schema de artigos: {missing}")
+
+    columns = []
+    for name, dtype in ARTICLE_SCHEMA.items():
+        if name not in schema:
+            columns.append(pl.lit(None, dtype).alias(name))
+        elif name == "authors" and schema[name] == pl.String:
+            columns.append(split_authors(name))
+        else:
+            columns.append(pl.col(name).cast(dtype, strict=True))
+    return df.select(columns)
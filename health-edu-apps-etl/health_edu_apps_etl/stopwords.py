@@ -0,0 +1,23 @@
+# 🔹 Palavras sem conteúdo removidas do índice de palavras dos títulos (minúsculas, 3+ letras)
+STOPWORDS_PT = {
+    "aos", "aquela", "aquelas", "aquele", "aqueles", "aquilo", "até", "com", "como", "contra", "cujo",
+    "cuja", "das", "dela", "delas", "dele", "deles", "depois", "desde", "dessa", "dessas", "desse",
+    "desses", "desta", "destas", "deste", "destes", "dos", "ela", "elas", "ele", "eles", "entre", "era",
+    "essa", "essas", "esse", "esses", "esta", "está", "estão", "estas", "este", "estes", "foi", "for",
+    "foram", "isso", "isto", "lhe", "lhes", "mais", "mas", "mesmo", "muito", "nas", "nem", "não", "nos",
+    "nós", "num", "numa", "onde", "ou", "para", "pela", "pelas", "pelo", "pelos", "por", "quais",
+    "qual", "quando", "que", "quem", "são", "seja", "sem", "ser", "seu", "seus", "sob", "sobre", "sua",
+    "suas", "também", "tem", "têm", "ter", "uma", "umas", "uns", "via",
+}
+
+STOPWORDS_EN = {
+    "about", "above", "across", "after", "against", "all", "among", "and", "any", "are", "based",
+    "been", "before", "being", "between", "both", "but", "can", "could", "did", "does", "during",
+    "each", "for", "from", "had", "has", "have", "her", "his", "how", "into", "its", "more", "most",
+    "not", "off", "once", "only", "other", "our", "out", "over", "own", "same", "should", "some",
+    "such", "than", "that", "the", "their", "them", "then", "there", "these", "they", "this", "those",
+    "through", "under", "until", "using", "versus", "very", "was", "were", "what", "when", "where",
+    "which", "while", "who", "whom", "why", "will", "with", "within", "without", "would", "you", "your",
+}
+
+STOPWORDS = sorted(STOPWORDS_PT | STOPWORDS_EN)
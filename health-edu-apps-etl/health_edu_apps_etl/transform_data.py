@@ -1,6 +1,12 @@
 import os
 import polars as pl
 from pathlib import Path
+from health_edu_apps_etl.aggregates import update_aggregates
+from health_edu_apps_etl.catalog import catalog_exists, connect as connect_catalog, read_articles, record_clusters
+from health_edu_apps_etl.config import SOURCE_SLUGS
+from health_edu_apps_etl.dedup import deduplicate, normalize_doi
+from health_edu_apps_etl.partitioned_dataset import write_partitioned
+from health_edu_apps_etl.schema import enforce_schema
 
 # 🔹 Diretórios
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -8,53 +14,109 @@ RAW_DATA_DIR = BASE_DIR / "data" / "raw"
 PROCESSED_DATA_DIR = BASE_DIR / "data" / "processed"
 PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-# 🔹 Arquivos de entrada e saída
-RAW_FILES = [
-    RAW_DATA_DIR / "pubmed_articles.parquet",
-    RAW_DATA_DIR / "scielo_articles.parquet",
+# 🔹 Arquivos de entrada (um por fonte) e saída
+RAW_FILES = {source: RAW_DATA_DIR / f"{slug}_articles.parquet" for source, slug in SOURCE_SLUGS.items()}
+OUTPUT_DIR = PROCESSED_DATA_DIR / "articles"  # Particionado em source=<fonte>/year=<ano>/
+CLUSTERS_FILE = PROCESSED_DATA_DIR / "article_clusters.parquet"  # Todos os registros com seu `cluster_id`
+
+TEXT_COLUMNS = ["title", "journal", "authors"]
+
+# 🔹 Formatos de data das fontes, do mais ao menos preciso: (caracteres lidos, formato)
+# ISO da Scopus/WoS ("2023-01-05"), PubMed ("2023 Jan 5", "2023 Jan-Feb"), SciELO ("2005-08") e só o ano (IEEE)
+DATE_FORMATS = [
+    (10, "%Y-%m-%d"),
+    (None, "%Y %b %d"),
+    (7, "%Y-%m"),
+    (8, "%Y %b"),
+    (4, "%Y"),
 ]
-OUTPUT_FILE = PROCESSED_DATA_DIR / "articles.parquet"
 
-def clean_text(text):
-    """ Remove espaços extras e caracteres estranhos. """
-    return text.strip().replace("\n", " ").replace("\r", " ") if isinstance(text, str) else text
+def clean_text(column):
+    """ Expressão que remove quebras de linha e espaços extras nas pontas. """
+    return pl.col(column).str.replace_all(r"[\r\n]+", " ").str.strip_chars()
 
-def standardize_date(date_str):
-    """ Converte datas para formato YYYY-MM-DD. """
-    try:
-        return pl.Series(date_str).str.to_date(format="%Y-%m-%d").to_list()[0]
-    except Exception:
-        return None
+def standardize_date(column):
+    """ Expressão que converte datas em vários formatos para `pl.Date` (primeiro formato válido). """
+    text = pl.col(column).cast(pl.String).str.strip_chars()
+    return pl.coalesce([
+        (text if length is None else text.str.slice(0, length)).str.to_date(fmt, strict=False)
+        for length, fmt in DATE_FORMATS
+    ])
 
-def load_and_clean_data():
-    """ Carrega, transforma e salva os dados processados. """
+def clean_articles(df, source=None):
+    """ Aplica a limpeza vetorizada e devolve o schema canônico (DataFrame ou LazyFrame). """
+    schema = df.collect_schema()
+    columns = schema.names()
+
+    # 🔹 Arquivos antigos da SciELO usam `publication_date` e não têm `id` nem `source`
+    if "publication_date" in columns:
+        df = df.rename({"publication_date": "pub_date"})
+    if "source" not in columns and source:
+        df = df.with_columns(pl.lit(source).alias("source"))
+
+    # 🔹 `id` e `doi` são opcionais: só as demais colunas descartam a linha quando nulas
+    df = df.with_columns(
+        *[clean_text(column) for column in TEXT_COLUMNS if schema.get(column) == pl.String],
+        standardize_date("pub_date").alias("pub_date"),
+    ).drop_nulls(subset=[column for column in df.collect_schema().names() if column not in ("id", "doi")])
+
+    if "doi" in columns:
+        df = df.with_columns(normalize_doi("doi").alias("doi"))
+    return enforce_schema(df)
+
+def load_articles():
+    """
+    Artigos de todas as execuções: o histórico do catálogo mais os arquivos brutos das fontes.
+    Um mesmo (fonte, id) fica com a versão dos arquivos brutos, que são os mais recentes.
+    """
     all_articles = []
+    if catalog_exists():
+        con = connect_catalog()
+        try:
+            history = read_articles(con)
+        finally:
+            con.close()
+        print(f"📚 {len(history)} artigos lidos do catálogo.")
+        all_articles.append(history.lazy())
 
-    for file in RAW_FILES:
+    for source, file in RAW_FILES.items():
         if file.exists():
             print(f"📥 Carregando {file}...")
-            df = pl.read_parquet(file)
-
-            # 🛠️ Limpeza e normalização
-            df = df.with_columns([
-                pl.col("title").apply(clean_text).alias("title"),
-                pl.col("journal").apply(clean_text).alias("journal"),
-                pl.col("authors").apply(clean_text).alias("authors"),
-                pl.col("pub_date").apply(standardize_date).alias("pub_date"),
-            ]).drop_nulls()
-
-            all_articles.append(df)
+            all_articles.append(clean_articles(pl.scan_parquet(file), source))
 
     if not all_articles:
+        return None
+    combined = pl.concat(all_articles, how="diagonal_relaxed").collect()
+    # 🔹 Registros sem id não estão no catálogo e não têm como ser casados: ficam todos
+    keyed = combined.filter(pl.col("id").is_not_null()).unique(subset=["source", "id"], keep="last", maintain_order=True)
+    return pl.concat([keyed, combined.filter(pl.col("id").is_null())])
+
+def load_and_clean_data():
+    """ Carrega, transforma e salva os dados processados. """
+    combined = load_articles()
+    if combined is None:
         print("⚠️ Nenhum arquivo válido encontrado.")
         return
 
-    # 🔹 Concatenar todos os artigos e remover duplicatas
-    final_df = pl.concat(all_articles, how="vertical").unique(subset=["title"])
+    # 🔹 Agrupar duplicatas entre fontes (DOI, título e MinHash/LSH)
+    final_df, clusters = deduplicate(combined)
+    clusters.select("cluster_id", "source", "id", "doi", "title").write_parquet(CLUSTERS_FILE)
+    print(f"🔗 {len(combined)} registros agrupados em {len(final_df)} artigos únicos.")
+    if catalog_exists():
+        # 🔹 O catálogo passa a consultar um registro por grupo (view `unique_articles`)
+        con = connect_catalog()
+        try:
+            record_clusters(con, clusters)
+        finally:
+            con.close()
+
+    # 🔹 Salvar dataset transformado, particionado por fonte e ano
+    manifest = write_partitioned(final_df, OUTPUT_DIR)
+    print(f"✅ Transformação concluída! {len(final_df)} artigos salvos em {len(manifest['partitions'])} partições em `{OUTPUT_DIR}`.")
 
-    # 🔹 Salvar dataset transformado
-    final_df.write_parquet(OUTPUT_FILE)
-    print(f"✅ Transformação concluída! {len(final_df)} artigos salvos em `{OUTPUT_FILE}`.")
+    # 🔹 Atualizar as tabelas agregadas só com as partições que mudaram
+    updated = update_aggregates(OUTPUT_DIR)
+    print(f"📊 Agregações atualizadas ({updated} de {len(manifest['partitions'])} partições recalculadas).")
 
 if __name__ == "__main__":
     print("🔍 Iniciando transformação dos dados...")
@@ -0,0 +1,14 @@
+import os
+from pathlib import Path
+
+
+def write_part(df, directory, index, row_group_size=None):
+    """Grava um lote como arquivo Parquet numerado (`part-00000.parquet`) e retorna o caminho"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"part-{index:05d}.parquet"
+    # 🔹 Grava num temporário e renomeia: uma queda nunca deixa uma parte truncada
+    tmp_path = path.with_suffix(".tmp")
+    df.write_parquet(tmp_path, row_group_size=row_group_size)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,38 @@
+import json
+import os
+from datetime import date
+from health_edu_apps_etl.config import WATERMARKS_FILE
+
+
+def load_watermarks(path=None):
+    """Carrega as marcas d'água por fonte (fonte → data ISO)"""
+    path = path or WATERMARKS_FILE
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_watermarks(watermarks, path=None):
+    """Grava as marcas d'água de forma atômica (arquivo temporário + rename)"""
+    path = path or WATERMARKS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def get_watermark(source, path=None):
+    """Retorna a data da última extração bem-sucedida da fonte, ou None na primeira execução"""
+    value = load_watermarks(path).get(source)
+    return date.fromisoformat(value) if value else None
+
+
+def advance_watermarks(sources, until, path=None):
+    """Avança a marca d'água das fontes extraídas com sucesso até a data `until`"""
+    watermarks = load_watermarks(path)
+    for source in sources:
+        watermarks[source] = until.isoformat()
+    save_watermarks(watermarks, path)
+    return watermarks
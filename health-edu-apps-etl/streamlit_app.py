@@ -1,61 +1,66 @@
 import streamlit as st
-import pandas as pd
-import polars as pl
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
-import os
+from health_edu_apps_etl.app_cache import filter_key
+from health_edu_apps_etl.app_components import consultas, export_buttons, paginated_table
+from health_edu_apps_etl.queries import default_dataset, dataset_exists
+
+
+db = consultas()
+
+# 📌 Palavras exibidas na nuvem (as mais frequentes do índice de palavras dos títulos)
+MAX_PALAVRAS = 200
+
+
+@st.cache_data(max_entries=32)
+def nuvem_de_palavras(versao, sources, years):
+    """Imagem da nuvem de palavras, gerada das frequências agregadas uma vez por versão do dataset e filtros"""
+    frequencias = dict(db.top_title_tokens(MAX_PALAVRAS, sources=sources, years=years).iter_rows())
+    if not frequencias:
+        return None
+    wordcloud = WordCloud(width=800, height=400, background_color="white", max_words=MAX_PALAVRAS)
+    return wordcloud.generate_from_frequencies(frequencias).to_array()
 
-# 📌 Caminho do arquivo processado
-processed_data_path = "data/processed/articles.parquet"
 
 # 📌 Verificar se o arquivo existe
-if not os.path.exists(processed_data_path):
-    st.error(f"Arquivo {processed_data_path} não encontrado! Verifique a extração e transformação dos dados.")
+if not dataset_exists():
+    st.error(f"Dataset {default_dataset()} não encontrado! Verifique a extração e transformação dos dados.")
     st.stop()
 
-# 📌 Carregar os dados processados
-df = pl.read_parquet(processed_data_path).to_pandas()
-
 # 📊 Sidebar - Filtros
 st.sidebar.header("Filtros")
-bases_disponiveis = df["source"].unique()
+bases_disponiveis = db.available_sources()
 bases_selecionadas = st.sidebar.multiselect("Filtrar por Base de Dados", bases_disponiveis, default=bases_disponiveis)
-anos_disponiveis = sorted(df["pub_date"].dropna().astype(str).unique())
+anos_disponiveis = db.available_years()
 ano_selecionado = st.sidebar.selectbox("Filtrar por Ano", anos_disponiveis, index=len(anos_disponiveis)-1)
 
-# 📊 Aplicar filtros
-df_filtrado = df[(df["source"].isin(bases_selecionadas)) & (df["pub_date"].astype(str) == ano_selecionado)]
+# 📊 Filtros aplicados em todas as consultas
+filtros = {"sources": bases_selecionadas, "years": [ano_selecionado]}
 
 # 📊 Exibir métricas gerais
 st.title("📚 Painel Interativo de Artigos Científicos")
-st.write(f"**Total de Artigos no Filtro Atual:** {len(df_filtrado)}")
+st.write(f"**Total de Artigos no Filtro Atual:** {db.count_articles(**filtros)}")
 
 # 📊 Gráfico de Contagem por Base de Dados
 st.subheader("Distribuição de Artigos por Base de Dados")
+base_counts = db.count_by_source(**filtros)
 fig, ax = plt.subplots()
-sns.countplot(y=df_filtrado["source"], order=df_filtrado["source"].value_counts().index, palette="viridis", ax=ax)
+sns.barplot(x=base_counts["count"].to_list(), y=base_counts["source"].to_list(), palette="viridis", ax=ax)
 plt.xlabel("Quantidade de Artigos")
 st.pyplot(fig)
 
 # 📊 Nuvem de Palavras para Títulos
 st.subheader("Nuvem de Palavras dos Títulos de Artigos")
-text = " ".join(df_filtrado["title"].dropna())
-wordcloud = WordCloud(width=800, height=400, background_color="white").generate(text)
-fig, ax = plt.subplots()
-ax.imshow(wordcloud, interpolation="bilinear")
-ax.axis("off")
-st.pyplot(fig)
+imagem = nuvem_de_palavras(db.version(), *filter_key(**filtros))
+if imagem is not None:
+    st.image(imagem, use_container_width=True)
 
-# 📊 Tabela de Artigos
+# 📊 Tabela de Artigos (paginada no servidor)
 st.subheader("📄 Lista de Artigos")
-st.dataframe(df_filtrado[["title", "authors", "journal", "pub_date", "source"]].reset_index(drop=True))
-
-# 📥 Exportação
-def converter_para_csv(df):
-    return df.to_csv(index=False).encode("utf-8")
+paginated_table(db, filtros)
 
-csv = converter_para_csv(df_filtrado)
-st.download_button("📥 Baixar Dados Filtrados", data=csv, file_name="artigos_filtrados.csv", mime="text/csv")
+# 📥 Exportação (gerada só no clique)
+export_buttons(db, filtros)
 
 st.success("✅ Aplicação carregada com sucesso!")
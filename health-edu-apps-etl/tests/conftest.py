@@ -0,0 +1,64 @@
+import time
+from datetime import date
+import polars as pl
+import pytest
+import requests
+from health_edu_apps_etl import catalog, raw_archive, run_journal
+from health_edu_apps_etl.http_cache import ResponseCache, set_cache
+from health_edu_apps_etl.schema import enforce_schema
+
+# 🔹 Valores dos campos que os testes não informam
+ARTICLE_DEFAULTS = {"source": "PubMed", "id": None, "doi": None, "journal": "JMIR", "authors": "N/A", "pub_date": date(2023, 1, 1)}
+
+
+@pytest.fixture(autouse=True)
+def isolated_local_storage(tmp_path, monkeypatch):
+    """Redireciona o cache HTTP, o arquivo histórico, os diários de execução e o catálogo para um diretório temporário"""
+    monkeypatch.setattr(raw_archive, "RAW_ARCHIVE_DIR", tmp_path / "archive")
+    monkeypatch.setattr(run_journal, "RUNS_DIR", tmp_path / "runs")
+    monkeypatch.setattr(catalog, "CATALOG_PATH", tmp_path / "catalog.duckdb")
+    set_cache(ResponseCache(tmp_path / "http_cache.sqlite"))
+    yield
+    set_cache(None)
+
+
+@pytest.fixture
+def make_articles():
+    """
+    Fábrica de artigos no schema canônico: `make(rows, fields, **defaults)` lê cada tupla de `rows`
+    nos campos `fields`; os demais vêm de `defaults` ou de `ARTICLE_DEFAULTS`
+    """
+    def make(rows, fields, **defaults):
+        return enforce_schema(pl.DataFrame(
+            [{**ARTICLE_DEFAULTS, **defaults, **dict(zip(fields, row))} for row in rows],
+            schema_overrides={"doi": pl.String, "id": pl.String},
+        ))
+    return make
+
+
+class FakeResponse:
+    """Resposta HTTP simulada para testes sem acesso à rede"""
+
+    def __init__(self, payload=None, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b""
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} simulado", response=self)
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Sessão simulada do `http_client`: cada requisição leva `delay` segundos e responde 200 sem corpo"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def request(self, method, url, **kwargs):
+        time.sleep(self.delay)
+        return FakeResponse()
@@ -0,0 +1,88 @@
+from datetime import date
+import polars as pl
+from health_edu_apps_etl import queries
+from health_edu_apps_etl.aggregates import aggregates_dir, scan_aggregate, update_aggregates
+from health_edu_apps_etl.partitioned_dataset import fingerprint, write_partitioned
+
+
+FIELDS = ("source", "title", "journal", "authors", "pub_date")
+ROWS = [
+    ("PubMed", "Mobile apps for health education", "JMIR", "Silva A; Souza B", date(2020, 1, 5)),
+    ("PubMed", "Health apps in schools", "JMIR", "Silva A", date(2023, 6, 1)),
+    ("Scopus", "Serious games for health", "BMC", "Smith J", date(2023, 2, 1)),
+    ("SciELO", "Aplicativos para educação em saúde", "Rev Saude", "N/A", date(2005, 8, 1)),
+]
+
+
+def test_named_queries_read_aggregates(tmp_path, make_articles):
+    """ Testa se as consultas nomeadas leem as agregações e dão o mesmo resultado que as linhas """
+    root = tmp_path / "articles"
+    write_partitioned(make_articles(ROWS, FIELDS), root)
+    assert update_aggregates(root) == 4
+
+    with_aggregates = [
+        queries.count_by_source(path=root).rows(),
+        queries.count_by_year(["PubMed", "Scopus"], path=root).rows(),
+        queries.count_by_journal(2, years=[2023], path=root).rows(),
+        queries.top_authors(2, path=root).rows(),
+        queries.top_title_tokens(2, path=root).rows(),
+        queries.summary_stats(path=root),
+    ]
+    assert with_aggregates[3] == [("Silva A", 2), ("Smith J", 1)], "❌ Erro: Autores mal contados!"
+    assert with_aggregates[4] == [("health", 3), ("apps", 2)]
+    assert "Health" not in queries.top_title_tokens(path=root)["token"].to_list()
+
+    (aggregates_dir(root) / "_state.json").unlink()
+    assert scan_aggregate(root, "source_year") is None
+    assert with_aggregates == [
+        queries.count_by_source(path=root).rows(),
+        queries.count_by_year(["PubMed", "Scopus"], path=root).rows(),
+        queries.count_by_journal(2, years=[2023], path=root).rows(),
+        queries.top_authors(2, path=root).rows(),
+        queries.top_title_tokens(2, path=root).rows(),
+        queries.summary_stats(path=root),
+    ], "❌ Erro: Agregações diferentes da leitura das linhas!"
+
+
+def test_aggregates_are_incremental(tmp_path, make_articles):
+    """ Testa se só as partições alteradas são recalculadas e se agregações atrasadas são ignoradas """
+    root = tmp_path / "articles"
+    write_partitioned(make_articles(ROWS, FIELDS), root)
+    update_aggregates(root)
+
+    # 🔹 Um artigo novo em PubMed/2023 e SciELO/2005 removido
+    rows = ROWS[:3] + [("PubMed", "Telehealth apps", "JMIR", "Costa C", date(2023, 9, 1))]
+    write_partitioned(make_articles(rows, FIELDS), root)
+    assert scan_aggregate(root, "source_year") is None, "❌ Erro: Agregação atrasada foi usada!"
+    assert update_aggregates(root) == 1, "❌ Erro: Partições sem mudança foram recalculadas!"
+
+    assert pl.read_parquet(aggregates_dir(root) / "source_year.parquet").rows() == [
+        ("PubMed", 2020, 1), ("PubMed", 2023, 2), ("Scopus", 2023, 1),
+    ]
+    assert queries.top_authors(1, path=root).rows() == [("Silva A", 2)]
+
+
+def test_title_token_index_drops_stopwords(tmp_path, make_articles):
+    """ Testa o índice de palavras dos títulos sem stopwords e a reconstrução ao mudar a versão das tabelas """
+    root = tmp_path / "articles"
+    write_partitioned(make_articles(ROWS, FIELDS), root)
+    update_aggregates(root)
+
+    tokens = queries.top_title_tokens(path=root)["token"].to_list()
+    assert "for" not in tokens and "para" not in tokens, "❌ Erro: Stopwords no índice de palavras!"
+    assert queries.top_title_tokens(sources=["SciELO"], path=root).rows() == [("aplicativos", 1), ("educação", 1), ("saúde", 1)]
+
+    state_file = aggregates_dir(root) / "_state.json"
+    state_file.write_text(state_file.read_text().replace('"version": 2', '"version": 1'))
+    assert scan_aggregate(root, "title_tokens") is None, "❌ Erro: Tabela de versão antiga foi usada!"
+    assert update_aggregates(root) == 4
+
+
+def test_fingerprint_is_a_stable_digest():
+    """ Testa se a `fingerprint` da partição não depende da ordem das linhas nem da versão do polars """
+    df = pl.DataFrame({"title": ["b", "a"], "authors": [["X", "Y"], []], "pub_date": [date(2020, 1, 5), None]})
+
+    assert fingerprint(df) == fingerprint(df.reverse()), "❌ Erro: Ordem das linhas mudou a fingerprint!"
+    # 🔹 Valor fixo: um resumo que mudasse com o polars recalcularia todas as agregações a cada atualização
+    assert fingerprint(df) == "fd6f5bfab67f6563e19afe5dbfe86af225bcff3a82c39b36344aab375896a949"
+    assert fingerprint(df.with_columns(pl.lit("c").alias("title"))) != fingerprint(df)
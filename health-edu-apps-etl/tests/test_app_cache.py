@@ -0,0 +1,31 @@
+from health_edu_apps_etl.app_cache import CachedQueries, QueryCache, dataset_version
+from health_edu_apps_etl.partitioned_dataset import write_partitioned
+
+
+def test_query_cache_evicts_least_recently_used():
+    """ Testa o limite do cache LRU e a contagem de acertos """
+    cache = QueryCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 0)
+    cache.get("c", lambda: 3)
+
+    assert list(cache.entries) == ["a", "c"], "❌ Erro: Entrada mais usada foi removida!"
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_cached_queries_follow_dataset_version(tmp_path, make_articles):
+    """ Testa se os resultados são reaproveitados pelos filtros e recalculados quando o dataset muda """
+    root = tmp_path / "articles"
+    write_partitioned(make_articles([(f"App {i}",) for i in range(2)], ("title",), authors="Silva A"), root)
+    db = CachedQueries(QueryCache(maxsize=8), path=root)
+
+    first = db.count_by_source(sources=["Scopus", "PubMed"], years=[2023])
+    assert db.count_by_source(sources=["PubMed", "Scopus"], years=[2023]) is first, "❌ Erro: Mesma seleção não usou o cache!"
+    assert db.list_articles(["title"], sources=["PubMed"])["title"].to_list() == ["App 0", "App 1"]
+    assert db.cache.hits == 1
+
+    version = dataset_version(root)
+    write_partitioned(make_articles([(f"App {i}",) for i in range(3)], ("title",), authors="Silva A"), root)
+    assert dataset_version(root) != version
+    assert db.count_by_source(sources=["PubMed", "Scopus"], years=[2023]).rows() == [("PubMed", 3)], "❌ Erro: Resultado antigo após nova gravação!"
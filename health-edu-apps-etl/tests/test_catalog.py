@@ -0,0 +1,71 @@
+import subprocess
+import sys
+from datetime import date
+import polars as pl
+from health_edu_apps_etl import catalog, queries
+from health_edu_apps_etl.etl_pipeline import upsert_in_batches
+
+
+FIELDS = ("source", "id", "doi", "title", "authors", "pub_date")
+
+
+def test_upsert_articles_and_authors(make_articles):
+    """ Testa o upsert por (fonte, id) com a tabela de autores normalizada """
+    con = catalog.connect()
+    catalog.upsert_articles(con, make_articles([
+        ("PubMed", "1", "10.1/a", "App A", "Silva A; Souza B", date(2020, 1, 5)),
+        ("PubMed", "2", None, "App B", "Silva A", date(2023, 6, 1)),
+    ], FIELDS), run_id="r1")
+    written = catalog.upsert_articles(con, make_articles([
+        ("PubMed", "2", None, "App B (revisado)", "Costa C; Silva A", date(2023, 6, 1)),
+    ], FIELDS), run_id="r2")
+
+    assert written == 1, "❌ Erro: Upsert deveria gravar só o lote!"
+    assert con.sql("SELECT id, title, run_id FROM articles ORDER BY id").fetchall() == [("1", "App A", "r1"), ("2", "App B (revisado)", "r2")]
+    assert con.sql("SELECT count(*) FROM authors").fetchone() == (3,)
+    assert con.sql("""
+        SELECT au.name FROM article_authors aa JOIN authors au USING (author_id)
+        WHERE aa.id = '2' ORDER BY aa.position
+    """).fetchall() == [("Costa C",), ("Silva A",)], "❌ Erro: Autores não foram substituídos!"
+    indexes = {row[0] for row in con.sql("SELECT index_name FROM duckdb_indexes()").fetchall()}
+    assert {"articles_doi", "articles_title_norm", "articles_year"} <= indexes
+    con.close()
+
+
+def test_catalog_query_api(make_articles):
+    """ Testa as consultas do catálogo: busca por DOI, um registro por artigo e consultas nomeadas """
+    con = catalog.connect()
+    catalog.upsert_articles(con, make_articles([
+        ("PubMed", "1", "10.1/a", "App A", "Silva A", date(2020, 1, 5)),
+        ("Scopus", "SCOPUS_ID:1", "https://doi.org/10.1/A", "App A.", "Silva A.", date(2020, 1, 1)),
+        ("Scopus", "SCOPUS_ID:2", None, "App B", "Smith J", date(2023, 2, 1)),
+    ], FIELDS))
+    con.close()
+
+    assert catalog.find_articles(doi="doi:10.1/A")["source"].to_list() == ["PubMed", "Scopus"]
+    assert catalog.find_articles(title="APP B")["id"].to_list() == ["SCOPUS_ID:2"]
+
+    path = catalog.CATALOG_PATH
+    assert queries.count_by_year(path=path).rows() == [(2020, 1), (2023, 1)], "❌ Erro: Duplicata por DOI contada duas vezes!"
+    assert queries.list_articles(["title", "authors"], years=[2023], path=path).rows() == [("App B", ["Smith J"])]
+    assert queries.count_by_source([], path=path).is_empty()
+
+    # 🔹 Depois das consultas, outro processo (o ETL) consegue abrir o catálogo para gravar
+    subprocess.run([sys.executable, "-c", f"import duckdb; duckdb.connect({str(path)!r}).close()"], check=True)
+
+    con = catalog.connect()
+    catalog.record_clusters(con, pl.DataFrame({"source": ["PubMed", "Scopus"], "id": ["1", "SCOPUS_ID:2"], "cluster_id": [0, 0]}))
+    con.close()
+    assert queries.summary_stats(path=path)["Total de artigos"] == 2
+
+
+def test_upsert_in_batches():
+    """ Testa o upsert de uma fonte em fatias limitadas, com o último registro de cada chave valendo """
+    raw = pl.LazyFrame({
+        "id": ["1", "2", "1"], "doi": ["N/A"] * 3, "title": ["App A", "App B", "App A (v2)"], "journal": ["JMIR"] * 3,
+        "authors": ["Silva A"] * 3, "pub_date": ["2024-03-01"] * 3, "source": ["PubMed"] * 3,
+    })
+    con = catalog.connect()
+    assert upsert_in_batches(con, raw, "PubMed", "r1", batch_size=2) == 3
+    assert con.sql("SELECT id, title FROM articles ORDER BY id").fetchall() == [("1", "App A (v2)"), ("2", "App B")]
+    con.close()
@@ -0,0 +1,51 @@
+import numpy as np
+import polars as pl
+from health_edu_apps_etl.dedup import assign_clusters, connected_components, deduplicate, normalize_doi
+
+
+FIELDS = ("source", "id", "doi", "title", "authors")
+
+
+def test_normalize_doi():
+    """ Testa a padronização do DOI escrito de formas diferentes pelas fontes """
+    df = pl.DataFrame({"doi": ["https://doi.org/10.2196/ABC", "doi: 10.2196/abc", "10.2196/abc", "N/A", None]})
+
+    assert df.select(normalize_doi())["doi"].to_list() == ["10.2196/abc"] * 3 + [None, None]
+
+
+def test_clusters_across_sources(make_articles):
+    """ Testa o agrupamento por DOI, título normalizado e título quase igual (MinHash/LSH) """
+    df = make_articles([
+        ("PubMed", "1", "10.2196/1", "Mobile apps for diabetes education", "Silva A; Souza B"),
+        ("Scopus", "SCOPUS_ID:1", "https://doi.org/10.2196/1", "Outro título qualquer", "Silva A."),
+        ("PubMed", "2", None, "Educação em saúde com aplicativos móveis: revisão", "Costa C"),
+        ("SciELO", "S2", None, "EDUCACAO EM SAUDE COM APLICATIVOS MOVEIS - REVISAO", "Costa, C"),
+        ("PubMed", "3", None, "A randomized trial of a smartphone app to support medication adherence in older adults", "Smith J"),
+        ("Web of Science", "WOS:3", None, "A randomized trial of a smartphone app to support medication adherence in older adults.", "Smith J"),
+        ("Scopus", "SCOPUS_ID:4", None, "Gamification in nursing education: a scoping review", "Lee K"),
+    ], FIELDS)
+
+    clusters = assign_clusters(df)["cluster_id"].to_list()
+
+    assert clusters == [0, 0, 1, 1, 2, 2, 3], "❌ Erro: Duplicatas entre fontes não foram agrupadas!"
+
+
+def test_near_duplicate_titles(make_articles):
+    """ Testa o LSH com títulos que diferem em uma palavra e com títulos diferentes """
+    df = make_articles([
+        ("PubMed", "1", None, "Effectiveness of a mobile health application for hypertension self management in primary care", "Silva A"),
+        ("Scopus", "2", None, "Effectiveness of a mobile health application for hypertension self-management in the primary care", "Silva A"),
+        ("IEEE Xplore", "3", None, "Deep learning for retinal image segmentation on embedded devices", "Silva A"),
+    ], FIELDS)
+
+    unique, clustered = deduplicate(df)
+
+    assert clustered["cluster_id"].to_list() == [0, 0, 1], "❌ Erro: Títulos quase iguais não foram agrupados!"
+    assert unique["id"].to_list() == ["1", "3"]
+
+
+def test_connected_components_chain():
+    """ Testa a união transitiva dos pares (a~b, b~c ⇒ a~c) """
+    labels = connected_components(6, np.array([4, 3, 2, 0]), np.array([5, 4, 3, 1]))
+
+    assert labels.tolist() == [0, 0, 2, 2, 2, 2]
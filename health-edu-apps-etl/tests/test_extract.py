@@ -0,0 +1,237 @@
+import polars as pl
+import pytest
+import requests
+from datetime import date
+from health_edu_apps_etl import extract_ieee, extract_pubmed, extract_scielo, extract_scopus, extract_wos
+from tests.conftest import FakeResponse
+
+
+def summary_payload(article_ids):
+    """Monta um payload esummary com vários registros"""
+    result = {"uids": list(article_ids)}
+    for article_id in article_ids:
+        result[article_id] = {
+            "title": f"Artigo {article_id}",
+            "source": "JMIR",
+            "authors": [{"name": "Silva A"}, {"name": "Souza B"}],
+            "pubdate": "2024 Jan 5",
+        }
+    return {"result": result}
+
+
+def test_fetch_article_details_batches(monkeypatch):
+    """ Testa se os detalhes da PubMed são buscados em lotes """
+    calls = []
+
+    def fake_request(source, url, params=None, data=None, cache=True):
+        payload = params or data
+        ids = payload["id"].split(",")
+        calls.append(ids)
+        return FakeResponse(summary_payload(ids))
+
+    monkeypatch.setattr(extract_pubmed.http_client, "get", fake_request)
+    monkeypatch.setattr(extract_pubmed.http_client, "post", fake_request)
+
+    article_ids = [str(i) for i in range(1, 451)]
+    df = extract_pubmed.fetch_article_details(article_ids, batch_size=200)
+
+    assert [len(ids) for ids in calls] == [200, 200, 50], "❌ Erro: Lotes com tamanho incorreto!"
+    assert df.shape[0] == 450, "❌ Erro: Nem todos os artigos foram extraídos!"
+    assert df.columns == ["id", "doi", "title", "journal", "authors", "pub_date", "source"]
+    assert df.filter(pl.col("id") == "7")["authors"][0] == "Silva A; Souza B"
+
+
+def test_parse_summary_result_skips_errors():
+    """ Testa se registros com erro no esummary são ignorados """
+    payload = summary_payload(["1"])
+    payload["result"]["uids"].append("2")
+    payload["result"]["2"] = {"uid": "2", "error": "cannot get document summary"}
+
+    articles = extract_pubmed.parse_summary_result(payload)
+
+    assert articles.to_frame()["id"].to_list() == ["1"], "❌ Erro: Registro com erro não foi ignorado!"
+
+
+def test_iter_pubmed_batches_uses_history(monkeypatch):
+    """ Testa a paginação via WebEnv/query_key gerando um DataFrame por página """
+    pages = []
+
+    def fake_get(source, url, params=None, cache=True):
+        if url.endswith("esearch.fcgi"):
+            assert params["usehistory"] == "y"
+            return FakeResponse({"esearchresult": {"count": "5", "webenv": "MCID_1", "querykey": "1"}})
+        assert params["WebEnv"] == "MCID_1" and params["query_key"] == "1"
+        pages.append((params["retstart"], params["retmax"]))
+        start = params["retstart"]
+        return FakeResponse(summary_payload([str(i) for i in range(start, start + params["retmax"])]))
+
+    monkeypatch.setattr(extract_pubmed.http_client, "get", fake_get)
+
+    batches = list(extract_pubmed.iter_pubmed_batches("query", page_size=2))
+
+    assert pages == [(0, 2), (2, 2), (4, 1)], "❌ Erro: Paginação retstart/retmax incorreta!"
+    assert [b.shape[0] for b in batches] == [2, 2, 1]
+
+
+def test_pubmed_page_failure_is_raised(monkeypatch):
+    """ Testa se uma página do histórico que falha em todas as tentativas interrompe a paginação """
+    def fake_get(source, url, params=None, cache=True):
+        if url.endswith("esearch.fcgi"):
+            return FakeResponse({"esearchresult": {"count": "4", "webenv": "MCID_1", "querykey": "1"}})
+        if params["retstart"] == 2:
+            raise requests.ConnectionError("falha simulada")
+        return FakeResponse(summary_payload([str(params["retstart"]), str(params["retstart"] + 1)]))
+
+    monkeypatch.setattr(extract_pubmed.http_client, "get", fake_get)
+    monkeypatch.setattr(extract_pubmed, "backoff_delay", lambda attempt: 0)
+
+    pages = []
+    with pytest.raises(requests.ConnectionError):
+        for page, df in extract_pubmed.iter_pubmed_pages("query", page_size=2):
+            pages.append(page)
+    assert pages == [0], "❌ Erro: Página com falha foi entregue como página vazia!"
+
+
+def scopus_page(start, count, total, cursor):
+    """Monta uma página da Scopus Search API com cursor para a próxima página"""
+    entries = [
+        {"dc:identifier": f"SCOPUS_ID:{i}", "dc:title": f"Artigo {i}", "prism:publicationName": "JMIR",
+         "dc:creator": "Silva A", "prism:coverDate": "2024-01-05"}
+        for i in range(start, min(start + count, total))
+    ]
+    return {"search-results": {"opensearch:totalResults": str(total), "cursor": {"@next": cursor}, "entry": entries}}
+
+
+def test_iter_scopus_pages_follows_cursor(monkeypatch):
+    """ Testa a paginação profunda por cursor da Scopus até o total de resultados """
+    cursors = []
+
+    def fake_get(source, url, headers=None, params=None, cache=True):
+        assert cache is False, "❌ Erro: Páginas com cursor não devem usar o cache!"
+        cursors.append(params["cursor"])
+        start = 2 * (len(cursors) - 1)
+        return FakeResponse(scopus_page(start, params["count"], 5, f"c{len(cursors)}"))
+
+    monkeypatch.setattr(extract_scopus.http_client, "get", fake_get)
+
+    pages = list(extract_scopus.iter_scopus_pages("query", page_size=2))
+
+    assert cursors == ["*", "c1", "c2"], "❌ Erro: Cursor da próxima página não foi seguido!"
+    assert [p.shape[0] for p in pages] == [2, 2, 1]
+    assert pages[0]["id"].to_list() == ["SCOPUS_ID:0", "SCOPUS_ID:1"]
+
+
+def test_stream_scopus_respects_record_cap(monkeypatch, tmp_path):
+    """ Testa se o limite de registros é respeitado e cada página vira um arquivo Parquet """
+    def fake_get(source, url, headers=None, params=None, cache=True):
+        start = 0 if params["cursor"] == "*" else int(params["cursor"])
+        return FakeResponse(scopus_page(start, params["count"], 1000, str(start + params["count"])))
+
+    monkeypatch.setattr(extract_scopus.http_client, "get", fake_get)
+
+    parts = extract_scopus.stream_scopus_to_parquet("query", tmp_path, max_records=450, row_group_size=200)
+
+    assert [p.name for p in parts] == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+    assert pl.read_parquet(parts).shape[0] == 450, "❌ Erro: Limite de registros não respeitado!"
+
+
+def wos_payload(first_record, count, total):
+    """Monta uma página da Web of Science Starter API"""
+    records = [
+        {"UID": f"WOS:{i}", "Title": f"Artigo {i}", "Source": "JMIR", "Authors": "Silva A", "PublicationDate": "2024-01-05"}
+        for i in range(first_record, min(first_record + count, total + 1))
+    ]
+    return {"QueryResult": {"RecordsFound": total}, "Data": {"Records": records}}
+
+
+def test_wos_pages_until_records_found(monkeypatch):
+    """ Testa a paginação firstRecord/count da Web of Science até o total encontrado """
+    requested = []
+
+    def fake_get(source, url, headers=None, params=None, cache=True):
+        requested.append((params["firstRecord"], params["count"]))
+        return FakeResponse(wos_payload(params["firstRecord"], params["count"], 250))
+
+    monkeypatch.setattr(extract_wos.http_client, "get", fake_get)
+
+    df = extract_wos.extract_wos_articles(None, "query")
+
+    assert sorted(requested) == [(1, 100), (101, 100), (201, 50)], "❌ Erro: Paginação firstRecord/count incorreta!"
+    assert df.shape[0] == 250
+    assert df["id"].to_list() == [f"WOS:{i}" for i in range(1, 251)], "❌ Erro: Páginas fora de ordem!"
+
+
+def test_wos_resumes_after_failed_page(monkeypatch):
+    """ Testa se a paginação retoma só as páginas pendentes quando uma página falha """
+    requested = []
+    monkeypatch.setattr(extract_wos, "backoff_delay", lambda attempt: 0)
+
+    def fake_get(source, url, headers=None, params=None, cache=True):
+        requested.append(params["firstRecord"])
+        if params["firstRecord"] == 201 and requested.count(201) <= extract_wos.RETRIES:
+            raise requests.ConnectionError("conexão perdida")
+        return FakeResponse(wos_payload(params["firstRecord"], params["count"], 300))
+
+    monkeypatch.setattr(extract_wos.http_client, "get", fake_get)
+
+    df = extract_wos.extract_wos_articles(None, "query")
+
+    assert df.shape[0] == 300, "❌ Erro: Registros perdidos após a retomada!"
+    assert requested.count(101) == 1, "❌ Erro: Página já concluída foi buscada novamente!"
+    assert requested.count(201) == extract_wos.RETRIES + 1
+
+
+def test_scielo_harvest_lists_identifiers(monkeypatch):
+    """ Testa a listagem de PIDs da SciELO por offset e a busca paralela dos artigos """
+    offsets = []
+
+    def fake_get(source, url, headers=None, params=None, cache=True):
+        if url == extract_scielo.IDENTIFIERS_URL:
+            assert cache is False, "❌ Erro: A listagem de PIDs não pode vir do cache!"
+            offsets.append(params["offset"])
+            assert params["from"] == "2024-01-01" and params["collection"] == "scl"
+            codes = [{"code": f"S{i:04d}"} for i in range(params["offset"], min(params["offset"] + params["limit"], 5))]
+            return FakeResponse({"meta": {"total": 5}, "objects": codes})
+        code = url.split("code=")[1].split("&")[0]
+        article = {"v12": [{"_": f"Artigo {code}"}], "v30": [{"_": "Rev Saude"}], "v10": [{"n": "Silva"}], "v65": [{"_": "20240105"}]}
+        return FakeResponse({"article": article})
+
+    monkeypatch.setattr(extract_scielo.http_client, "get", fake_get)
+
+    codes = extract_scielo.list_article_codes("scl", since=date(2024, 1, 1), page_size=2)
+    df = extract_scielo.fetch_scielo_articles(article_codes=codes)
+
+    assert offsets == [0, 2, 4], "❌ Erro: Paginação por offset incorreta!"
+    assert codes == ["S0000", "S0001", "S0002", "S0003", "S0004"]
+    assert df["id"].to_list() == codes, "❌ Erro: Artigos fora de ordem ou ausentes!"
+    assert df["pub_date"][0] == "2024-01"
+
+
+def test_scielo_article_failure_is_raised(monkeypatch):
+    """ Testa se um PID que falha em todas as tentativas derruba o lote em vez de sumir dele """
+    def fake_get(source, url, headers=None, params=None, cache=True):
+        if "S0002" in url:
+            raise requests.ConnectionError("falha simulada")
+        return FakeResponse({"article": {"v12": [{"_": "Artigo"}]}})
+
+    monkeypatch.setattr(extract_scielo.http_client, "get", fake_get)
+    monkeypatch.setattr(extract_scielo, "backoff_delay", lambda attempt: 0)
+
+    with pytest.raises(requests.ConnectionError):
+        extract_scielo.fetch_scielo_articles(article_codes=["S0001", "S0002", "S0003"])
+
+
+def test_ieee_http_error_is_retried_and_raised(monkeypatch):
+    """ Testa se um erro HTTP da IEEE Xplore é tentado de novo e propagado, em vez de virar resultado vazio """
+    calls = []
+
+    def fake_get(source, url, params=None, cache=True):
+        calls.append(params["querytext"])
+        return FakeResponse({"error": "Developer Inactive"}, status_code=403)
+
+    monkeypatch.setattr(extract_ieee.http_client, "get", fake_get)
+    monkeypatch.setattr(extract_ieee, "backoff_delay", lambda attempt: 0)
+
+    with pytest.raises(requests.HTTPError):
+        extract_ieee.fetch_ieee_articles("query")
+    assert len(calls) == extract_ieee.RETRIES, "❌ Erro: Requisição não foi tentada de novo!"
@@ -0,0 +1,83 @@
+import threading
+import time
+import polars as pl
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.extraction_engine import run_extractors
+from tests.conftest import FakeSession
+
+
+def make_job(rows, pause=0.0):
+    """Cria uma tarefa de extração que devolve `rows` artigos após `pause` segundos"""
+    def job():
+        time.sleep(pause)
+        return pl.DataFrame({"id": [str(i) for i in range(rows)]})
+    return job
+
+
+def failing_job():
+    raise RuntimeError("API fora do ar")
+
+
+def test_failure_is_isolated():
+    """ Testa se a falha de uma fonte não interrompe as demais """
+    results = run_extractors([("PubMed", make_job(3)), ("Scopus", failing_job), ("SciELO", make_job(0))])
+
+    assert [r["status"] for r in results] == ["ok", "error", "empty"], "❌ Erro: Status por fonte incorreto!"
+    assert results[0]["data"].shape[0] == 3
+    assert "API fora do ar" in results[1]["error"]
+    assert all(r["elapsed"] >= 0 for r in results)
+
+
+def test_sources_run_concurrently_within_budget():
+    """ Testa se as fontes rodam em paralelo e se a tarefa lenta estoura o orçamento """
+    jobs = [("PubMed", make_job(1, 0.3)), ("Scopus", make_job(1, 0.3)), ("Web of Science", make_job(1, 5))]
+
+    start = time.perf_counter()
+    results = run_extractors(jobs, max_workers=3, timeout=1)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2, "❌ Erro: O orçamento global de tempo não foi respeitado!"
+    assert [r["status"] for r in results] == ["ok", "ok", "timeout"]
+
+
+def test_per_source_concurrency_limit():
+    """ Testa se o limite de tarefas simultâneas por fonte é respeitado """
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return pl.DataFrame({"id": ["1"]})
+
+    results = run_extractors([("PubMed", job)] * 4, max_workers=4, limits={"PubMed": 2})
+
+    assert peak[0] == 2, "❌ Erro: Limite de concorrência por fonte não respeitado!"
+    assert all(r["status"] == "ok" for r in results)
+
+
+def test_timeout_cancels_running_job(monkeypatch):
+    """ Testa se a tarefa que estoura o orçamento para na próxima requisição e libera a fonte ao terminar """
+    monkeypatch.setattr(http_client, "get_session", lambda source: FakeSession(delay=0.05))
+    stopped = threading.Event()
+
+    def job():
+        try:
+            while True:
+                http_client.get("IEEE Xplore", "http://localhost/api", cache=False)
+        except http_client.ExtractionCancelled:
+            stopped.set()
+            raise
+
+    results = run_extractors([("IEEE Xplore", job)], timeout=0.3)
+
+    assert results[0]["status"] == "timeout"
+    assert stopped.wait(2), "❌ Erro: A tarefa continuou rodando após o tempo limite!"
+    deadline = time.monotonic() + 2
+    while "IEEE Xplore" in http_client._cancelled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    http_client.get("IEEE Xplore", "http://localhost/api", cache=False)
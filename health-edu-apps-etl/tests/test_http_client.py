@@ -0,0 +1,118 @@
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from health_edu_apps_etl import http_client
+from health_edu_apps_etl.http_cache import ResponseCache, CacheMiss, set_cache
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Servidor local que responde JSON compactado com gzip e suporta ETag"""
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        JSONHandler.hits += 1
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = gzip.compress(json.dumps({
+            "path": self.path,
+            "encoding": self.headers.get("Accept-Encoding"),
+            "articles": ["mobile health app"] * 50,
+        }).encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Usa um cache isolado em diretório temporário"""
+    store = ResponseCache(tmp_path / "cache.sqlite", ttls={})
+    set_cache(store)
+    yield store
+    set_cache(None)
+
+
+@pytest.fixture
+def server():
+    """Sobe um servidor HTTP local durante o teste"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_get_reuses_session_and_records_stats(server, cache):
+    """ Testa a sessão compartilhada por fonte, a compressão e os contadores """
+    http_client.reset_stats()
+
+    first = http_client.get("Teste", f"{server}/a", params={"q": "1"}, cache=False)
+    second = http_client.get("Teste", f"{server}/b", cache=False)
+
+    assert first.json()["path"] == "/a?q=1"
+    assert "gzip" in second.json()["encoding"], "❌ Erro: Compressão não negociada!"
+    assert http_client.get_session("Teste") is http_client.get_session("Teste")
+
+    stats = http_client.get_stats()["Teste"]
+    assert stats["requests"] == 2 and stats["errors"] == 0
+    assert stats["bytes"] > stats["wire_bytes"], "❌ Erro: Bytes compactados não contabilizados!"
+    assert "Teste: 2 requisições" in http_client.format_stats()
+
+
+def test_cache_hit_revalidation_and_offline(server, cache):
+    """ Testa acerto no cache, revalidação por ETag e o modo offline """
+    http_client.reset_stats()
+    JSONHandler.hits = 0
+    url = f"{server}/artigos"
+
+    first = http_client.get("Teste", url, params={"q": "app", "api_key": "segredo"})
+    cached = http_client.get("Teste", url, params={"api_key": "outra", "q": "app"})
+    assert JSONHandler.hits == 1, "❌ Erro: A segunda chamada deveria vir do cache!"
+    assert cached.json() == first.json() and cached.from_cache
+
+    cache.ttls = {"Teste": 0}  # Força a expiração para revalidar
+    revalidated = http_client.get("Teste", url, params={"q": "app"})
+    assert JSONHandler.hits == 2 and revalidated.json() == first.json()
+
+    cache.mode = "offline"
+    assert http_client.get("Teste", url, params={"q": "app"}).status_code == 200
+    with pytest.raises(CacheMiss):
+        http_client.get("Teste", f"{server}/inexistente")
+    assert JSONHandler.hits == 2, "❌ Erro: O modo offline acessou a rede!"
+
+    stats = http_client.get_stats()["Teste"]
+    assert (stats["cache_hits"], stats["revalidated"]) == (2, 1)
+
+
+def test_cache_lru_eviction(tmp_path):
+    """ Testa a remoção LRU quando o cache excede o tamanho máximo """
+    store = ResponseCache(tmp_path / "cache.sqlite", max_bytes=2500)
+
+    class Stored:
+        status_code = 200
+        headers = {}
+        url = "https://exemplo.org"
+
+    for i in range(5):
+        response = Stored()
+        response.content = os.urandom(1000)  # Conteúdo pouco compressível
+        store.store(f"k{i}", "Teste", response)
+        store.lookup("k0")  # Mantém a primeira entrada como recém-usada
+
+    assert store.lookup("k0") is not None, "❌ Erro: A entrada mais usada foi removida!"
+    assert store.lookup("k1") is None
+    assert store.size()[1] <= 2500
@@ -0,0 +1,99 @@
+from datetime import date
+import polars as pl
+import pytest
+from health_edu_apps_etl import queries
+from health_edu_apps_etl.partitioned_dataset import write_partitioned
+from health_edu_apps_etl.schema import enforce_schema
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Cria um dataset processado pequeno com três fontes e anos diferentes"""
+    path = tmp_path / "articles.parquet"
+    enforce_schema(pl.DataFrame({
+        "id": ["1", "2", "3", "4"],
+        "title": ["App A", "App B", "App C", "App D"],
+        "journal": ["JMIR", "JMIR", "BMC", "Rev Saude"],
+        "authors": ["Silva A; Souza B", "Silva A", "Smith J", "N/A"],
+        "pub_date": [date(2020, 1, 5), date(2023, 6, 1), date(2023, 2, 1), date(2005, 8, 1)],
+        "source": ["PubMed", "PubMed", "Scopus", "SciELO"],
+    })).write_parquet(path)
+    return path
+
+
+def test_named_queries(dataset):
+    """ Testa as contagens por fonte, ano, periódico e autores """
+    assert queries.count_by_source(path=dataset).rows() == [("PubMed", 2), ("Scopus", 1), ("SciELO", 1)]
+    assert queries.count_by_year(path=dataset).rows() == [(2005, 1), (2020, 1), (2023, 2)]
+    assert queries.count_by_journal(1, path=dataset).rows() == [("JMIR", 2)]
+    assert queries.top_authors(2, path=dataset).rows() == [("Silva A", 2), ("Smith J", 1)], "❌ Erro: Autores mal contados!"
+    assert queries.summary_stats(path=dataset)["Total de artigos"] == 4
+
+
+def test_filters_are_pushed_down(dataset):
+    """ Testa se filtros e projeção chegam à leitura do Parquet """
+    lf = queries.filter_articles(queries.scan_articles(dataset), sources=["PubMed"], years=range(2020, 2025))
+    plan = lf.select("title").explain()
+
+    assert "SELECTION" in plan and "PROJECT 3/7 COLUMNS" in plan, "❌ Erro: Filtro/projeção não empurrados para o scan!"
+    assert queries.list_articles(["title"], sources=["PubMed"], years=[2023], path=dataset)["title"].to_list() == ["App B"]
+
+
+def test_partitioned_dataset_prunes_files(dataset, tmp_path):
+    """ Testa se o dataset particionado só lê os arquivos da fonte e dos anos filtrados """
+    root = tmp_path / "articles"
+    manifest = write_partitioned(pl.read_parquet(dataset), root)
+
+    assert [(p["source"], p["year"]) for p in manifest["partitions"]] == [
+        ("PubMed", 2020), ("PubMed", 2023), ("SciELO", 2005), ("Scopus", 2023),
+    ]
+    assert (root / "source=pubmed" / "year=2023" / "part-00000.parquet").exists()
+
+    lf = queries.scan_articles(root, sources=["PubMed"], years=range(2021, 2025))
+    assert "source=pubmed/year=2023" in lf.explain() and "year=2020" not in lf.explain(), "❌ Erro: Partições não foram podadas!"
+    assert queries.count_by_source(["PubMed"], range(2020, 2025), path=root).rows() == [("PubMed", 2)]
+    assert queries.available_years(root) == [2005, 2020, 2023]
+
+
+def test_schema_is_enforced(dataset):
+    """ Testa o schema canônico: Enum, Categorical, lista de autores e Date """
+    df = pl.read_parquet(dataset)
+
+    assert df.schema["source"] == pl.Enum(["PubMed", "Scopus", "Web of Science", "IEEE Xplore", "SciELO"])
+    assert df.schema["journal"] == pl.Categorical and df.schema["pub_date"] == pl.Date
+    assert df["authors"].to_list() == [["Silva A", "Souza B"], ["Silva A"], ["Smith J"], []], "❌ Erro: Autores não viraram lista!"
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        enforce_schema(df.with_columns(pl.lit("Google Scholar").alias("source")))
+
+
+def test_author_names_keep_their_commas():
+    """ Testa se nomes no formato "Sobrenome, Nome" (WoS/Scopus) não viram dois autores """
+    df = enforce_schema(pl.DataFrame({
+        "title": ["App"], "journal": ["JMIR"], "authors": ["Silva, Ana; Souza, Bruno"],
+        "pub_date": [date(2023, 1, 1)], "source": ["Web of Science"],
+    }))
+
+    assert df["authors"].to_list() == [["Silva, Ana", "Souza, Bruno"]], "❌ Erro: Nome do autor partido na vírgula!"
+
+
+def test_paginated_articles(dataset):
+    """ Testa a contagem e as páginas ordenadas dos artigos filtrados """
+    assert queries.count_articles(sources=["PubMed", "Scopus"], path=dataset) == 3
+
+    first = queries.page_articles(0, 2, path=dataset)
+    second = queries.page_articles(2, 2, path=dataset)
+    assert first["title"].to_list() + second["title"].to_list() == ["App B", "App C", "App A", "App D"], "❌ Erro: Páginas fora de ordem!"
+    assert queries.page_articles(0, 3, "journal", False, ["journal"], path=dataset)["journal"].to_list() == ["BMC", "JMIR", "JMIR"]
+    with pytest.raises(ValueError):
+        queries.page_articles(sort_by="doi", path=dataset)
+
+
+def test_export_articles(dataset, tmp_path):
+    """ Testa a exportação em CSV (autores em texto) e Parquet pelo engine de streaming """
+    csv_file = queries.export_articles(tmp_path / "artigos.csv", "csv", sources=["PubMed"], path=dataset)
+    parquet_file = queries.export_articles(tmp_path / "artigos.parquet", "parquet", years=[2023], path=dataset)
+
+    assert pl.read_csv(csv_file)["authors"].to_list() == ["Silva A; Souza B", "Silva A"], "❌ Erro: Autores não exportados como texto!"
+    assert pl.read_parquet(parquet_file)["title"].to_list() == ["App B", "App C"]
+    with pytest.raises(ValueError):
+        queries.export_articles(tmp_path / "artigos.xlsx", "xlsx", path=dataset)
@@ -0,0 +1,85 @@
+import time
+from datetime import date
+import polars as pl
+import pytest
+from health_edu_apps_etl import query_planner
+from health_edu_apps_etl.extraction_engine import run_extractors
+
+
+def fake_spec(monkeypatch, per_year, cap, fail_year=None, pause=0.0):
+    """Registra uma fonte fictícia com `per_year` resultados por ano de publicação"""
+    calls = []
+
+    def count(query, lo, hi):
+        calls.append((lo, hi))
+        return sum(per_year.get(year, 0) for year in range(lo, hi + 1))
+
+    def fetch(query, lo, hi, total):
+        time.sleep(pause)
+        if lo == fail_year:
+            raise RuntimeError("API fora do ar")
+        # 🔹 O artigo "dup" aparece em todas as fatias para testar a deduplicação
+        ids = [f"{year}-{i}" for year in range(lo, hi + 1) for i in range(per_year.get(year, 0))]
+        return pl.DataFrame({"id": ids + ["dup"]})
+
+    monkeypatch.setitem(query_planner.SHARDABLE, "Teste", {"query": "q", "count": count, "fetch": fetch, "cap": cap, "unit": "year"})
+    return calls
+
+
+def test_plan_shards_splits_until_under_cap(monkeypatch):
+    """ Testa se a busca é dividida até toda fatia ficar abaixo do limite """
+    per_year = {2018: 3, 2019: 3, 2020: 6, 2021: 2}
+    fake_spec(monkeypatch, per_year, cap=6)
+
+    shards = query_planner.plan_shards("Teste", start=date(2016, 1, 1), end=date(2021, 12, 31))
+
+    assert all(n <= 6 for _, _, n in shards), "❌ Erro: Fatia acima do limite!"
+    assert sum(n for _, _, n in shards) == 14, "❌ Erro: Resultados perdidos no fatiamento!"
+    covered = [year for lo, hi, _ in shards for year in range(lo, hi + 1)]
+    assert len(covered) == len(set(covered)), "❌ Erro: Fatias sobrepostas!"
+
+
+def test_plan_shards_keeps_unsplittable_shard(monkeypatch):
+    """ Testa se uma fatia mínima acima do limite é mantida (com aviso) """
+    fake_spec(monkeypatch, {2020: 10}, cap=4)
+
+    assert query_planner.plan_shards("Teste", start=date(2020, 1, 1), end=date(2021, 1, 1)) == [(2020, 2020, 10)]
+
+
+def test_harvest_merges_and_deduplicates(monkeypatch):
+    """ Testa a extração paralela das fatias com remoção de duplicatas """
+    fake_spec(monkeypatch, {2019: 2, 2020: 2, 2021: 2}, cap=2)
+
+    df = query_planner.harvest("Teste", start=date(2019, 1, 1), end=date(2021, 12, 31))
+
+    assert df.shape[0] == 7, "❌ Erro: Duplicatas entre fatias não foram removidas!"
+    assert df["id"].n_unique() == 7
+
+
+def test_harvest_fails_when_a_shard_fails(monkeypatch):
+    """ Testa se a falha de uma fatia impede um resultado incompleto """
+    fake_spec(monkeypatch, {2019: 2, 2020: 2}, cap=2, fail_year=2020)
+
+    with pytest.raises(RuntimeError, match="2020"):
+        query_planner.harvest("Teste", start=date(2019, 1, 1), end=date(2020, 12, 31))
+
+
+def test_harvest_shares_the_outer_budget(monkeypatch):
+    """ Testa se as fatias usam o que resta do orçamento da tarefa externa, e não um tempo limite novo """
+    fake_spec(monkeypatch, {2019: 1, 2020: 1}, cap=1, pause=3)
+    finished = []
+
+    def job():
+        start = time.perf_counter()
+        try:
+            return query_planner.harvest("Teste", start=date(2019, 1, 1), end=date(2020, 12, 31))
+        finally:
+            finished.append(time.perf_counter() - start)
+
+    results = run_extractors([("Teste", job)], timeout=0.5)
+
+    assert results[0]["status"] in ("timeout", "error")
+    deadline = time.monotonic() + 5
+    while not finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert finished and finished[0] < 1.5, "❌ Erro: As fatias ultrapassaram o orçamento global!"
@@ -0,0 +1,68 @@
+import time
+import pytest
+from health_edu_apps_etl import rate_limiter
+from health_edu_apps_etl.rate_limiter import QuotaExhausted, TokenBucket, retry_after_seconds, backoff_delay
+from tests.conftest import FakeResponse
+
+
+def test_token_bucket_limits_rate():
+    """ Testa se o token bucket libera a rajada inicial e depois respeita a taxa """
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # 🔹 2 tokens imediatos + 4 a 20 req/s ≈ 0,2s
+    assert 0.15 <= elapsed < 0.5, f"❌ Erro: Taxa do token bucket incorreta ({elapsed:.2f}s)!"
+
+
+def test_token_bucket_pause():
+    """ Testa se a pausa por cota bloqueia novas requisições """
+    bucket = TokenBucket(rate=100)
+    bucket.pause(0.2)
+
+    start = time.monotonic()
+    bucket.acquire()
+
+    assert time.monotonic() - start >= 0.19, "❌ Erro: A pausa do host não foi respeitada!"
+
+
+def test_retry_after_headers():
+    """ Testa a leitura de Retry-After e dos cabeçalhos X-RateLimit-* da Elsevier """
+    assert retry_after_seconds(FakeResponse(status_code=429, headers={"Retry-After": "7"})) == 7
+    reset = str(int(time.time()) + 30)
+    wait = retry_after_seconds(FakeResponse(status_code=200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+    assert 28 <= wait <= 30, "❌ Erro: Reset da cota da Elsevier ignorado!"
+    assert retry_after_seconds(FakeResponse(status_code=200, headers={"X-RateLimit-Remaining": "15", "X-RateLimit-Reset": reset})) is None
+
+
+def test_observe_response_pauses_host(monkeypatch):
+    """ Testa se uma resposta 429 pausa o limitador do host """
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    url = "https://api.elsevier.com/content/search/scopus"
+
+    rate_limiter.observe_response(url, FakeResponse(status_code=429, headers={"Retry-After": "2"}))
+
+    assert rate_limiter.get_limiter(url).blocked_until > time.monotonic() + 1.5
+
+
+def test_distant_quota_reset_fails_fast(monkeypatch):
+    """ Testa se um reset de cota além do teto falha logo, também para as próximas requisições do host """
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    url = "https://api.elsevier.com/content/search/scopus"
+    reset = str(int(time.time()) + 3 * 24 * 3600)
+
+    with pytest.raises(QuotaExhausted):
+        rate_limiter.observe_response(url, FakeResponse(status_code=200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+
+    start = time.monotonic()
+    with pytest.raises(QuotaExhausted):
+        rate_limiter.throttle(url)
+    assert time.monotonic() - start < 1, "❌ Erro: O host esperou o reset da cota!"
+
+
+def test_backoff_delay_is_bounded():
+    """ Testa o backoff exponencial com jitter e teto """
+    assert all(0 <= backoff_delay(attempt, base=1, cap=8) <= min(8, 2 ** attempt) for attempt in range(10))
@@ -0,0 +1,49 @@
+import polars as pl
+import pytest
+from health_edu_apps_etl.extract_scielo import process_article_data
+from health_edu_apps_etl.extract_scopus import process_articles
+from health_edu_apps_etl.records import RAW_SCHEMA, Article, ArticleBatch
+
+
+def test_batch_has_fixed_schema():
+    """ Testa se o lote gera sempre o mesmo schema, inclusive vazio """
+    batch = ArticleBatch("PubMed")
+    assert batch.to_frame().schema == RAW_SCHEMA, "❌ Erro: Lote vazio sem schema!"
+
+    batch.append(id="1", title="App A", pub_date="2024 Jan 5")
+    batch.add(Article("PubMed", id="2", doi=None))
+    df = batch.to_frame()
+
+    assert df.schema == RAW_SCHEMA
+    assert df.rows() == [
+        ("1", "N/A", "App A", "N/A", "N/A", "2024 Jan 5", "PubMed"),
+        ("2", None, "N/A", "N/A", "N/A", "N/A", "PubMed"),
+    ]
+    assert batch.to_arrow().num_rows == 2
+
+
+def test_batch_rejects_schema_mismatch():
+    """ Testa se valores fora do tipo e fontes diferentes falham na montagem do lote """
+    batch = ArticleBatch("IEEE Xplore")
+    batch.append(id="1", pub_date=2024)
+
+    with pytest.raises(TypeError, match="pub_date"):
+        batch.to_frame()
+    with pytest.raises(ValueError):
+        batch.add(Article("SciELO"))
+    with pytest.raises(ValueError):
+        ArticleBatch("Google Scholar")
+
+
+def test_extractors_share_schema():
+    """ Testa se Scopus e SciELO (antes com `publication_date` e sem `id`) geram o mesmo schema """
+    scopus = process_articles([{"dc:identifier": "SCOPUS_ID:1", "dc:title": "App A", "prism:coverDate": "2024-01-05"}])
+    article = process_article_data({"code": "S1", "article": {"v12": [{"_": "App B"}], "v65": [{"_": "20240105"}]}})
+    scielo = ArticleBatch("SciELO")
+    scielo.add(article)
+
+    df = pl.concat([scopus, scielo.to_frame()], how="vertical")
+
+    assert df.schema == RAW_SCHEMA
+    assert df.select("id", "pub_date", "source").rows() == [("SCOPUS_ID:1", "2024-01-05", "Scopus"), ("S1", "2024-01", "SciELO")]
+    assert not hasattr(article, "__dict__"), "❌ Erro: Registro não usa __slots__!"
@@ -0,0 +1,66 @@
+import polars as pl
+import pytest
+from health_edu_apps_etl.parquet_sink import ParquetSink, read_manifest, scan_partition
+from health_edu_apps_etl.run_journal import RunJournal, run_checkpointed
+
+
+def make_pages(total_pages, fail_at=None, calls=None):
+    """Cria um gerador paginado que falha ao chegar na página `fail_at`"""
+    def iter_pages(max_results, done=None):
+        for page in range(total_pages):
+            if page in done:
+                continue
+            if page == fail_at:
+                raise RuntimeError("conexão perdida")
+            calls.append(page)
+            yield page, pl.DataFrame({"id": [f"{page}-{i}" for i in range(2)]}), f"cursor-{page + 1}"
+    return iter_pages
+
+
+def test_restart_skips_completed_pages(tmp_path):
+    """ Testa se uma execução interrompida retoma apenas as páginas pendentes """
+    calls = []
+    journal = RunJournal("2024-03-01", tmp_path / "journal.json")
+
+    with pytest.raises(RuntimeError):
+        run_checkpointed("PubMed", make_pages(4, fail_at=2, calls=calls), journal, tmp_path / "parts", row_group_size=2, max_results=8)
+
+    # 🔹 Nova tentativa: o diário é relido do disco, como após um crash
+    journal = RunJournal("2024-03-01", tmp_path / "journal.json")
+    assert journal.start("PubMed", {"max_results": 8})[1]["cursor"] == "cursor-2"
+    df = run_checkpointed("PubMed", make_pages(4, calls=calls), journal, tmp_path / "parts", row_group_size=2, max_results=8)
+
+    assert calls == [0, 1, 2, 3], "❌ Erro: Páginas concluídas foram buscadas novamente!"
+    assert df.collect()["id"].to_list() == [f"{page}-{i}" for page in range(4) for i in range(2)]
+    assert journal.finished("PubMed")
+    assert len(list((tmp_path / "parts").glob("part-*.parquet"))) == 4
+
+
+def test_changed_params_restart_source(tmp_path):
+    """ Testa se a fonte recomeça do zero quando os parâmetros da extração mudam """
+    calls = []
+    journal = RunJournal("2024-03-01", tmp_path / "journal.json")
+    run_checkpointed("Scopus", make_pages(3, calls=calls), journal, tmp_path / "parts", row_group_size=2, max_results=6)
+    run_checkpointed("Scopus", make_pages(2, calls=calls), journal, tmp_path / "parts", row_group_size=2, max_results=4)
+
+    assert calls == [0, 1, 2, 0, 1], "❌ Erro: Diário reaproveitado com parâmetros diferentes!"
+    assert len(list((tmp_path / "parts").glob("part-*.parquet"))) == 2, "❌ Erro: Partes antigas não foram descartadas!"
+
+    journal.discard()
+    assert not (tmp_path / "journal.json").exists()
+
+
+def test_sink_buffers_until_row_group_and_commits_manifest(tmp_path):
+    """ Testa se o sink só grava partes ao completar um row group e confirma o manifesto """
+    sink = ParquetSink(tmp_path, row_group_size=5)
+
+    assert sink.write([{"id": str(i)} for i in range(3)]) is None, "❌ Erro: Parte gravada antes do row group!"
+    assert sink.write(pl.DataFrame({"id": ["3", "4", "5"]})).name == "part-00000.parquet"
+    assert read_manifest(tmp_path) is None, "❌ Erro: Manifesto confirmado antes do commit!"
+
+    sink.write(pl.DataFrame({"id": ["6"]}))
+    manifest = sink.commit(source="PubMed")
+
+    assert [part["rows"] for part in manifest["parts"]] == [6, 1]
+    assert manifest["rows"] == 7 and manifest["schema"] == {"id": "String"}
+    assert scan_partition(tmp_path).collect()["id"].to_list() == [str(i) for i in range(7)]
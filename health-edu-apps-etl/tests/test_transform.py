@@ -1,12 +1,15 @@
 import polars as pl
-from health_edu_apps_etl.transform_data import load_and_clean_data, OUTPUT_FILE
+from datetime import date
+from health_edu_apps_etl import etl_pipeline, transform_data, watermarks
+from health_edu_apps_etl.queries import collect, count_articles, scan_articles
+from health_edu_apps_etl.transform_data import load_and_clean_data, clean_articles, OUTPUT_DIR
 
 def test_transform_data():
     """ Testa a transformação dos dados """
     load_and_clean_data()
     
     # 📥 Carregar dados transformados
-    df = pl.read_parquet(OUTPUT_FILE)
+    df = collect(scan_articles(OUTPUT_DIR))
     
     # 🔹 Verificar se o arquivo foi criado
     assert df.shape[0] > 0, "❌ Erro: Nenhum artigo foi salvo!"
@@ -19,5 +22,54 @@ def test_transform_data():
 
     print("✅ Teste de transformação passou!")
 
+def test_clean_articles_date_formats():
+    """ Testa a limpeza vetorizada e as datas nos formatos de cada fonte """
+    df = pl.DataFrame({
+        "title": ["  Artigo\nA ", "B", "C", "D", "E"],
+        "journal": ["J"] * 5,
+        "authors": ["Silva A"] * 5,
+        "publication_date": ["2023 Jan 5", "2024-03-10", "2005-08", "2023 Jan-Feb", "sem data"],
+    })
+
+    result = clean_articles(df, "SciELO")
+
+    assert result["title"].to_list() == ["Artigo A", "B", "C", "D"], "❌ Erro: Texto não foi limpo!"
+    assert result["pub_date"].to_list() == [date(2023, 1, 5), date(2024, 3, 10), date(2005, 8, 1), date(2023, 1, 1)]
+    assert result["source"].unique().to_list() == ["SciELO"]
+
+def test_transform_keeps_history_across_incremental_runs(tmp_path, monkeypatch):
+    """ Testa se o dataset processado mantém os artigos de execuções incrementais anteriores """
+    monkeypatch.setattr(watermarks, "WATERMARKS_FILE", tmp_path / "watermarks.json")
+    monkeypatch.setattr(etl_pipeline, "RAW_DATA_DIR", tmp_path)
+    monkeypatch.setattr(transform_data, "RAW_FILES", {"PubMed": tmp_path / "pubmed_articles.parquet"})
+    monkeypatch.setattr(transform_data, "OUTPUT_DIR", tmp_path / "articles")
+    monkeypatch.setattr(transform_data, "CLUSTERS_FILE", tmp_path / "article_clusters.parquet")
+
+    titles = [
+        "Mobile apps for diabetes self management",
+        "Serious games teaching hand hygiene to children",
+        "Chatbot support for smoking cessation programs",
+        "Virtual reality training for nursing students",
+    ]
+    runs = iter([(["1", "2", "3"], titles[:3]), (["4"], titles[3:])])
+
+    def fake_pubmed(max_results, since=None, until=None):
+        ids, batch = next(runs)
+        return pl.DataFrame({
+            "id": ids, "doi": ["N/A"] * len(ids), "title": batch, "journal": ["JMIR"] * len(ids),
+            "authors": [f"Autor {i}" for i in ids], "pub_date": ["2024-03-01"] * len(ids), "source": ["PubMed"] * len(ids),
+        })
+
+    monkeypatch.setattr(etl_pipeline, "SOURCES", {"PubMed": (fake_pubmed, "pubmed")})
+
+    etl_pipeline.run_etl(incremental=True, checkpointed=False)
+    load_and_clean_data()
+    assert count_articles(path=tmp_path / "articles") == 3
+
+    etl_pipeline.run_etl(incremental=True, checkpointed=False)
+    load_and_clean_data()
+    assert pl.read_parquet(tmp_path / "pubmed_articles.parquet").height == 1
+    assert count_articles(path=tmp_path / "articles") == 4, "❌ Erro: Execução incremental apagou o histórico do dataset!"
+
 if __name__ == "__main__":
     test_transform_data()
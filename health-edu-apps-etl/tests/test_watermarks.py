@@ -0,0 +1,61 @@
+from datetime import date
+import polars as pl
+from health_edu_apps_etl import catalog, etl_pipeline, watermarks
+from health_edu_apps_etl.extract_scopus import incremental_query
+from health_edu_apps_etl.transform_data import clean_articles
+
+
+def test_watermarks_roundtrip(tmp_path):
+    """ Testa a gravação e leitura das marcas d'água por fonte """
+    path = tmp_path / "state" / "watermarks.json"
+
+    assert watermarks.get_watermark("PubMed", path) is None
+    watermarks.advance_watermarks(["PubMed", "Scopus"], date(2024, 3, 1), path)
+    watermarks.advance_watermarks(["PubMed"], date(2024, 3, 2), path)
+
+    assert watermarks.get_watermark("PubMed", path) == date(2024, 3, 2)
+    assert watermarks.get_watermark("Scopus", path) == date(2024, 3, 1)
+
+
+def test_incremental_scopus_query():
+    """ Testa a restrição da busca Scopus pela data de carga """
+    assert incremental_query("TITLE(app)") == "TITLE(app)"
+    assert incremental_query("TITLE(app)", date(2024, 3, 1)) == "(TITLE(app)) AND ORIG-LOAD-DATE AFT 20240229"
+
+
+def test_run_etl_incremental_upsert(tmp_path, monkeypatch):
+    """ Testa se a execução incremental busca só novidades e faz upsert no catálogo """
+    state = tmp_path / "watermarks.json"
+    monkeypatch.setattr(watermarks, "WATERMARKS_FILE", state)
+    monkeypatch.setattr(etl_pipeline, "RAW_DATA_DIR", tmp_path)
+    watermarks.advance_watermarks(["PubMed"], date(2024, 3, 1), state)
+
+    def articles(ids, titles):
+        return pl.DataFrame({
+            "id": ids, "doi": ["N/A"] * len(ids), "title": titles, "journal": ["JMIR"] * len(ids),
+            "authors": ["Silva A"] * len(ids), "pub_date": ["2024-03-01"] * len(ids), "source": ["PubMed"] * len(ids),
+        })
+
+    con = catalog.connect()
+    catalog.upsert_articles(con, clean_articles(articles(["1", "2"], ["Antigo", "Antigo 2"])))
+    con.close()
+    windows = {}
+
+    def fake_pubmed(max_results, since=None, until=None):
+        windows["PubMed"] = since
+        return articles(["2", "3"], ["Atualizado", "Novo"])
+
+    def fake_empty(max_results, since=None, until=None):
+        return pl.DataFrame()
+
+    monkeypatch.setattr(etl_pipeline, "SOURCES", {"PubMed": (fake_pubmed, "pubmed"), "Scopus": (fake_empty, "scopus")})
+
+    etl_pipeline.run_etl(incremental=True, checkpointed=False)
+
+    result = catalog.query("SELECT id, title, run_id FROM articles ORDER BY id")
+    assert windows["PubMed"] == date(2024, 3, 1), "❌ Erro: Marca d'água não usada na extração!"
+    assert result["id"].to_list() == ["1", "2", "3"]
+    assert result["title"].to_list() == ["Antigo", "Atualizado", "Novo"], "❌ Erro: Registro não foi atualizado!"
+    assert catalog.list_runs()["rows_upserted"].to_list() == [2], "❌ Erro: Upsert deveria gravar só o lote novo!"
+    assert watermarks.get_watermark("PubMed", state) == date.today()
+    assert watermarks.get_watermark("Scopus", state) is None, "❌ Erro: Fonte vazia não deve avançar a marca!"